@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark filename2purl on a large synthetic directory listing with package
+artifacts of all the supported types and other files, against trying the
+parser of every suffix in turn.
+
+Usage: python etc/scripts/benchmark_filename2purl.py [--size 1000000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from packageurl.contrib.filename2purl import MAX_FILENAME_LENGTH
+from packageurl.contrib.filename2purl import filename2purl_many
+from packageurl.contrib.filename2purl import filename_parsers
+
+FILENAME_TEMPLATES = [
+    "package_{i}-1.{i}.0-py3-none-any.whl",
+    "package-{i}_1.{i}-1_amd64.deb",
+    "package-{i}-1.{i}-1.el9.x86_64.rpm",
+    "crate-{i}-0.1.{i}.crate",
+    "gem-{i}-2.{i}.gem",
+    "package-{i}-1.2.{i}-r0.apk",
+    "source-{i}-1.{i}.tar.gz",
+    "Package.{i}.1.0.{i}.nupkg",
+    "README-{i}.md",
+    "package-{i}.json",
+]
+
+
+def write_listing(location, size):
+    with open(location, "w", encoding="utf-8") as listing:
+        for i in range(size):
+            template = FILENAME_TEMPLATES[i % len(FILENAME_TEMPLATES)]
+            listing.write(f"./store/{i % 1000}/{template.format(i=i)}\n")
+
+
+def filename2purl_many_without_index(filenames):
+    """
+    Yield a (filename, PackageURL or None) tuple for each of `filenames`,
+    trying the parser of every registered suffix in turn, as a baseline.
+    """
+    parsers = list(filename_parsers.parsers.items())
+    # the longest suffixes first
+    parsers.sort(key=lambda item: -len(item[0]))
+    for filename in filenames:
+        name = filename.rstrip().rpartition("/")[2]
+        lowered = name.lower()
+        purl = None
+        if name and len(name) <= MAX_FILENAME_LENGTH:
+            for suffix, parse in parsers:
+                if lowered.endswith(suffix) and len(name) > len(suffix):
+                    purl = parse(name[: -len(suffix)], suffix)
+                    break
+        yield filename, purl
+
+
+def run(label, convert, location):
+    start = time.perf_counter()
+    with open(location, encoding="utf-8") as listing:
+        purls = sum(1 for _filename, purl in convert(listing) if purl)
+    elapsed = time.perf_counter() - start
+    entries = sum(1 for _ in open(location, encoding="utf-8"))
+    print(
+        f"{label}: {purls} purls from {entries} entries in {elapsed:.2f}s, "
+        f"{entries / elapsed:,.0f} entries/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000, help="listing entries")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        location = Path(directory) / "listing.txt"
+        write_listing(location, args.size)
+        run("filename2purl_many", filename2purl_many, location)
+        run("every suffix", filename2purl_many_without_index, location)
+
+
+if __name__ == "__main__":
+    main()
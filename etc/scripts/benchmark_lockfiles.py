@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark the lockfile parsers on large synthetic lockfiles, and the npm
+package-lock.json parser against building each PackageURL with the
+normalizing constructor.
+
+Usage: python etc/scripts/benchmark_lockfiles.py [--size 50000]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from packageurl import PackageURL
+from packageurl.contrib.lockfiles import get_integrity_checksums
+from packageurl.contrib.lockfiles import iter_lockfile
+
+
+def get_digest(i, algorithm="sha512"):
+    return hashlib.new(algorithm, str(i).encode()).digest()
+
+
+def write_package_lock(location, size):
+    packages = {"": {"name": "app", "version": "1.0.0"}}
+    for i in range(size):
+        name = f"@scope{i % 100}/package{i}" if i % 3 else f"package{i}"
+        path = f"node_modules/{name}" if i % 5 else f"node_modules/parent/node_modules/{name}"
+        packages[path] = {
+            "version": f"1.{i % 10}.{i}",
+            "resolved": f"https://registry.npmjs.org/{name}/-/package{i}-1.{i % 10}.{i}.tgz",
+            "integrity": "sha512-" + base64.b64encode(get_digest(i)).decode(),
+            "dependencies": {"ms": "^2.1.2"},
+        }
+    lockfile = {"name": "app", "lockfileVersion": 3, "packages": packages}
+    location.write_text(json.dumps(lockfile, indent=2), encoding="utf-8")
+
+
+def write_yarn_lock(location, size):
+    with open(location, "w", encoding="utf-8") as lockfile:
+        lockfile.write("# yarn lockfile v1\n\n\n")
+        for i in range(size):
+            version = f"1.{i % 10}.{i}"
+            lockfile.write(
+                f'"package{i}@^1.0.0", "package{i}@^{version}":\n'
+                f'  version "{version}"\n'
+                f'  resolved "https://registry.yarnpkg.com/package{i}/-/package{i}-{version}.tgz'
+                f'#{get_digest(i, "sha1").hex()}"\n'
+                f"  integrity sha512-{base64.b64encode(get_digest(i)).decode()}\n"
+                f"  dependencies:\n"
+                f'    ms "^2.1.2"\n\n'
+            )
+
+
+def write_poetry_lock(location, size):
+    with open(location, "w", encoding="utf-8") as lockfile:
+        for i in range(size):
+            lockfile.write(
+                f'[[package]]\nname = "Package_{i}"\nversion = "1.{i}"\n'
+                f'description = "A package"\noptional = false\npython-versions = ">=3.8"\n'
+                f"files = [\n"
+                f'    {{file = "package_{i}-1.{i}.tar.gz", '
+                f'hash = "sha256:{get_digest(i, "sha256").hex()}"}},\n'
+                f']\n\n[package.dependencies]\nsix = ">=1.0"\n\n'
+            )
+
+
+def write_cargo_lock(location, size):
+    with open(location, "w", encoding="utf-8") as lockfile:
+        lockfile.write("version = 3\n\n")
+        for i in range(size):
+            lockfile.write(
+                f'[[package]]\nname = "crate-{i}"\nversion = "1.0.{i}"\n'
+                f'source = "registry+https://github.com/rust-lang/crates.io-index"\n'
+                f'checksum = "{get_digest(i, "sha256").hex()}"\n'
+                f'dependencies = [\n "memchr",\n]\n\n'
+            )
+
+
+def write_go_sum(location, size):
+    with open(location, "w", encoding="utf-8") as lockfile:
+        for i in range(size):
+            h1 = base64.b64encode(get_digest(i, "sha256")).decode()
+            lockfile.write(f"github.com/owner{i % 100}/module{i} v1.0.{i} h1:{h1}\n")
+            lockfile.write(f"github.com/owner{i % 100}/module{i} v1.0.{i}/go.mod h1:{h1}\n")
+
+
+def write_gemfile_lock(location, size):
+    with open(location, "w", encoding="utf-8") as lockfile:
+        lockfile.write("GEM\n  remote: https://rubygems.org/\n  specs:\n")
+        for i in range(size):
+            lockfile.write(f"    gem{i} (1.0.{i})\n      rack (>= 2.0)\n")
+        lockfile.write("\nCHECKSUMS\n")
+        for i in range(size):
+            lockfile.write(f"  gem{i} (1.0.{i}) sha256={get_digest(i, 'sha256').hex()}\n")
+
+
+WRITERS = {
+    "package-lock.json": write_package_lock,
+    "yarn.lock": write_yarn_lock,
+    "poetry.lock": write_poetry_lock,
+    "Cargo.lock": write_cargo_lock,
+    "go.sum": write_go_sum,
+    "Gemfile.lock": write_gemfile_lock,
+}
+
+
+def iter_package_lock_with_constructor(location):
+    """
+    Yield a PackageURL for each package of a package-lock.json, built with the
+    normalizing constructor, as a baseline.
+    """
+    with open(location, "rb") as lockfile:
+        packages = json.load(lockfile)["packages"]
+    for path, entry in packages.items():
+        if "node_modules/" not in path:
+            continue
+        name = path.rpartition("node_modules/")[2]
+        namespace = None
+        if name.startswith("@"):
+            namespace, _, name = name.partition("/")
+        checksums = get_integrity_checksums(entry.get("integrity"))
+        yield PackageURL(
+            type="npm",
+            namespace=namespace,
+            name=name,
+            version=entry["version"],
+            qualifiers={"checksum": ",".join(checksums)},
+        )
+
+
+def run(label, parse, location):
+    start = time.perf_counter()
+    count = sum(1 for _ in parse(location))
+    elapsed = time.perf_counter() - start
+    size = location.stat().st_size / 1e6
+    print(f"{label}: {count} purls from {size:.1f} MB in {elapsed:.2f}s, {count / elapsed:,.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000, help="packages per lockfile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write in WRITERS.items():
+            location = Path(directory) / name
+            write(location, args.size)
+            run(name, iter_lockfile, location)
+            if name == "package-lock.json":
+                run(f"{name} (constructor)", iter_package_lock_with_constructor, location)
+
+
+if __name__ == "__main__":
+    main()
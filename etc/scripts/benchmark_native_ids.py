@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark the bulk conversion of native package identifiers to PackageURL
+against building purl strings and parsing them with PackageURL.from_string.
+
+Usage: python etc/scripts/benchmark_native_ids.py [--size 100000]
+"""
+
+import argparse
+import time
+
+from packageurl import PackageURL
+from packageurl.utils import get_purls
+
+
+def get_identifiers(syntax, size):
+    if syntax == "maven":
+        return [f"org.example{i % 100}:artifact-{i}:1.{i % 10}.{i}" for i in range(size)]
+    if syntax == "npm":
+        return [
+            f"@scope{i % 100}/package-{i}@1.{i % 10}.{i}" if i % 3 else f"package-{i}@1.0.{i}"
+            for i in range(size)
+        ]
+    if syntax == "golang":
+        return [f"github.com/owner{i % 100}/module{i} v1.0.{i}" for i in range(size)]
+    if syntax == "docker":
+        return [
+            f"ghcr.io/org{i % 100}/image-{i}:1.{i}" if i % 2 else f"image-{i}:1.{i}"
+            for i in range(size)
+        ]
+    if syntax == "pypi":
+        return [f"Package_{i}==1.{i % 10}.{i}" for i in range(size)]
+
+
+def get_purl_string(identifier, syntax):
+    """
+    Return a purl string for a native `identifier`, using plain string
+    operations, as a baseline.
+    """
+    if syntax == "maven":
+        namespace, name, version = identifier.split(":")
+        return f"pkg:maven/{namespace}/{name}@{version}"
+    if syntax == "npm":
+        name, _, version = identifier.rpartition("@")
+        return f"pkg:npm/{name.replace('@', '%40')}@{version}"
+    if syntax == "golang":
+        module, _, version = identifier.partition(" ")
+        return f"pkg:golang/{module}@{version}"
+    if syntax == "docker":
+        path, _, tag = identifier.rpartition(":")
+        registry = None
+        if path.count("/") > 1:
+            registry, _, path = path.partition("/")
+        qualifiers = f"?repository_url={registry}" if registry else ""
+        return f"pkg:docker/{path}@{tag}{qualifiers}"
+    if syntax == "pypi":
+        name, _, version = identifier.partition("==")
+        return f"pkg:pypi/{name}@{version}"
+
+
+def get_purls_from_strings(identifiers, syntax):
+    return [PackageURL.from_string(get_purl_string(i, syntax)) for i in identifiers]
+
+
+def run(label, convert, identifiers, syntax):
+    start = time.perf_counter()
+    count = len(convert(identifiers, syntax))
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {count} identifiers in {elapsed:.2f}s, {count / elapsed:,.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000, help="identifiers per syntax")
+    args = parser.parse_args()
+
+    for syntax in ("maven", "npm", "golang", "docker", "pypi"):
+        identifiers = get_identifiers(syntax, args.size)
+        assert get_purls(identifiers[:100], syntax) == get_purls_from_strings(
+            identifiers[:100], syntax
+        )
+        run(f"{syntax} (get_purls)", get_purls, identifiers, syntax)
+        run(f"{syntax} (from_string)", get_purls_from_strings, identifiers, syntax)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark get_inferred_urls_many against a loop of get_repo_url and
+get_download_url calls over a mixed purl corpus built from the url2purl test
+data.
+
+Usage: python etc/scripts/benchmark_purl2url.py [--size 100000]
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from packageurl.contrib.purl2url import get_download_url
+from packageurl.contrib.purl2url import get_inferred_urls_many
+from packageurl.contrib.purl2url import get_repo_url
+
+TEST_DATA = Path(__file__).parent.parent.parent / "tests" / "contrib" / "data" / "url2purl.json"
+
+INCOMPLETE_PURLS = [
+    "pkg:deb/debian/attr",
+    "pkg:deb/ubuntu/attr@1.0",
+    "pkg:apk/acct@6.6.4-r0",
+]
+
+
+def get_corpus(size, seed=42):
+    """
+    Return a list of `size` purl strings with a few purls that cannot be
+    converted to a download URL.
+    """
+    purls = [purl for purl in json.loads(TEST_DATA.read_text(encoding="utf-8")).values() if purl]
+    purls += INCOMPLETE_PURLS
+    rnd = random.Random(seed)
+    return [rnd.choice(purls) for _ in range(size)]
+
+
+def run_loop(corpus):
+    start = time.perf_counter()
+    for purl in corpus:
+        try:
+            get_repo_url(purl)
+        except Exception:
+            pass
+        try:
+            get_download_url(purl)
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def run_many(corpus):
+    start = time.perf_counter()
+    get_inferred_urls_many(corpus)
+    return time.perf_counter() - start
+
+
+def report(label, size, elapsed):
+    print(f"{label}: {size} purls in {elapsed:.2f}s")
+    print(f"{label}: {size / elapsed:,.0f} purls/s, {elapsed / size * 1e6:.1f} us/purl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpus = get_corpus(args.size)
+    # warm up
+    run_loop(corpus[:1000])
+    report("per-purl loop", len(corpus), run_loop(corpus))
+    report("get_inferred_urls_many", len(corpus), run_many(corpus))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark the streaming extraction of the purls of large CycloneDX JSON and
+XML SBOMs against loading the whole document, for time and peak memory. Each
+extraction runs in its own process to measure its peak memory.
+
+Usage: python etc/scripts/benchmark_sbom.py [--size 200000]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from xml.etree import ElementTree
+
+from packageurl.contrib import sbom
+
+
+def get_component(i):
+    return {
+        "bom-ref": f"ref-{i}",
+        "type": "library",
+        "name": f"package-{i}",
+        "version": f"1.{i % 10}.{i}",
+        "purl": f"pkg:npm/package-{i}@1.{i % 10}.{i}",
+        "hashes": [{"alg": "SHA-256", "content": f"{i:064x}"}],
+        "licenses": [{"license": {"id": "MIT"}}],
+        "properties": [{"name": "description", "value": "A package " * 10}],
+    }
+
+
+def write_cyclonedx_json(location, size):
+    with open(location, "w", encoding="utf-8") as bom:
+        bom.write('{"bomFormat": "CycloneDX", "specVersion": "1.5", "components": [\n')
+        for i in range(size):
+            bom.write((",\n" if i else "") + json.dumps(get_component(i)))
+        bom.write("\n]}\n")
+
+
+def write_cyclonedx_xml(location, size):
+    with open(location, "w", encoding="utf-8") as bom:
+        bom.write('<bom xmlns="http://cyclonedx.org/schema/bom/1.5"><components>\n')
+        for i in range(size):
+            component = get_component(i)
+            bom.write(
+                f'<component type="library" bom-ref="ref-{i}">'
+                f"<name>{component['name']}</name><version>{component['version']}</version>"
+                f'<hashes><hash alg="SHA-256">{i:064x}</hash></hashes>'
+                f"<purl>{component['purl']}</purl>"
+                f"<licenses><license><id>MIT</id></license></licenses></component>\n"
+            )
+        bom.write("</components></bom>\n")
+
+
+def iter_loaded_json_purls(location):
+    """
+    Yield the purls of a CycloneDX JSON document loaded whole, as a baseline.
+    """
+    with open(location, encoding="utf-8") as bom:
+        components = list(json.load(bom)["components"])
+    while components:
+        component = components.pop()
+        if component.get("purl"):
+            yield component["purl"]
+        components.extend(component.get("components") or [])
+
+
+def iter_loaded_xml_purls(location):
+    """
+    Yield the purls of a CycloneDX XML document parsed whole, as a baseline.
+    """
+    namespace = "{http://cyclonedx.org/schema/bom/1.5}"
+    for component in ElementTree.parse(location).iter(f"{namespace}component"):
+        purl = component.find(f"{namespace}purl")
+        if purl is not None:
+            yield purl.text
+
+
+METHODS = {
+    "json.load": iter_loaded_json_purls,
+    "stream": lambda location: sbom.iter_sbom_purls(location, use_ijson=False),
+    "stream (ijson)": lambda location: sbom.iter_sbom_purls(location, use_ijson=True),
+    "ElementTree.parse": iter_loaded_xml_purls,
+}
+
+
+def run(method, location):
+    """
+    Print the number of purls, seconds and peak memory of extracting the
+    purls of the document at `location` with `method`.
+    """
+    start = time.perf_counter()
+    count = sum(1 for _ in METHODS[method](location))
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"  {method}: {count} purls in {elapsed:.2f}s, peak RSS {peak:.0f} MB", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000, help="components per SBOM")
+    parser.add_argument("--run", nargs=2, metavar=("METHOD", "LOCATION"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(*args.run)
+        return
+
+    json_methods = ["json.load", "stream"]
+    if sbom.ijson:
+        json_methods.append("stream (ijson)")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write, methods in (
+            ("bom.json", write_cyclonedx_json, json_methods),
+            ("bom.xml", write_cyclonedx_xml, ["ElementTree.parse", "stream"]),
+        ):
+            location = Path(directory) / name
+            write(location, args.size)
+            print(f"{name}: {location.stat().st_size / 1e6:.0f} MB")
+            for method in methods:
+                command = [sys.executable, __file__, "--run", method, str(location)]
+                subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark the installed packages scanner with 1 to N threads on synthetic
+pypi, npm, maven, cargo and golang package trees, or on the package trees of
+the current user and Python, and report the per-ecosystem throughput.
+
+Usage: python etc/scripts/benchmark_scanner.py [--size 5000] [--workers 1 4 16]
+    [--default-locations]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from packageurl.contrib.scanner import PackageScanner
+from packageurl.contrib.scanner import get_default_locations
+
+
+def write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def make_trees(directory, size):
+    """
+    Create package trees of `size` packages per ecosystem in `directory` and
+    return a list of (ecosystem, path) locations.
+    """
+    directory = Path(directory)
+    site_packages = directory / "site-packages"
+    node_modules = directory / "node_modules"
+    maven = directory / "m2"
+    cargo = directory / "cargo"
+    golang = directory / "mod"
+    crates_io = "index.crates.io-6f17d22bba15001f"
+    for i in range(size):
+        name = f"package{i}"
+        metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.{i}\n\n" + "x" * 2000
+        write(site_packages / f"{name}-1.{i}.dist-info" / "METADATA", metadata)
+        write(site_packages / name / "__init__.py")
+        package_json = {"name": f"@scope{i % 50}/{name}", "version": f"1.0.{i}"}
+        write(node_modules / f"@scope{i % 50}" / name / "package.json", json.dumps(package_json))
+        write(node_modules / f"@scope{i % 50}" / name / "index.js")
+        group = maven / "org" / f"group{i % 100}" / name / f"1.{i}"
+        write(group / f"{name}-1.{i}.pom")
+        write(group / f"{name}-1.{i}.jar")
+        write(cargo / "cache" / crates_io / f"{name}-1.0.{i}.crate")
+        write(cargo / "src" / crates_io / f"{name}-1.0.{i}" / "Cargo.toml")
+        write(golang / "github.com" / f"owner{i % 100}" / f"{name}@v1.0.{i}" / "go.mod")
+    return [
+        ("pypi", site_packages),
+        ("npm", node_modules),
+        ("maven", maven),
+        ("cargo", cargo),
+        ("golang", golang),
+    ]
+
+
+def report(label, scanner, count, elapsed):
+    print(f"{label}: {count} packages in {elapsed:.2f}s, {count / elapsed:,.0f} packages/s")
+    for ecosystem, stats in scanner.info().items():
+        print(
+            f"  {ecosystem}: {stats['packages']} packages, {stats['directories']} directories, "
+            f"{stats['files']} files in {stats['seconds']:.2f}s, "
+            f"{stats['packages_per_second']:,.0f} packages/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=5000, help="packages per ecosystem")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 4, 16])
+    parser.add_argument("--default-locations", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.default_locations:
+            locations = get_default_locations()
+        else:
+            locations = make_trees(directory, args.size)
+        for max_workers in args.workers:
+            scanner = PackageScanner(max_workers=max_workers)
+            start = time.perf_counter()
+            count = sum(1 for _ in scanner.scan(locations))
+            report(f"scan({max_workers=})", scanner, count, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark the dpkg, apk and pacman database readers on large synthetic
+databases.
+
+Usage: python etc/scripts/benchmark_system_packages.py [--size 200000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from packageurl.contrib.system_packages import iter_apk_installed
+from packageurl.contrib.system_packages import iter_dpkg_status
+from packageurl.contrib.system_packages import iter_pacman_local
+
+
+def write_dpkg_status(location, size):
+    paragraph = (
+        "Package: package{i}\nStatus: install ok installed\nArchitecture: amd64\n"
+        "Version: 1:1.{i}-1\nDepends: libc6 (>= 2.34)\nDescription: a package\n"
+        " with a long description\n .\n spanning several lines.\n\n"
+    )
+    with open(location, "w", encoding="utf-8") as status:
+        for i in range(size):
+            status.write(paragraph.format(i=i))
+
+
+def write_apk_installed(location, size):
+    record = (
+        "C:Q1/Jl6Cpj9UiQoNSBI/VzMKv9gt1c=\nP:package{i}\nV:1.{i}-r0\nA:x86_64\nS:407278\n"
+        "T:a package\no:package{i}\nF:usr/lib\nR:libpackage{i}.so\na:0:0:755\n\n"
+    )
+    with open(location, "w", encoding="utf-8") as installed:
+        for i in range(size):
+            installed.write(record.format(i=i))
+
+
+def write_pacman_local(location, size):
+    location.mkdir()
+    for i in range(size):
+        directory = location / f"package{i}-1.{i}-1"
+        directory.mkdir()
+        desc = f"%NAME%\npackage{i}\n\n%VERSION%\n1.{i}-1\n\n%DESC%\nA package\n\n%ARCH%\nany\n"
+        (directory / "desc").write_text(desc, encoding="utf-8")
+
+
+def run(label, read, location):
+    start = time.perf_counter()
+    count = sum(1 for _ in read(location))
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {count} purls in {elapsed:.2f}s, {count / elapsed:,.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000, help="packages per database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        location = Path(directory) / "status"
+        write_dpkg_status(location, args.size)
+        run("dpkg status", iter_dpkg_status, location)
+
+        location = Path(directory) / "installed"
+        write_apk_installed(location, args.size)
+        run("apk installed", iter_apk_installed, location)
+
+        # pacman keeps a directory per package: use fewer packages
+        location = Path(directory) / "local"
+        write_pacman_local(location, args.size // 10)
+        run("pacman local", iter_pacman_local, location)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Benchmark url2purl over a GitHub-heavy URL corpus built from the url2purl
+test data, url2purl_many with a pool of 1 to N worker processes and url2purl
+with a resolution cache.
+
+Usage: python etc/scripts/benchmark_url2purl.py [--size 100000] [--github-ratio 0.8]
+    [--processes 1 2 4] [--cache 10000]
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from packageurl.contrib.url2purl import disable_url2purl_cache
+from packageurl.contrib.url2purl import enable_url2purl_cache
+from packageurl.contrib.url2purl import url2purl
+from packageurl.contrib.url2purl import url2purl_many
+
+TEST_DATA = Path(__file__).parent.parent.parent / "tests" / "contrib" / "data" / "url2purl.json"
+
+
+def get_corpus(size, github_ratio, seed=42):
+    """
+    Return a list of `size` URLs where about `github_ratio` of the URLs are
+    GitHub URLs.
+    """
+    urls = list(json.loads(TEST_DATA.read_text(encoding="utf-8")))
+    github_urls = [url for url in urls if "github" in url]
+    other_urls = [url for url in urls if "github" not in url]
+    rnd = random.Random(seed)
+    return [
+        rnd.choice(github_urls if rnd.random() < github_ratio else other_urls) for _ in range(size)
+    ]
+
+
+def run(corpus, convert=url2purl):
+    start = time.perf_counter()
+    for url in corpus:
+        convert(url)
+    return time.perf_counter() - start
+
+
+def run_many(corpus, processes):
+    start = time.perf_counter()
+    for _ in url2purl_many(corpus, processes=processes):
+        pass
+    return time.perf_counter() - start
+
+
+def report(label, size, elapsed):
+    print(f"{label}: {size} URLs in {elapsed:.2f}s")
+    print(f"{label}: {size / elapsed:,.0f} URLs/s, {elapsed / size * 1e6:.1f} us/URL")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--github-ratio", type=float, default=0.8)
+    parser.add_argument("--processes", type=int, nargs="*", default=[])
+    parser.add_argument("--cache", type=int, default=0, help="url2purl cache size")
+    args = parser.parse_args()
+
+    corpus = get_corpus(args.size, args.github_ratio)
+    # warm up
+    run(corpus[:1000])
+    report("url2purl", len(corpus), run(corpus))
+    for processes in args.processes:
+        report(f"url2purl_many({processes=})", len(corpus), run_many(corpus, processes))
+    if args.cache:
+        cache = enable_url2purl_cache(maxsize=args.cache)
+        try:
+            report(f"url2purl(cache={args.cache})", len(corpus), run(corpus))
+            print(f"url2purl(cache={args.cache}): hit rate {cache.hit_rate:.1%}")
+        finally:
+            disable_url2purl_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Resolve conda purls to exact artifact URLs and checksums offline, using local
+snapshots of the conda channels repodata.json indexes.
+
+A channel directory is laid out as a conda channel, with one repodata.json per
+subdir, such as main/linux-64/repodata.json and main/noarch/repodata.json.
+"""
+
+import json
+import threading
+from collections import namedtuple
+from pathlib import Path
+from sys import intern
+
+from packageurl import PackageURL
+from packageurl.contrib.purl2url import get_conda_channel_url
+
+# The compact record of a package in a repodata.json index. The sha256 is
+# stored as bytes and is None when missing.
+CondaRecord = namedtuple("CondaRecord", ["name", "version", "build", "build_number", "sha256"])
+
+CondaArtifact = namedtuple(
+    "CondaArtifact",
+    [
+        "url",
+        "filename",
+        "channel",
+        "subdir",
+        "name",
+        "version",
+        "build",
+        "build_number",
+        "sha256",
+    ],
+)
+
+# {package type qualifier: archive extension} in order of preference
+ARCHIVE_EXTENSIONS = {
+    "conda": ".conda",
+    "tar.bz2": ".tar.bz2",
+}
+
+
+def get_compact_record(pairs):
+    """
+    Return a CondaRecord for the JSON object `pairs` of a package record or a
+    dict for any other JSON object.
+    Used as a JSON object_pairs_hook to avoid loading the whole package
+    records, which hold many fields such as dependencies and licenses.
+    """
+    values = dict(pairs)
+    name = values.get("name")
+    version = values.get("version")
+    build = values.get("build")
+    if not (isinstance(name, str) and isinstance(version, str) and isinstance(build, str)):
+        return values
+
+    try:
+        sha256 = bytes.fromhex(values.get("sha256"))
+    except (TypeError, ValueError):
+        sha256 = None
+
+    return CondaRecord(
+        name=intern(name),
+        version=intern(version),
+        build=build,
+        build_number=values.get("build_number") or 0,
+        sha256=sha256,
+    )
+
+
+def load_repodata(location):
+    """
+    Return a mapping of {(name, version): [(CondaRecord, filename), ...]} loaded
+    from the repodata.json file at `location`.
+
+    To save memory, the filename is only its archive extension when the
+    filename is the standard "<name>-<version>-<build><extension>".
+    """
+    with open(location, "rb") as repodata_file:
+        repodata = json.load(repodata_file, object_pairs_hook=get_compact_record)
+
+    index = {}
+    for packages_key in ("packages", "packages.conda"):
+        for filename, record in (repodata.get(packages_key) or {}).items():
+            if not isinstance(record, CondaRecord):
+                continue
+            for extension in ARCHIVE_EXTENSIONS.values():
+                if filename == f"{record.name}-{record.version}-{record.build}{extension}":
+                    filename = extension
+                    break
+            index.setdefault((record.name, record.version), []).append((record, filename))
+    return index
+
+
+def get_filename(record, filename):
+    """
+    Return the filename of a `record` for a `filename` as stored in an index
+    returned by load_repodata.
+    """
+    if filename in ARCHIVE_EXTENSIONS.values():
+        return f"{record.name}-{record.version}-{record.build}{filename}"
+    return filename
+
+
+def get_archive_type(filename):
+    for archive_type, extension in ARCHIVE_EXTENSIONS.items():
+        if filename.endswith(extension):
+            return archive_type
+
+
+class CondaIndex:
+    """
+    An index of local conda channels repodata.json files, used to resolve
+    conda purls offline.
+
+    repodata.json files are only loaded when a purl of their channel and subdir
+    is resolved for the first time, and only the name, version, build, build
+    number and checksums of their packages are kept in memory.
+    """
+
+    def __init__(self):
+        # {channel: {subdir: repodata.json location}}
+        self._locations = {}
+        # {(channel, subdir): index of a loaded repodata.json}
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def add_repodata(self, location, channel, subdir=None):
+        """
+        Add the repodata.json file at `location` for `channel` and `subdir`.
+        `subdir` defaults to the name of the directory of `location`.
+        """
+        location = Path(location)
+        subdir = subdir or location.parent.name
+        channel = channel.lower()
+        with self._lock:
+            self._locations.setdefault(channel, {})[subdir] = location
+            self._indexes.pop((channel, subdir), None)
+
+    def add_channel_directory(self, directory, channel=None):
+        """
+        Add all the subdir/repodata.json files of a channel `directory`.
+        `channel` defaults to the name of `directory`.
+        """
+        directory = Path(directory)
+        channel = channel or directory.name
+        for location in sorted(directory.glob("*/repodata.json")):
+            self.add_repodata(location, channel=channel)
+
+    @property
+    def channels(self):
+        return list(self._locations)
+
+    def get_subdirs(self, channel):
+        return list(self._locations.get(channel.lower(), {}))
+
+    def _get_index(self, channel, subdir):
+        index = self._indexes.get((channel, subdir))
+        if index is None:
+            with self._lock:
+                index = self._indexes.get((channel, subdir))
+                if index is None:
+                    location = self._locations[channel][subdir]
+                    index = self._indexes[(channel, subdir)] = load_repodata(location)
+        return index
+
+    def get_artifacts(self, purl):
+        """
+        Return a list of CondaArtifact for a conda `purl` string or PackageURL,
+        best match first.
+
+        The "channel", "subdir", "build" and "type" qualifiers restrict the
+        matches: without a "channel" or a "subdir" qualifier, all the channels
+        or subdirs are searched in the order they were added. Matches are
+        sorted by highest build number and by ".conda" archives first.
+        """
+        if not isinstance(purl, PackageURL):
+            purl = PackageURL.from_string(purl)
+        if purl.type != "conda" or not purl.name or not purl.version:
+            return []
+
+        qualifiers = purl.qualifiers
+        channel = qualifiers.get("channel")
+        channels = [channel.lower()] if channel else self.channels
+        subdir = qualifiers.get("subdir")
+        build = qualifiers.get("build")
+        archive_type = qualifiers.get("type")
+        key = (purl.name, purl.version)
+
+        artifacts = []
+        for channel in channels:
+            subdirs = self._locations.get(channel, {})
+            for channel_subdir in [subdir] if subdir else list(subdirs):
+                if channel_subdir not in subdirs:
+                    continue
+                index = self._get_index(channel, channel_subdir)
+                for record, filename in index.get(key, ()):
+                    filename = get_filename(record, filename)
+                    if build and record.build != build:
+                        continue
+                    if archive_type and get_archive_type(filename) != archive_type:
+                        continue
+                    artifacts.append(
+                        CondaArtifact(
+                            url=f"{get_conda_channel_url(channel)}/{channel_subdir}/{filename}",
+                            filename=filename,
+                            channel=channel,
+                            subdir=channel_subdir,
+                            name=record.name,
+                            version=record.version,
+                            build=record.build,
+                            build_number=record.build_number,
+                            sha256=record.sha256 and record.sha256.hex(),
+                        )
+                    )
+
+        artifacts.sort(
+            key=lambda artifact: (
+                -artifact.build_number,
+                not artifact.filename.endswith(ARCHIVE_EXTENSIONS["conda"]),
+            )
+        )
+        return artifacts
+
+    def resolve(self, purl):
+        """
+        Return the best CondaArtifact for a conda `purl` string or PackageURL or
+        None.
+        """
+        artifacts = self.get_artifacts(purl)
+        if artifacts:
+            return artifacts[0]
+
+    def resolve_many(self, purls):
+        """
+        Return a list of the best CondaArtifact or None for each of the `purls`.
+        """
+        return [self.resolve(purl) for purl in purls]
+
+    def get_download_url(self, purl):
+        """
+        Return the exact download URL of a conda `purl` string or PackageURL or
+        None.
+        """
+        artifact = self.resolve(purl)
+        if artifact:
+            return artifact.url
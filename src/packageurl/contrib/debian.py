@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Resolve deb purls to exact pool filenames and checksums offline, using local
+copies of the Debian and Ubuntu archives Packages and Sources indexes.
+
+The indexes are streamed into a SQLite database that can be stored in a file
+and reused between runs.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+from packageurl import PackageURL
+from packageurl.contrib.purl2url import DEB_REPOSITORY_URLS
+
+DebianArtifact = namedtuple(
+    "DebianArtifact", ["url", "filename", "sha256", "size", "name", "version", "arch"]
+)
+
+# {file extension: function to open a compressed index file}
+OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    ".bz2": bz2.open,
+}
+
+# Fields of the Packages and Sources paragraphs used in the index
+PARAGRAPH_FIELDS = {
+    "Package",
+    "Version",
+    "Architecture",
+    "Filename",
+    "SHA256",
+    "Size",
+    "Directory",
+    "Checksums-Sha256",
+}
+
+
+def open_index(location):
+    """
+    Return a text file object for the Packages or Sources index at `location`,
+    uncompressed on the fly based on its extension.
+    """
+    opener = OPENERS.get(os.path.splitext(location)[1], open)
+    return opener(location, "rt", encoding="utf-8", errors="replace")
+
+
+def iter_paragraphs(lines, fields=PARAGRAPH_FIELDS):
+    """
+    Yield a mapping of {field: value} for each paragraph of the deb822 `lines`
+    with only the `fields` field names. The lines of a multi-line value are
+    joined with a new line.
+    """
+    paragraph = {}
+    name = None
+    for line in lines:
+        if not line.strip():
+            if paragraph:
+                yield paragraph
+                paragraph = {}
+            name = None
+        elif line[0] in " \t":
+            if name:
+                paragraph[name] += "\n" + line.strip()
+        else:
+            name, _, value = line.partition(":")
+            if name in fields:
+                paragraph[name] = value.strip()
+            else:
+                name = None
+    if paragraph:
+        yield paragraph
+
+
+def get_package_row(paragraph):
+    """
+    Return a (name, version, arch, filename, sha256, size) tuple for a Packages
+    or Sources `paragraph` or None if the paragraph is incomplete. The file of
+    a source package is its .dsc file.
+    """
+    name = paragraph.get("Package")
+    version = paragraph.get("Version")
+    if not name or not version:
+        return
+
+    directory = paragraph.get("Directory")
+    if directory is None:
+        filename = paragraph.get("Filename")
+        arch = paragraph.get("Architecture")
+        if not filename or not arch:
+            return
+        sha256 = paragraph.get("SHA256")
+        return name, version, arch, filename, sha256, get_size(paragraph.get("Size"))
+
+    for checksum in paragraph.get("Checksums-Sha256", "").splitlines():
+        sha256, _, size_filename = checksum.partition(" ")
+        size, _, filename = size_filename.partition(" ")
+        if filename.endswith(".dsc"):
+            return name, version, "source", f"{directory}/{filename}", sha256, get_size(size)
+
+
+def get_size(size):
+    try:
+        return int(size)
+    except (TypeError, ValueError):
+        return
+
+
+class DebianIndex:
+    """
+    An index of the packages of local Packages and Sources files stored in the
+    SQLite database at `path`, used to resolve deb purls offline.
+
+    Packages are keyed by (namespace, name, version, arch) where the arch of
+    source packages is "source". An index file that was already added and did
+    not change since is not read again, and a database file can be reused
+    between runs.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS indexes ("
+                "id INTEGER PRIMARY KEY, "
+                "location TEXT NOT NULL UNIQUE, "
+                "mtime REAL NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "namespace TEXT NOT NULL, "
+                "repository_url TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS packages ("
+                "namespace TEXT NOT NULL, "
+                "name TEXT NOT NULL, "
+                "version TEXT NOT NULL, "
+                "arch TEXT NOT NULL, "
+                "filename TEXT NOT NULL, "
+                "sha256 TEXT, "
+                "size INTEGER, "
+                "index_id INTEGER NOT NULL, "
+                "PRIMARY KEY (namespace, name, version, arch)"
+                ") WITHOUT ROWID"
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+
+    def add_index(self, location, namespace="debian", repository_url=None):
+        """
+        Add the packages of the Packages or Sources file at `location`, plain or
+        compressed with gzip, xz or bzip2, and return the number of added
+        packages. The packages are for the `namespace` distro and their files
+        are found at `repository_url`, which defaults to the main archive of
+        the distro.
+        """
+        location = os.path.abspath(location)
+        repository_url = repository_url or DEB_REPOSITORY_URLS.get(namespace)
+        if not repository_url:
+            raise ValueError(f"A repository_url is required for namespace: {namespace!r}")
+        repository_url = repository_url.rstrip("/")
+        stat = os.stat(location)
+        signature = (stat.st_mtime, stat.st_size, namespace, repository_url)
+
+        with self._lock, self._connection as connection:
+            row = connection.execute(
+                "SELECT id, mtime, size, namespace, repository_url FROM indexes WHERE location = ?",
+                (location,),
+            ).fetchone()
+            if row:
+                index_id = row[0]
+                if tuple(row[1:]) == signature:
+                    return 0
+                connection.execute("DELETE FROM packages WHERE index_id = ?", (index_id,))
+                connection.execute(
+                    "UPDATE indexes SET mtime = ?, size = ?, namespace = ?, repository_url = ? "
+                    "WHERE id = ?",
+                    (*signature, index_id),
+                )
+            else:
+                index_id = connection.execute(
+                    "INSERT INTO indexes (location, mtime, size, namespace, repository_url) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (location, *signature),
+                ).lastrowid
+
+            with open_index(location) as lines:
+                rows = (
+                    (namespace, *package_row, index_id)
+                    for package_row in map(get_package_row, iter_paragraphs(lines))
+                    if package_row
+                )
+                return connection.executemany(
+                    "INSERT OR REPLACE INTO packages "
+                    "(namespace, name, version, arch, filename, sha256, size, index_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                ).rowcount
+
+    def _lookup(self, purl):
+        if not isinstance(purl, PackageURL):
+            purl = PackageURL.from_string(purl)
+        if purl.type != "deb" or not purl.version:
+            return
+
+        arch = purl.qualifiers.get("arch") or "source"
+        # Architecture independent packages have the "all" arch
+        for lookup_arch in (arch, "all") if arch not in ("source", "all") else (arch,):
+            row = self._connection.execute(
+                "SELECT filename, sha256, packages.size, repository_url FROM packages "
+                "JOIN indexes ON packages.index_id = indexes.id "
+                "WHERE packages.namespace = ? AND name = ? AND version = ? AND arch = ?",
+                (purl.namespace, purl.name, purl.version, lookup_arch),
+            ).fetchone()
+            if row:
+                filename, sha256, size, repository_url = row
+                repository_url = purl.qualifiers.get("repository_url") or repository_url
+                return DebianArtifact(
+                    url=f"{repository_url.rstrip('/')}/{filename}",
+                    filename=filename,
+                    sha256=sha256,
+                    size=size,
+                    name=purl.name,
+                    version=purl.version,
+                    arch=lookup_arch,
+                )
+
+    def resolve(self, purl):
+        """
+        Return a DebianArtifact for a deb `purl` string or PackageURL or None.
+        The arch of a purl without "arch" qualifier is "source".
+        """
+        with self._lock:
+            return self._lookup(purl)
+
+    def resolve_many(self, purls):
+        """
+        Return a list of DebianArtifact or None for each of the `purls`.
+        """
+        with self._lock:
+            return [self._lookup(purl) for purl in purls]
+
+    def get_download_url(self, purl):
+        """
+        Return the exact download URL of a deb `purl` string or PackageURL or
+        None.
+        """
+        artifact = self.resolve(purl)
+        if artifact:
+            return artifact.url
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Infer a PackageURL from the bare file name of a package artifact, such as
+"requests-2.31.0-py3-none-any.whl" or "bash_5.2.15-2_amd64.deb".
+
+The parser of a file name is found in a SuffixIndex by looking up the few last
+dot-separated suffixes of the name, such as ".whl" or ".tar.gz", rather than
+by trying every pattern in turn:
+
+- pypi: wheels (.whl) and eggs (.egg)
+- deb: binary packages (.deb, .udeb) and source packages (.dsc)
+- rpm: binary and source packages (.rpm)
+- cargo: crates (.crate)
+- gem: gems (.gem), with a "platform" qualifier for platform gems
+- apk: Alpine packages (.apk)
+- conda: conda packages (.conda)
+- nuget: NuGet packages (.nupkg)
+- generic: source archives (.tar.gz, .tgz, .tar.bz2 and .zip), since a Python
+  sdist cannot be told apart from any other source archive by its name.
+
+File names do not carry the distro of deb, rpm and apk packages, so their
+purls have no namespace. Other parsers can be registered on `filename_parsers`
+for more suffixes or to replace the default parser of a suffix.
+"""
+
+import re
+from urllib.parse import unquote
+
+from packageurl import PackageURL
+from packageurl.contrib.url2purl import compile_pattern
+from packageurl.contrib.url2purl import pypi_pattern
+from packageurl.contrib.url2purl import wheel_file_re
+
+make_purl = PackageURL._make
+
+# The maximum length of a file name on common filesystems. Longer names are
+# not file names and are not parsed.
+MAX_FILENAME_LENGTH = 255
+
+
+class SuffixIndex:
+    """
+    A mapping of {file name suffix: parser} of the file names ending with a
+    suffix. A parser is called with the file name stem, without the suffix,
+    and the lowercased suffix and returns a PackageURL or None.
+
+    The longest suffix of a file name wins: a ".src.rpm" parser is used over a
+    ".rpm" parser.
+    """
+
+    def __init__(self):
+        self.parsers = {}
+        # {last extension: [(suffix, parser), ...] longest suffix first} so
+        # that a file name is looked up by its last extension only
+        self._by_extension = {}
+
+    def register(self, *suffixes):
+        """
+        Decorate a parser function to register it for each of `suffixes`.
+        """
+
+        def decorator(parse):
+            for suffix in suffixes:
+                suffix = suffix.lower()
+                self.parsers[suffix] = parse
+                extension = suffix[suffix.rindex(".") :]
+                candidates = [
+                    (candidate, candidate_parse)
+                    for candidate, candidate_parse in self._by_extension.get(extension, [])
+                    if candidate != suffix
+                ]
+                candidates.append((suffix, parse))
+                candidates.sort(key=lambda candidate: -len(candidate[0]))
+                self._by_extension[extension] = candidates
+            return parse
+
+        return decorator
+
+    def lookup(self, filename):
+        """
+        Return a (parser, stem, suffix) tuple for `filename` using the parser
+        of its longest registered suffix or None.
+        """
+        candidates = self._by_extension.get(filename[filename.rfind(".") :].lower())
+        if not candidates:
+            return
+        for suffix, parse in candidates:
+            stem_length = len(filename) - len(suffix)
+            # a name with nothing before its suffix is a hidden file
+            if stem_length > 0 and filename[stem_length:].lower() == suffix:
+                return parse, filename[:stem_length], suffix
+
+
+filename_parsers = SuffixIndex()
+
+
+def normalize_pypi_name(name):
+    return name.replace("_", "-").lower()
+
+
+@filename_parsers.register(".whl")
+def parse_wheel(stem, suffix):
+    """
+    requests-2.31.0-py3-none-any.whl
+    """
+    match = wheel_file_re.match(stem + suffix)
+    if match:
+        name = normalize_pypi_name(match.group("name"))
+        return make_purl(("pypi", None, name, match.group("version"), {}, None))
+
+
+@filename_parsers.register(".egg")
+def parse_egg(stem, suffix):
+    """
+    setuptools-0.6c11-py2.7.egg
+    """
+    # The "-" of names and versions are escaped as "_" in egg file names
+    name, _, version = stem.partition("-")
+    version = version.partition("-")[0]
+    if name and version:
+        return make_purl(("pypi", None, normalize_pypi_name(name), version, {}, None))
+
+
+source_archive_pattern = compile_pattern(pypi_pattern).match
+
+
+@filename_parsers.register(".zip", ".tar.gz", ".tgz", ".tar.bz2")
+def parse_source_archive(stem, suffix):
+    """
+    curl-8.4.0.tar.gz
+    """
+    match = source_archive_pattern(stem + suffix)
+    if match:
+        return make_purl(("generic", None, match.group("name"), match.group("version"), {}, None))
+
+
+@filename_parsers.register(".deb", ".udeb", ".dsc")
+def parse_deb(stem, suffix):
+    """
+    bash_5.2.15-2+b2_amd64.deb
+    bash_5.2.15-2.dsc
+    """
+    parts = stem.split("_")
+    if suffix == ".dsc":
+        if len(parts) != 2:
+            return
+        parts.append("source")
+    if len(parts) != 3 or not all(parts):
+        return
+    name, version, arch = parts
+    # The ":" of an epoch is sometimes URL-encoded in file names
+    version = unquote(version)
+    return make_purl(("deb", None, name, version, {"arch": arch}, None))
+
+
+@filename_parsers.register(".rpm")
+def parse_rpm(stem, suffix):
+    """
+    bash-5.2.26-3.fc40.x86_64.rpm
+    bash-5.2.26-3.fc40.src.rpm
+    """
+    nvr, _, arch = stem.rpartition(".")
+    parts = nvr.rsplit("-", 2)
+    if len(parts) != 3 or not all(parts) or not arch:
+        return
+    name, version, release = parts
+    return make_purl(("rpm", None, name, f"{version}-{release}", {"arch": arch}, None))
+
+
+crate_filename_pattern = re.compile(
+    r"^(?P<name>[A-Za-z0-9_-]+?)-(?P<version>\d+\.\d+\.\d+(?:[-+][0-9A-Za-z.+-]*)?)$"
+).match
+
+
+@filename_parsers.register(".crate")
+def parse_crate(stem, suffix):
+    """
+    serde-1.0.193.crate
+    """
+    match = crate_filename_pattern(stem)
+    if match:
+        return make_purl(("cargo", None, match.group("name"), match.group("version"), {}, None))
+
+
+gem_filename_pattern = re.compile(
+    r"^(?P<name>[A-Za-z0-9_.-]+?)-(?P<version>\d[0-9A-Za-z.]*)(?:-(?P<platform>[^-].*))?$"
+).match
+
+
+@filename_parsers.register(".gem")
+def parse_gem(stem, suffix):
+    """
+    rails-7.1.2.gem
+    nokogiri-1.15.5-x86_64-linux.gem
+    """
+    match = gem_filename_pattern(stem)
+    if match:
+        name, version, platform = match.groups()
+        qualifiers = {"platform": platform} if platform else {}
+        return make_purl(("gem", None, name, version, qualifiers, None))
+
+
+apk_filename_pattern = re.compile(r"^(?P<name>.+)-(?P<version>\d[^-]*-r\d+)$").match
+
+
+@filename_parsers.register(".apk")
+def parse_apk(stem, suffix):
+    """
+    busybox-1.36.1-r15.apk
+    """
+    # Android packages share the extension but have no "-r<release>" version
+    match = apk_filename_pattern(stem)
+    if match:
+        name = match.group("name").lower()
+        return make_purl(("apk", None, name, match.group("version"), {}, None))
+
+
+@filename_parsers.register(".conda")
+def parse_conda(stem, suffix):
+    """
+    numpy-1.26.2-py311h64a7726_0.conda
+    """
+    parts = stem.rsplit("-", 2)
+    if len(parts) != 3 or not all(parts):
+        return
+    name, version, build = parts
+    qualifiers = {"build": build, "type": "conda"}
+    return make_purl(("conda", None, name, version, qualifiers, None))
+
+
+nupkg_filename_pattern = re.compile(
+    r"^(?P<name>[A-Za-z0-9_.-]+?)\.(?P<version>\d+(?:\.\d+)*(?:-[0-9A-Za-z.-]+)?)$"
+).match
+
+
+@filename_parsers.register(".nupkg")
+def parse_nupkg(stem, suffix):
+    """
+    Newtonsoft.Json.13.0.3.nupkg
+    """
+    match = nupkg_filename_pattern(stem)
+    if match:
+        return make_purl(("nuget", None, match.group("name"), match.group("version"), {}, None))
+
+
+def filename2purl(filename, parsers=filename_parsers):
+    """
+    Return a PackageURL inferred from a package artifact `filename` or None.
+    The directories of a `filename` path are ignored.
+
+    >>> filename2purl("requests-2.31.0-py3-none-any.whl").to_string()
+    'pkg:pypi/requests@2.31.0'
+    >>> filename2purl("pool/main/f/foo/foo_1.2-3_amd64.deb").to_string()
+    'pkg:deb/foo@1.2-3?arch=amd64'
+    >>> filename2purl("bar-1.0-1.el9.x86_64.rpm").to_string()
+    'pkg:rpm/bar@1.0-1.el9?arch=x86_64'
+    >>> filename2purl("README.md")
+    """
+    if not filename:
+        return
+    filename = filename.rpartition("/")[2]
+    if len(filename) > MAX_FILENAME_LENGTH:
+        return
+    found = parsers.lookup(filename)
+    if found:
+        parse, stem, suffix = found
+        return parse(stem, suffix)
+
+
+def filename2purl_many(filenames, parsers=filename_parsers):
+    """
+    Yield a (filename, PackageURL or None) tuple for each file name or path of
+    the `filenames` iterable, such as the lines of a directory listing, in the
+    same order as `filenames`. Trailing whitespace and new lines are ignored.
+    """
+    for filename in filenames:
+        yield filename, filename2purl(filename.rstrip(), parsers)
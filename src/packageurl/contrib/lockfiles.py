@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Parse the lockfiles of package managers and yield a PackageURL for each locked
+package, with a "checksum" qualifier when the lockfile has checksums:
+
+- npm: package-lock.json and npm-shrinkwrap.json, yarn.lock (v1 and berry)
+- pypi: poetry.lock and Pipfile.lock
+- cargo: Cargo.lock
+- golang: go.sum
+- gem: Gemfile.lock
+- composer: composer.lock
+
+The yarn.lock, poetry.lock, Cargo.lock, go.sum and Gemfile.lock text files are
+parsed line by line. The JSON lockfiles are loaded whole with the json module
+and their packages are yielded one at a time.
+
+The PackageURL are built in bulk from tuples with PackageURL._make, bypassing
+the normalizing constructor: the parsers apply the normalizations of each
+package type, such as lowercasing npm and pypi names.
+"""
+
+import base64
+import binascii
+import json
+import os
+import re
+
+from packageurl import PackageURL
+from packageurl.contrib.system_packages import open_lines
+
+make_purl = PackageURL._make
+
+
+def get_qualifiers(**qualifiers):
+    """
+    Return a qualifiers mapping with the non-empty `qualifiers`, sorted by key
+    as in a normalized PackageURL.
+    """
+    return {key: value for key, value in sorted(qualifiers.items()) if value}
+
+
+def get_checksum(checksums):
+    """
+    Return a "checksum" qualifier value for an iterable of "<algorithm>:<hex>"
+    `checksums` strings or None.
+    """
+    checksums = sorted({checksum.lower() for checksum in checksums if checksum})
+    return ",".join(checksums) or None
+
+
+def get_integrity_checksums(integrity):
+    """
+    Return a list of "<algorithm>:<hex>" checksums for an npm Subresource
+    Integrity `integrity` string such as "sha512-<base64 digest>".
+    """
+    checksums = []
+    for sri in (integrity or "").split():
+        algorithm, _, digest = sri.partition("-")
+        try:
+            checksums.append(f"{algorithm}:{base64.b64decode(digest, validate=True).hex()}")
+        except (binascii.Error, ValueError):
+            continue
+    return checksums
+
+
+is_hex = re.compile("[0-9a-fA-F]+").fullmatch
+
+
+def load_json(location):
+    if hasattr(location, "read"):
+        return json.load(location)
+    with open(location, "rb") as json_file:
+        return json.load(json_file)
+
+
+def make_npm_purl(name, version, integrity=None, resolved=None):
+    """
+    Return an npm PackageURL for a `name` such as "@babel/core" or "lodash",
+    a `version`, an `integrity` and a `resolved` URL.
+
+    Packages resolved from a git repository get a "vcs_url" qualifier. Return
+    None for packages resolved from a local path, or if `version` is a git or
+    file reference.
+    """
+    if version and version.startswith("npm:"):
+        # an alias to a registry package: "npm:<name>@<version>"
+        name, _, version = version[4:].rpartition("@")
+    if not name or not version or ":" in version or "/" in version:
+        return
+
+    vcs_url = None
+    checksums = get_integrity_checksums(integrity)
+    if resolved and not resolved.startswith(("https:", "http:")):
+        if not resolved.startswith("git"):
+            return
+        vcs_url = resolved
+        checksums = ()
+    elif resolved and not checksums:
+        # the sha1 of a tarball is the fragment of its yarn v1 resolved URL
+        _, _, sha1 = resolved.partition("#")
+        if len(sha1) == 40 and is_hex(sha1):
+            checksums = [f"sha1:{sha1}"]
+
+    namespace = None
+    if name.startswith("@"):
+        namespace, _, name = name.partition("/")
+    qualifiers = get_qualifiers(checksum=get_checksum(checksums), vcs_url=vcs_url)
+    return make_purl(("npm", namespace, name.lower(), version, qualifiers, None))
+
+
+def iter_package_lock(location):
+    """
+    Yield an npm PackageURL for each package of a package-lock.json or
+    npm-shrinkwrap.json `location` path or file object, once per name and
+    version. Workspace packages and links are skipped.
+    """
+    lockfile = load_json(location)
+    seen = set()
+
+    packages = lockfile.get("packages")
+    if packages:
+        # lockfileVersion 2 and 3: {"node_modules/<name>[/node_modules/<name>]": {...}}
+        entries = (
+            (entry.get("name") or path.rpartition("node_modules/")[2], entry)
+            for path, entry in packages.items()
+            if "node_modules/" in path and not entry.get("link")
+        )
+    else:
+        # lockfileVersion 1: nested {"dependencies": {<name>: {...}}}
+        entries = iter_npm_dependencies(lockfile.get("dependencies") or {})
+
+    for name, entry in entries:
+        key = (name, entry.get("version"))
+        if key in seen:
+            continue
+        seen.add(key)
+        purl = make_npm_purl(
+            name, entry.get("version"), entry.get("integrity"), entry.get("resolved")
+        )
+        if purl:
+            yield purl
+
+
+def iter_npm_dependencies(dependencies):
+    for name, entry in dependencies.items():
+        yield name, entry
+        nested = entry.get("dependencies")
+        if nested:
+            yield from iter_npm_dependencies(nested)
+
+
+def split_npm_spec(spec):
+    """
+    Return a (name, range) tuple for an npm package `spec` such as
+    "@babel/core@^7.0.0" or "lodash@4.17.21".
+    """
+    at = spec.find("@", 1)
+    if at < 0:
+        return spec, ""
+    return spec[:at], spec[at + 1 :]
+
+
+def get_yarn_package_name(spec):
+    """
+    Return a package name for a yarn.lock entry `spec` such as
+    "@babel/core@^7.0.0" or "alias@npm:lodash@^4.17.0".
+    """
+    name, range_ = split_npm_spec(spec)
+    if range_.startswith("npm:") and "@" in range_[5:]:
+        # an alias to another registry package
+        name = split_npm_spec(range_[4:])[0]
+    return name
+
+
+def iter_yarn_lock(location):
+    """
+    Yield an npm PackageURL for each package of a yarn.lock v1 or berry
+    `location` path or text file object.
+    """
+    lines = open_lines(location)
+    try:
+        for header, fields in iter_yarn_entries(lines):
+            resolution = fields.get("resolution")
+            if resolution is not None:
+                # berry: resolution: "<name>@npm:<version>"
+                name, sep, version = resolution.rpartition("@npm:")
+                if sep and "@" not in version:
+                    purl = make_npm_purl(name, version)
+                    if purl:
+                        yield purl
+                continue
+
+            spec = header.split(",")[0].strip().strip('"')
+            purl = make_npm_purl(
+                get_yarn_package_name(spec),
+                fields.get("version"),
+                fields.get("integrity"),
+                fields.get("resolved"),
+            )
+            if purl:
+                yield purl
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+def iter_yarn_entries(lines):
+    """
+    Yield a (header, {field: value}) tuple for each entry of yarn.lock `lines`
+    with its top-level fields.
+    """
+    header = None
+    fields = {}
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        if not line[0].isspace():
+            if header and not header.startswith("__metadata"):
+                yield header, fields
+            header = line.rstrip().rstrip(":")
+            fields = {}
+        elif header and line.startswith("  ") and not line[2].isspace():
+            key, _, value = line.strip().partition(" ")
+            fields[key.rstrip(":")] = value.strip().strip('"')
+    if header and not header.startswith("__metadata"):
+        yield header, fields
+
+
+def parse_toml_value(value):
+    """
+    Return a Python value for a TOML `value` string of a single-line string,
+    or `value` as-is for other values.
+    """
+    if value.startswith('"'):
+        if "\\" not in value and value.endswith('"') and value.count('"') == 2:
+            return value[1:-1]
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value.strip('"')
+    if value.startswith("'"):
+        return value.strip("'")
+    return value
+
+
+def iter_toml_tables(lines, name, keys=None):
+    """
+    Yield a mapping of {key: value} for each [[`name`]] table of TOML `lines`,
+    with only the `keys` if provided.
+
+    Keys of the [`name`.<subtable>] subtables of a table are prefixed with
+    "<subtable>.". Strings are decoded and arrays are lists of their stripped
+    lines. This is only the small subset of TOML written by lockfile tools.
+    """
+    table = None
+    prefix = ""
+    array = None
+    table_header = f"[[{name}]]"
+    subtable_prefix = f"[{name}."
+    for line in lines:
+        stripped = line.strip()
+        if array is not None:
+            if stripped.startswith("]"):
+                array = None
+            else:
+                array.append(stripped)
+            continue
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("["):
+            if stripped == table_header:
+                if table is not None:
+                    yield table
+                table = {}
+                prefix = ""
+            elif table is not None and stripped.startswith(subtable_prefix):
+                prefix = stripped[len(subtable_prefix) : -1] + "."
+            elif table is not None:
+                yield table
+                table = None
+            continue
+        if table is None:
+            continue
+        key, sep, value = stripped.partition("=")
+        if not sep:
+            continue
+        key = prefix + key.strip().strip('"')
+        value = value.strip()
+        if value.startswith("[") and not value.endswith("]"):
+            array = [value[1:]] if value[1:].strip() else []
+            if keys is None or key in keys:
+                table[key] = array
+        elif keys is not None and key not in keys:
+            continue
+        elif value.startswith("["):
+            table[key] = [value[1:-1]]
+        else:
+            table[key] = parse_toml_value(value)
+    if table is not None:
+        yield table
+
+
+def make_pypi_purl(name, version, checksums=(), **qualifiers):
+    if not name or not version:
+        return
+    name = name.strip().lower().replace("_", "-")
+    qualifiers = get_qualifiers(checksum=get_checksum(checksums), **qualifiers)
+    return make_purl(("pypi", None, name, version.strip(), qualifiers, None))
+
+
+find_hashes = re.compile(r'hash\s*=\s*"([^"]+)"').findall
+
+
+POETRY_KEYS = {
+    "name",
+    "version",
+    "files",
+    "source.type",
+    "source.url",
+    "source.resolved_reference",
+}
+
+
+def iter_poetry_lock(location):
+    """
+    Yield a pypi PackageURL for each package of a poetry.lock `location` path
+    or text file object.
+
+    Packages from a git repository get a "vcs_url" qualifier and packages from
+    another index a "repository_url" qualifier. Packages from local
+    directories, files and URLs are skipped. The checksums of the lockfiles of
+    Poetry 1.1 and older, stored at the end of the file, are not reported.
+    """
+    lines = open_lines(location)
+    try:
+        for package in iter_toml_tables(lines, "package", keys=POETRY_KEYS):
+            source_type = package.get("source.type")
+            source_url = package.get("source.url")
+            vcs_url = repository_url = None
+            if source_type == "git":
+                reference = package.get("source.resolved_reference")
+                vcs_url = f"git+{source_url}@{reference}" if reference else f"git+{source_url}"
+            elif source_type == "legacy":
+                repository_url = source_url
+            elif source_type:
+                continue
+            checksums = find_hashes("\n".join(package.get("files") or ()))
+            purl = make_pypi_purl(
+                package.get("name"),
+                package.get("version"),
+                checksums,
+                repository_url=repository_url,
+                vcs_url=vcs_url,
+            )
+            if purl:
+                yield purl
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+def iter_pipfile_lock(location):
+    """
+    Yield a pypi PackageURL for each package of the "default" and "develop"
+    sections of a Pipfile.lock `location` path or file object. Packages
+    without a pinned version, such as editable or VCS packages, are skipped.
+    """
+    lockfile = load_json(location)
+    for section in ("default", "develop"):
+        for name, entry in (lockfile.get(section) or {}).items():
+            version = entry.get("version") or ""
+            if not version.startswith("=="):
+                continue
+            purl = make_pypi_purl(name, version[2:].lstrip("="), entry.get("hashes") or ())
+            if purl:
+                yield purl
+
+
+CRATES_IO_SOURCES = (
+    "registry+https://github.com/rust-lang/crates.io-index",
+    "sparse+https://index.crates.io/",
+)
+
+
+CARGO_KEYS = {"name", "version", "source", "checksum"}
+
+
+def iter_cargo_lock(location):
+    """
+    Yield a cargo PackageURL for each package of a Cargo.lock `location` path
+    or text file object.
+
+    Packages from other registries get a "repository_url" qualifier and
+    packages from a git repository a "vcs_url" qualifier. Packages without a
+    source, which are the local workspace crates, are skipped.
+    """
+    lines = open_lines(location)
+    try:
+        for package in iter_toml_tables(lines, "package", keys=CARGO_KEYS):
+            name = package.get("name")
+            version = package.get("version")
+            source = package.get("source")
+            if not name or not version or not source:
+                continue
+            checksum = package.get("checksum")
+            qualifiers = {}
+            if source.startswith("git+"):
+                qualifiers["vcs_url"] = source
+            elif source not in CRATES_IO_SOURCES:
+                qualifiers["repository_url"] = source.partition("+")[2]
+            if checksum:
+                qualifiers["checksum"] = f"sha256:{checksum}"
+            yield make_purl(("cargo", None, name, version, get_qualifiers(**qualifiers), None))
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+def iter_go_sum(location):
+    """
+    Yield a golang PackageURL for each module version of a go.sum `location`
+    path or text file object that has a checksum of its source code, once per
+    module version. Modules only listed for their go.mod file are skipped.
+
+    The go.sum "h1:" hashes are hashes of the list of file hashes of a module
+    and not of a file, so they are not reported as checksums.
+    """
+    lines = open_lines(location)
+    seen = set()
+    try:
+        for line in lines:
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            module, version, _hash = parts
+            if version.endswith("/go.mod") or (module, version) in seen:
+                continue
+            seen.add((module, version))
+            namespace, _, name = module.rpartition("/")
+            yield make_purl(("golang", namespace or None, name, version, {}, None))
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+split_gem_spec = re.compile(r"^    (?P<name>\S+) \((?P<version>[^)]+)\)").match
+
+
+def get_gem_version_platform(version):
+    """
+    Return a (version, platform) tuple for a Gemfile.lock `version` such as
+    "1.15.4-x86_64-linux". RubyGems versions cannot contain a dash.
+    """
+    version, _, platform = version.partition("-")
+    return version, platform or None
+
+
+def iter_gemfile_lock(location):
+    """
+    Yield a gem PackageURL for each gem of the GEM and GIT sections of a
+    Gemfile.lock `location` path or text file object.
+
+    Gems of a GIT section get a "vcs_url" qualifier and gems of another
+    remote than rubygems.org a "repository_url" qualifier. The checksums of the
+    CHECKSUMS section of Bundler 2.5 and up are reported: as this section is
+    at the end of the file, the gems are yielded once the file is read.
+    """
+    specs = []
+    checksums = {}
+    section = remote = revision = None
+    lines = open_lines(location)
+    try:
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if not line[0].isspace():
+                section = line.strip()
+                remote = revision = None
+                continue
+            stripped = line.strip()
+            if section in ("GEM", "GIT"):
+                if stripped.startswith("remote:"):
+                    remote = stripped.partition(":")[2].strip()
+                elif stripped.startswith("revision:"):
+                    revision = stripped.partition(":")[2].strip()
+                else:
+                    match = split_gem_spec(line)
+                    if match:
+                        name, version = match.group("name", "version")
+                        specs.append((name, version, section, remote, revision))
+            elif section == "CHECKSUMS":
+                spec, _, checksum = stripped.partition(") ")
+                algorithm, _, digest = checksum.partition("=")
+                if digest:
+                    checksums[spec + ")"] = f"{algorithm}:{digest}"
+    finally:
+        if lines is not location:
+            lines.close()
+
+    for name, version_platform, section, remote, revision in specs:
+        version, platform = get_gem_version_platform(version_platform)
+        vcs_url = repository_url = None
+        if section == "GIT":
+            vcs_url = f"git+{remote}@{revision}" if revision else f"git+{remote}"
+        elif remote and remote.rstrip("/") != "https://rubygems.org":
+            repository_url = remote
+        qualifiers = get_qualifiers(
+            checksum=checksums.get(f"{name} ({version_platform})"),
+            platform=platform,
+            repository_url=repository_url,
+            vcs_url=vcs_url,
+        )
+        yield make_purl(("gem", None, name, version, qualifiers, None))
+
+
+def iter_composer_lock(location):
+    """
+    Yield a composer PackageURL for each package of the "packages" and
+    "packages-dev" sections of a composer.lock `location` path or file object.
+    """
+    lockfile = load_json(location)
+    for section in ("packages", "packages-dev"):
+        for package in lockfile.get(section) or ():
+            namespace, _, name = (package.get("name") or "").lower().rpartition("/")
+            version = package.get("version")
+            if not name or not version:
+                continue
+            shasum = (package.get("dist") or {}).get("shasum")
+            qualifiers = get_qualifiers(checksum=shasum and f"sha1:{shasum}")
+            yield make_purl(("composer", namespace or None, name, version, qualifiers, None))
+
+
+# {lockfile name: parser function}
+LOCKFILE_PARSERS = {
+    "package-lock.json": iter_package_lock,
+    "npm-shrinkwrap.json": iter_package_lock,
+    "yarn.lock": iter_yarn_lock,
+    "poetry.lock": iter_poetry_lock,
+    "Pipfile.lock": iter_pipfile_lock,
+    "Cargo.lock": iter_cargo_lock,
+    "go.sum": iter_go_sum,
+    "Gemfile.lock": iter_gemfile_lock,
+    "composer.lock": iter_composer_lock,
+}
+
+
+def iter_lockfile(location):
+    """
+    Yield a PackageURL for each package of the lockfile at `location`, parsed
+    based on its file name. Raise a ValueError for an unknown lockfile name.
+    """
+    parse = LOCKFILE_PARSERS.get(os.path.basename(location))
+    if not parse:
+        raise ValueError(f"Unknown lockfile: {location!r}")
+    return parse(location)
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+A persistent cache of the results of the purl operations that is stored in a
+SQLite database and shared across runs.
+
+Results are keyed by (operation, input, library version): the entries of a
+previous packageurl version are removed when a cache is opened.
+
+For example::
+
+    >>> cache = PersistentCache(":memory:")
+    >>> cache.from_string("pkg:pypi/Django@4.2").name
+    'django'
+    >>> cache.url2purl_many(["https://crates.io/api/v1/crates/rand/0.7.2/download"])
+    [PackageURL(type='cargo', namespace=None, name='rand', version='0.7.2', qualifiers={}, subpath=None)]
+    >>> cache.info()["misses"]
+    2
+"""
+
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+from importlib import metadata
+
+from packageurl import PackageURL
+from packageurl import ValidationMessage
+from packageurl import ValidationSeverity
+from packageurl.contrib import purl2url
+from packageurl.contrib import url2purl
+
+
+def get_library_version():
+    """
+    Return the installed packageurl-python version or "unknown".
+    """
+    try:
+        return metadata.version("packageurl-python")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# Exceptions raised by an operation that are cached as results and raised again
+# when their entry is found in the cache. Other exceptions are not cached.
+CACHED_ERRORS = {
+    "ValueError": ValueError,
+    "NotImplementedError": NotImplementedError,
+}
+
+
+def encode_purl(purl):
+    return purl and list(purl)
+
+
+def decode_purl(value):
+    # Build the PackageURL from its already normalized fields, without parsing
+    return value and PackageURL._make(value)
+
+
+def encode_messages(messages):
+    return [[message.severity.value, message.message] for message in messages]
+
+
+def decode_messages(value):
+    return [
+        ValidationMessage(severity=ValidationSeverity(severity), message=message)
+        for severity, message in value
+    ]
+
+
+def identity(value):
+    return value
+
+
+# An operation has a `function` called with one input and the `encode` and
+# `decode` functions of its results to and from JSON-serializable values.
+Operation = namedtuple("Operation", ["function", "encode", "decode"])
+
+OPERATIONS = {
+    "from_string": Operation(PackageURL.from_string, encode_purl, decode_purl),
+    "validate_string": Operation(PackageURL.validate_string, encode_messages, decode_messages),
+    "validate_string_strict": Operation(
+        lambda purl: PackageURL.validate_string(purl, strict=True),
+        encode_messages,
+        decode_messages,
+    ),
+    "url2purl": Operation(url2purl.url2purl, encode_purl, decode_purl),
+    "get_inferred_urls": Operation(purl2url.get_inferred_urls, identity, identity),
+}
+
+
+def get_value(function, encode, input):
+    """
+    Return a JSON-serializable value for the result of calling `function` with
+    `input`: either {"result": encoded result} or {"error": [class, message]}.
+    """
+    try:
+        return {"result": encode(function(input))}
+    except tuple(CACHED_ERRORS.values()) as e:
+        for name, error_class in CACHED_ERRORS.items():
+            if isinstance(e, error_class):
+                return {"error": [name, str(e)]}
+
+
+# Maximum number of inputs per SQL query, below the SQLite variables limit
+QUERY_CHUNK_SIZE = 500
+
+
+class PersistentCache:
+    """
+    A size-bounded cache of operation results stored in the SQLite database at
+    `path`. The cache keeps at most the `maxsize` most recently stored entries.
+    Eviction is first-in first-out: the oldest stored entries are evicted first,
+    even if they were read recently. `version` defaults to the installed
+    packageurl-python version.
+
+    A cache can be shared between threads.
+    """
+
+    def __init__(self, path, maxsize=1_000_000, version=None):
+        if maxsize < 1:
+            raise ValueError(f"Invalid maxsize: {maxsize!r}")
+        self.path = str(path)
+        self.maxsize = maxsize
+        self.version = version or get_library_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY, "
+                "operation TEXT NOT NULL, "
+                "input TEXT NOT NULL, "
+                "version TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "UNIQUE (operation, input, version))"
+            )
+            # Invalidate the results of any other library version
+            connection.execute("DELETE FROM results WHERE version != ?", (self.version,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self):
+        """
+        Return a mapping of cache statistics.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hit_rate,
+            size=len(self),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self):
+        with self._lock, self._connection as connection:
+            connection.execute("DELETE FROM results")
+            self.hits = 0
+            self.misses = 0
+
+    def get_many(self, operation, inputs):
+        """
+        Return a mapping of {input: JSON-serializable value} for the cached
+        `inputs` of `operation`. Inputs without a cached value and non-string
+        inputs are not included.
+        """
+        inputs = [input for input in dict.fromkeys(inputs) if isinstance(input, str)]
+        values = {}
+        with self._lock:
+            for start in range(0, len(inputs), QUERY_CHUNK_SIZE):
+                chunk = inputs[start : start + QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    "SELECT input, value FROM results "
+                    f"WHERE operation = ? AND version = ? AND input IN ({placeholders})",
+                    [operation, self.version, *chunk],
+                )
+                for input, value in rows:
+                    values[input] = json.loads(value)
+        return values
+
+    def put_many(self, operation, values):
+        """
+        Store a `values` mapping of {input: JSON-serializable value} for
+        `operation` and evict the oldest entries beyond the cache size.
+        """
+        rows = [
+            (operation, input, self.version, json.dumps(value, separators=(",", ":")))
+            for input, value in values.items()
+        ]
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO results (operation, input, version, value) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute(
+                "DELETE FROM results WHERE id <= (SELECT MAX(id) FROM results) - ?",
+                (self.maxsize,),
+            )
+
+    def call_many(self, operation, inputs):
+        """
+        Return a list of the results of `operation` for each of the `inputs`.
+        Cached results are reused and only the other inputs are computed and
+        stored in the cache. An input whose operation raises one of the
+        CACHED_ERRORS has this exception as result in the returned list.
+        Non-string inputs are computed and never stored.
+        """
+        function, encode, decode = OPERATIONS[operation]
+        inputs = list(inputs)
+        values = self.get_many(operation, inputs)
+
+        computed = {}
+        for input in inputs:
+            if input in values or input in computed:
+                continue
+            computed[input] = get_value(function, encode, input)
+        # Only string inputs are stored
+        stored = {input: value for input, value in computed.items() if isinstance(input, str)}
+        if stored:
+            self.put_many(operation, stored)
+
+        self.hits += len(inputs) - len(computed)
+        self.misses += len(computed)
+        values.update(computed)
+
+        results = []
+        for input in inputs:
+            value = values[input]
+            error = value.get("error")
+            if error:
+                error_class, message = error
+                results.append(CACHED_ERRORS[error_class](message))
+            else:
+                results.append(decode(value["result"]))
+        return results
+
+    def call(self, operation, input):
+        """
+        Return the result of `operation` for `input`, from the cache when
+        available. Raise the cached exception of `input` if any.
+        """
+        result = self.call_many(operation, [input])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def from_string(self, purl):
+        return self.call("from_string", purl)
+
+    def from_string_many(self, purls):
+        return self.call_many("from_string", purls)
+
+    def validate_string(self, purl, strict=False):
+        return self.call("validate_string_strict" if strict else "validate_string", purl)
+
+    def validate_string_many(self, purls, strict=False):
+        return self.call_many("validate_string_strict" if strict else "validate_string", purls)
+
+    def url2purl(self, url):
+        return self.call("url2purl", url)
+
+    def url2purl_many(self, urls):
+        return self.call_many("url2purl", urls)
+
+    def get_inferred_urls(self, purl):
+        return self.call("get_inferred_urls", purl)
+
+    def get_inferred_urls_many(self, purls):
+        return self.call_many("get_inferred_urls", purls)
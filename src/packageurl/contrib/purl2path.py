@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Map Package URLs to deterministic relative paths, such as to lay out a local
+artifact cache on disk, and map these paths back to Package URLs.
+
+A purl is mapped to a directory path with a fixed number of segments::
+
+    <type>/<shard>/<namespace>/<name>/<version>/<qualifiers>/<subpath>
+
+For instance, pkg:npm/%40babel/core@7.0.0 is mapped to
+npm/a6/%40babel/core/7.0.0/@/@
+
+- Each segment is the percent-encoded value of a purl component, where the
+  uppercase letters are escaped as "!" and their lowercase letter, as in the Go
+  module proxy paths. Paths are therefore safe and collision-free on case
+  insensitive filesystems, and "/" in a namespace, a version or a subpath is
+  encoded and never creates a directory.
+- The "shard" is two hex digits computed from the namespace and name, to
+  spread packages over 256 directories per type.
+- An empty namespace, version, qualifiers or subpath is stored as "@", which
+  is never found in an encoded value.
+- Dot segments, trailing dots and Windows reserved device names such as "con"
+  or "nul" are further percent-encoded.
+"""
+
+import hashlib
+import os
+import re
+from urllib.parse import quote
+from urllib.parse import unquote
+
+from packageurl import PackageURL
+from packageurl import normalize_qualifiers
+from packageurl.contrib.purl2url import escape_golang_path
+
+# The path segment of an empty purl component
+EMPTY_SEGMENT = "@"
+
+# The maximum length of a segment, as supported by most filesystems
+MAX_SEGMENT_LENGTH = 255
+
+PATH_SEGMENTS_COUNT = 7
+
+# Characters kept as-is in addition to letters, digits and "_.-~", as they are
+# common in versions and qualifiers and safe on all filesystems
+SAFE_CHARACTERS = "=+"
+
+WINDOWS_RESERVED_NAMES = frozenset(
+    ["con", "prn", "aux", "nul"]
+    + [f"com{i}" for i in range(1, 10)]
+    + [f"lpt{i}" for i in range(1, 10)]
+)
+
+has_uppercase = re.compile("[A-Z]").search
+split_percent_escapes = re.compile("(%[0-9A-F]{2})").split
+unescape_uppercase = re.compile("!([a-z])")
+
+
+def escape_path_segment(value):
+    """
+    Return a filesystem-safe path segment for a purl component `value`
+    string, or "@" if `value` is empty.
+    Raise a ValueError if the segment is too long for a filesystem.
+
+    For example:
+    >>> escape_path_segment("Foo/Bar:1")
+    '!foo%2F!bar%3A1'
+    >>> escape_path_segment("nul")
+    '%6Eul'
+    >>> escape_path_segment("..")
+    '.%2E'
+    >>> escape_path_segment(None)
+    '@'
+    """
+    if not value:
+        return EMPTY_SEGMENT
+
+    segment = quote(value, safe=SAFE_CHARACTERS)
+    if has_uppercase(segment):
+        if "%" in segment:
+            parts = split_percent_escapes(segment)
+            # escapes are at odd indexes and keep their uppercase hex digits
+            parts[::2] = map(escape_golang_path, parts[::2])
+            segment = "".join(parts)
+        else:
+            segment = escape_golang_path(segment)
+
+    if segment.endswith("."):
+        segment = segment[:-1] + "%2E"
+    if segment.partition(".")[0] in WINDOWS_RESERVED_NAMES:
+        segment = f"%{ord(segment[0]):02X}{segment[1:]}"
+
+    if len(segment) > MAX_SEGMENT_LENGTH:
+        raise ValueError(f"Path segment is longer than {MAX_SEGMENT_LENGTH}: {segment!r}")
+    return segment
+
+
+def unescape_path_segment(segment):
+    """
+    Return the purl component value string of a path `segment` or None if
+    `segment` is "@".
+
+    For example:
+    >>> unescape_path_segment("!foo%2F!bar%3A1")
+    'Foo/Bar:1'
+    >>> unescape_path_segment("@")
+    """
+    if segment == EMPTY_SEGMENT:
+        return None
+    if "!" in segment:
+        segment = unescape_uppercase.sub(lambda match: match.group(1).upper(), segment)
+    return unquote(segment, errors="strict")
+
+
+def get_shard(namespace_segment, name_segment):
+    """
+    Return the two hex digits shard of a package given its namespace and name
+    path segments.
+    """
+    key = f"{namespace_segment}/{name_segment}".encode("utf-8")
+    return hashlib.sha256(key).hexdigest()[:2]
+
+
+def get_path_segments(purl, escape=escape_path_segment, shard=get_shard):
+    """
+    Return a list of path segments for a `purl` PackageURL.
+    """
+    namespace = escape(purl.namespace)
+    name = escape(purl.name)
+    qualifiers = normalize_qualifiers(purl.qualifiers, encode=True)
+    return [
+        escape(purl.type),
+        shard(namespace, name),
+        namespace,
+        name,
+        escape(purl.version),
+        escape(qualifiers),
+        escape(purl.subpath),
+    ]
+
+
+def purl2path(purl):
+    """
+    Return a relative POSIX path string for a `purl` PackageURL or purl string.
+    Raise a ValueError if `purl` is not valid or too long to be stored as a
+    path.
+
+    For example:
+    >>> purl2path("pkg:maven/org.apache.commons/io@1.3.4?classifier=sources")
+    'maven/ef/org.apache.commons/io/1.3.4/classifier=sources/@'
+    >>> purl2path("pkg:golang/github.com/Azure/go-autorest@v0.11.0")
+    'golang/44/github.com%2F!azure/go-autorest/v0.11.0/@/@'
+    """
+    if not isinstance(purl, PackageURL):
+        purl = PackageURL.from_string(purl)
+    return "/".join(get_path_segments(purl))
+
+
+def get_purl(segments):
+    """
+    Return a PackageURL for a list of path `segments`.
+    Raise a ValueError if `segments` are not a path returned by purl2path.
+    """
+    if len(segments) != PATH_SEGMENTS_COUNT:
+        raise ValueError(f"Invalid purl path: expected {PATH_SEGMENTS_COUNT} segments")
+    try:
+        type, _shard, namespace, name, version, qualifiers, subpath = map(
+            unescape_path_segment, segments
+        )
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Invalid purl path: {e}") from e
+    return PackageURL(
+        type=type,
+        namespace=namespace,
+        name=name,
+        version=version,
+        qualifiers=normalize_qualifiers(qualifiers, encode=False),
+        subpath=subpath,
+    )
+
+
+def split_path(path):
+    path = os.fspath(path)
+    if os.sep != "/":
+        path = path.replace(os.sep, "/")
+    return path.strip("/").split("/")
+
+
+def path2purl(path):
+    """
+    Return a PackageURL for a relative `path` string or path-like object
+    returned by purl2path.
+    Raise a ValueError if `path` is not such a path.
+
+    For example:
+    >>> path2purl("npm/a6/%40babel/core/7.0.0/@/@").to_string()
+    'pkg:npm/%40babel/core@7.0.0'
+    """
+    segments = split_path(path)
+    purl = get_purl(segments)
+    # only accept the canonical path of a purl, such that a purl has exactly
+    # one path and a path has exactly one purl
+    if get_path_segments(purl) != segments:
+        raise ValueError(f"Invalid purl path: not the canonical path of {purl.to_string()!r}")
+    return purl
+
+
+def purl2path_many(purls):
+    """
+    Return a list of relative path strings or None if a purl is not valid, one
+    for each of an iterable of `purls` PackageURL or purl strings.
+
+    The segments of components shared by many purls, such as their type or
+    namespace, are escaped only once.
+    """
+    segments = {}
+    shards = {}
+
+    def escape(value):
+        segment = segments.get(value)
+        if segment is None:
+            segment = segments[value] = escape_path_segment(value)
+        return segment
+
+    def shard(namespace_segment, name_segment):
+        key = (namespace_segment, name_segment)
+        shard = shards.get(key)
+        if shard is None:
+            shard = shards[key] = get_shard(namespace_segment, name_segment)
+        return shard
+
+    paths = []
+    for purl in purls:
+        try:
+            if not isinstance(purl, PackageURL):
+                purl = PackageURL.from_string(purl)
+            paths.append("/".join(get_path_segments(purl, escape=escape, shard=shard)))
+        except ValueError:
+            paths.append(None)
+    return paths
+
+
+def path2purl_many(paths):
+    """
+    Return a list of PackageURL or None if a path is not valid, one for each
+    of an iterable of `paths` returned by purl2path.
+    """
+    purls = []
+    for path in paths:
+        try:
+            purls.append(path2purl(path))
+        except ValueError:
+            purls.append(None)
+    return purls
@@ -24,8 +24,17 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+import json
+import string
+import threading
+from collections import namedtuple
+from functools import partial
+from functools import wraps
+from types import MappingProxyType
+
 from packageurl import PackageURL
 from packageurl.contrib.route import NoRouteAvailable
+from packageurl.contrib.route import RouteAlreadyDefined
 from packageurl.contrib.route import Router
 
 DEFAULT_MAVEN_REPOSITORY = "https://repo.maven.apache.org/maven2"
@@ -49,424 +58,1023 @@ def get_repo_download_url_by_package_type(
     return download_url_by_type.get(type)
 
 
-repo_router = Router()
-download_router = Router()
-
-
-def _get_url_from_router(router, purl):
-    if purl:
-        try:
-            return router.process(purl)
-        except NoRouteAvailable:
-            return
-
-
-def get_repo_url(purl):
+def get_purl_type(purl):
     """
-    Return a repository URL inferred from the `purl` string.
+    Return the lowercased type of a `purl` string without parsing the whole
+    purl, or None.
     """
-    return _get_url_from_router(repo_router, purl)
+    scheme, _, remainder = purl.partition(":")
+    if scheme != "pkg":
+        return
+    purl_type, slash, _ = remainder.strip().lstrip("/").partition("/")
+    if slash:
+        return purl_type.lower()
 
 
-def get_download_url(purl):
+class PurlRouter(Router):
     """
-    Return a download URL inferred from the `purl` string.
+    A Router for purls that dispatches on the purl type with a mapping of
+    {purl type: endpoint}. Regex routes on purl strings are only tried for the
+    purl types without a registered endpoint, such as extension routes.
+
+    Like routes, the type map is copy-on-write and safe to use from multiple
+    threads.
     """
-    download_url = _get_url_from_router(download_router, purl)
-    if download_url:
-        return download_url
 
-    # Fallback on the `download_url` qualifier when available.
-    purl_data = PackageURL.from_string(purl)
-    return purl_data.qualifiers.get("download_url", None)
+    def __init__(self, route_map=None):
+        super().__init__(route_map)
+        self._type_map_lock = threading.Lock()
+        self._type_map = {}
 
+    @property
+    def type_map(self):
+        """
+        Return a read-only view of the current purl type -> endpoint mapping.
+        """
+        return MappingProxyType(self._type_map)
 
-def get_inferred_urls(purl):
-    """
-    Return all inferred URLs (repo, download) from the `purl` string.
-    """
-    url_functions = (
-        get_repo_url,
-        get_download_url,
-    )
+    def append_type(self, purl_type, endpoint):
+        """
+        Register an `endpoint` callable for purls of `purl_type`.
+        Raise RouteAlreadyDefined if this type already has an endpoint.
+        """
+        assert callable(endpoint)
+        purl_type = purl_type.lower()
+        with self._type_map_lock:
+            if purl_type in self._type_map:
+                raise RouteAlreadyDefined(purl_type)
+            type_map = dict(self._type_map)
+            type_map[purl_type] = endpoint
+            self._type_map = type_map
+
+    def replace_type(self, purl_type, endpoint):
+        """
+        Register an `endpoint` callable for purls of `purl_type` in place of the
+        current endpoint of this type and return the replaced endpoint or None.
+        Remove the endpoint of `purl_type` if `endpoint` is None.
+        """
+        assert endpoint is None or callable(endpoint)
+        purl_type = purl_type.lower()
+        with self._type_map_lock:
+            type_map = dict(self._type_map)
+            if endpoint is None:
+                replaced = type_map.pop(purl_type, None)
+            else:
+                replaced = type_map.get(purl_type)
+                type_map[purl_type] = endpoint
+            self._type_map = type_map
+        return replaced
+
+    def route_type(self, *purl_types):
+        """
+        Decorator to register an `endpoint` callable for one or more purl
+        types. The endpoint is returned unchanged.
+
+        Example:
+        >>> my_router = PurlRouter()
+        >>> @my_router.route_type('gem', 'rubygems')
+        ... def somefunc(purl):
+        ...    pass
+        """
 
-    inferred_urls = []
-    for url_func in url_functions:
-        url = url_func(purl)
-        if url:
-            inferred_urls.append(url)
+        def decorator(endpoint):
+            assert purl_types
+            for purl_type in purl_types:
+                self.append_type(purl_type, endpoint)
+            return endpoint
 
-    return inferred_urls
+        return decorator
 
+    def resolve(self, string):
+        """
+        Resolve a purl `string` to the endpoint registered for its type or else
+        to the endpoint of the regex route matching `string`.
+        """
+        endpoint = self._type_map.get(get_purl_type(string))
+        if endpoint is not None:
+            return endpoint
+        return super().resolve(string)
 
-# Backward compatibility
-purl2url = get_repo_url
-get_url = get_repo_url
+    def is_routable(self, string):
+        if string and get_purl_type(string) in self._type_map:
+            return True
+        return super().is_routable(string)
 
 
-@repo_router.route("pkg:cargo/.*")
-def build_cargo_repo_url(purl):
-    """
-    Return a cargo repo URL from the `purl` string.
-    """
-    purl_data = PackageURL.from_string(purl)
+repo_router = PurlRouter()
+download_router = PurlRouter()
+api_router = PurlRouter()
 
-    name = purl_data.name
-    version = purl_data.version
+# Mapping of {URL kind: PurlRouter} for all the URL kinds inferred from a purl
+URL_ROUTERS = {
+    "repo_url": repo_router,
+    "download_url": download_router,
+    "api_url": api_router,
+}
 
-    if name and version:
-        return f"https://crates.io/crates/{name}/{version}"
-    elif name:
-        return f"https://crates.io/crates/{name}"
 
+def parse_purl(purl):
+    """
+    Return a PackageURL from a `purl` string or PackageURL.
+    """
+    if isinstance(purl, PackageURL):
+        return purl
+    return PackageURL.from_string(purl)
 
-@repo_router.route("pkg:bitbucket/.*")
-def build_bitbucket_repo_url(purl):
+
+def accepts_purl(builder):
     """
-    Return a bitbucket repo URL from the `purl` string.
+    Decorator for a `builder` callable that accepts a PackageURL. The decorated
+    builder can be called either with a PackageURL or with a purl string that is
+    then parsed.
     """
-    purl_data = PackageURL.from_string(purl)
 
-    namespace = purl_data.namespace
-    name = purl_data.name
+    @wraps(builder)
+    def adapter(purl):
+        return builder(parse_purl(purl))
 
-    if name and namespace:
-        return f"https://bitbucket.org/{namespace}/{name}"
+    adapter.accepts_purl = True
+    return adapter
 
 
-@repo_router.route("pkg:github/.*")
-def build_github_repo_url(purl):
+def process_purl(purl, router, purl_string=None):
     """
-    Return a github repo URL from the `purl` string.
+    Process a `purl` string or PackageURL with `router` endpoints. With a
+    PurlRouter, the endpoint registered for the purl type is used first.
+    Endpoints decorated with `accepts_purl` receive a PackageURL and other
+    endpoints receive a purl string. A purl string is parsed only if needed.
+    `purl_string` is the string of a `purl` PackageURL, if already known.
+    Raise NoRouteAvailable if `purl` is not routable.
     """
-    purl_data = PackageURL.from_string(purl)
+    if purl_string is None and not isinstance(purl, PackageURL):
+        purl_string = purl
 
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
-    qualifiers = purl_data.qualifiers
+    endpoint = None
+    if isinstance(router, PurlRouter):
+        is_package_url = isinstance(purl, PackageURL)
+        purl_type = purl.type if is_package_url else get_purl_type(purl_string)
+        endpoint = router.type_map.get(purl_type)
 
-    if not (name and namespace):
-        return
+    if endpoint is None:
+        purl_string = purl_string or purl.to_string()
+        endpoint = router.resolve(purl_string)
 
-    repo_url = f"https://github.com/{namespace}/{name}"
+    if getattr(endpoint, "accepts_purl", False):
+        return endpoint(parse_purl(purl))
+    return endpoint(purl_string or purl.to_string())
 
-    if version:
-        version_prefix = qualifiers.get("version_prefix", "")
-        repo_url = f"{repo_url}/tree/{version_prefix}{version}"
 
-    return repo_url
+def _get_url_from_router(router, purl, purl_string=None):
+    if purl:
+        try:
+            return process_purl(purl, router, purl_string)
+        except NoRouteAvailable:
+            return
 
 
-@repo_router.route("pkg:gitlab/.*")
-def build_gitlab_repo_url(purl):
+def _get_url(url_kind, purl, purl_string=None):
     """
-    Return a gitlab repo URL from the `purl` string.
+    Return the URL of `url_kind` inferred from the `purl` string or PackageURL
+    and rewritten with the enabled URL rewriter, if any.
     """
-    purl_data = PackageURL.from_string(purl)
+    url = _get_url_from_router(URL_ROUTERS[url_kind], purl, purl_string)
+    if not url and url_kind == "download_url":
+        # Fallback on the `download_url` qualifier when available.
+        url = purl.qualifiers.get("download_url", None)
 
-    namespace = purl_data.namespace
-    name = purl_data.name
+    if url and url_rewriter:
+        purl_type = purl.type if isinstance(purl, PackageURL) else get_purl_type(purl)
+        url = url_rewriter.rewrite(url, purl_type, url_kind)
+    return url
 
-    if name and namespace:
-        return f"https://gitlab.com/{namespace}/{name}"
 
+def get_repo_url(purl):
+    """
+    Return a repository URL inferred from the `purl` string or PackageURL.
+    """
+    return _get_url("repo_url", purl)
 
-@repo_router.route("pkg:(gem|rubygems)/.*")
-def build_rubygems_repo_url(purl):
+
+def get_download_url(purl):
     """
-    Return a rubygems repo URL from the `purl` string.
+    Return a download URL inferred from the `purl` string or PackageURL.
     """
-    purl_data = PackageURL.from_string(purl)
+    purl_string = None if isinstance(purl, PackageURL) else purl
+    return _get_url("download_url", parse_purl(purl), purl_string)
 
-    name = purl_data.name
-    version = purl_data.version
 
-    if name and version:
-        return f"https://rubygems.org/gems/{name}/versions/{version}"
-    elif name:
-        return f"https://rubygems.org/gems/{name}"
+def get_api_url(purl):
+    """
+    Return a package metadata API URL inferred from the `purl` string or
+    PackageURL, such as the registry JSON endpoint of a package.
+    """
+    return _get_url("api_url", purl)
 
 
-@repo_router.route("pkg:cran/.*")
-def build_cran_repo_url(purl):
+def get_inferred_urls(purl):
     """
-    Return a cran repo URL from the `purl` string.
+    Return all inferred URLs (repo, download) from the `purl` string or
+    PackageURL.
     """
-    purl_data = PackageURL.from_string(purl)
+    purl_string = None if isinstance(purl, PackageURL) else purl
+    purl = parse_purl(purl)
 
-    name = purl_data.name
-    version = purl_data.version
+    inferred_urls = []
+    for url in (
+        _get_url("repo_url", purl, purl_string),
+        _get_url("download_url", purl, purl_string),
+    ):
+        if url:
+            inferred_urls.append(url)
 
-    return f"https://cran.r-project.org/src/contrib/{name}_{version}.tar.gz"
+    return inferred_urls
 
 
-@repo_router.route("pkg:npm/.*")
-def build_npm_repo_url(purl):
+def get_urls(purl):
     """
-    Return a npm repo URL from the `purl` string.
+    Return a mapping of {URL kind: URL or None} of all the URL kinds of
+    URL_ROUTERS (repo, download, api) inferred from the `purl` string or
+    PackageURL.
     """
-    purl_data = PackageURL.from_string(purl)
-
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
+    purl_string = None if isinstance(purl, PackageURL) else purl
+    purl = parse_purl(purl)
 
-    repo_url = "https://www.npmjs.com/package/"
-    if namespace:
-        repo_url += f"{namespace}/"
+    return {kind: _get_url(kind, purl, purl_string) for kind in URL_ROUTERS}
 
-    repo_url += f"{name}"
 
-    if version:
-        repo_url += f"/v/{version}"
+InferredURLColumns = namedtuple(
+    "InferredURLColumns", ["repo_url", "download_url", "api_url", "error"]
+)
 
-    return repo_url
 
-
-@repo_router.route("pkg:pypi/.*")
-def build_pypi_repo_url(purl):
+def get_inferred_urls_many(purls):
     """
-    Return a pypi repo URL from the `purl` string.
+    Return an InferredURLColumns of four lists aligned with a `purls` iterable
+    of purl strings or PackageURL: the repo URLs, the download URLs, the API
+    URLs and the errors.
+
+    Purls are grouped by type and the URL builders of each type are run over
+    their group. An error does not stop the batch: if a purl cannot be parsed
+    or if a URL builder raises an exception, the first exception is the error
+    of this purl and the URL of this builder is None. Otherwise, the error is
+    None.
     """
-    purl_data = PackageURL.from_string(purl)
+    purls = list(purls)
+    size = len(purls)
+    urls_by_kind = {kind: [None] * size for kind in URL_ROUTERS}
+    errors = [None] * size
 
-    name = (purl_data.name or "").replace("_", "-")
-    version = purl_data.version
+    indexes_by_type = {}
+    for index, purl in enumerate(purls):
+        try:
+            purls[index] = purl = parse_purl(purl)
+        except Exception as e:
+            errors[index] = e
+            continue
+        indexes_by_type.setdefault(purl.type, []).append(index)
+
+    def get_builder(router, purl_type):
+        builder = router.type_map.get(purl_type)
+        if getattr(builder, "accepts_purl", False):
+            return builder
+        # extension routes or endpoints that need a purl string
+        return lambda purl: _get_url_from_router(router, purl)
+
+    for purl_type, indexes in indexes_by_type.items():
+        group = [purls[index] for index in indexes]
+        for kind, router in URL_ROUTERS.items():
+            urls = urls_by_kind[kind]
+            rewrite = url_rewriter and url_rewriter.get_rewriter(purl_type, kind)
+            for index, purl, url in zip(
+                indexes, group, build_urls(get_builder(router, purl_type), group)
+            ):
+                if isinstance(url, Exception):
+                    errors[index] = errors[index] or url
+                    continue
+                if not url and kind == "download_url":
+                    # Fallback on the `download_url` qualifier when available.
+                    url = purl.qualifiers.get("download_url", None)
+                if url and rewrite:
+                    url = rewrite(url)
+                urls[index] = url
+
+    return InferredURLColumns(error=errors, **urls_by_kind)
+
+
+def build_urls(builder, purls):
+    """
+    Return a list of the URL, None or exception returned or raised by a
+    `builder` for each PackageURL of a `purls` list, using the `build_many`
+    function of the builder when available.
+    """
+    build_many = getattr(builder, "build_many", None)
+    if build_many:
+        try:
+            return build_many(purls)
+        except Exception as e:
+            return [e] * len(purls)
 
-    if name and version:
-        return f"https://pypi.org/project/{name}/{version}/"
-    elif name:
-        return f"https://pypi.org/project/{name}/"
+    urls = []
+    for purl in purls:
+        try:
+            urls.append(builder(purl))
+        except Exception as e:
+            urls.append(e)
+    return urls
 
 
-@repo_router.route("pkg:composer/.*")
-def build_composer_repo_url(purl):
+class PurlResolver:
     """
-    Return a composer repo URL from the `purl` string.
+    Base class for resolvers of purls to URLs using a local index, such as a
+    package index snapshot or a metadata cache, registered with
+    register_resolver to be tried before the URL builders of purl2url.
+
+    A resolver resolves purls of its `purl_types` to URLs of its `url_kinds`,
+    which are keys of URL_ROUTERS. Its index is loaded with `load_index` on
+    first use and can be unloaded to free memory.
     """
-    purl_data = PackageURL.from_string(purl)
 
-    name = purl_data.name
-    version = purl_data.version
-    namespace = purl_data.namespace
+    purl_types = ()
+    url_kinds = ("download_url",)
 
-    if name and version:
-        return f"https://packagist.org/packages/{namespace}/{name}#{version}"
-    elif name:
-        return f"https://packagist.org/packages/{namespace}/{name}"
+    def __init__(self):
+        self._index = None
+        self._index_lock = threading.Lock()
 
+    def load_index(self):
+        """
+        Return the index of this resolver. Subclasses must implement this.
+        """
+        raise NotImplementedError
 
-@repo_router.route("pkg:nuget/.*")
-def build_nuget_repo_url(purl):
-    """
-    Return a nuget repo URL from the `purl` string.
-    """
-    purl_data = PackageURL.from_string(purl)
+    @property
+    def index(self):
+        """
+        Return the index of this resolver, loaded on first use.
+        """
+        index = self._index
+        if index is None:
+            with self._index_lock:
+                index = self._index
+                if index is None:
+                    index = self._index = self.load_index()
+        return index
+
+    @property
+    def is_loaded(self):
+        return self._index is not None
+
+    def unload(self):
+        """
+        Unload the index of this resolver. It is loaded again on next use.
+        """
+        with self._index_lock:
+            self._index = None
 
-    name = purl_data.name
-    version = purl_data.version
+    def resolve(self, purl, url_kind):
+        """
+        Return a URL of `url_kind` for a `purl` PackageURL or None.
+        Subclasses must implement this.
+        """
+        raise NotImplementedError
 
-    if name and version:
-        return f"https://www.nuget.org/packages/{name}/{version}"
-    elif name:
-        return f"https://www.nuget.org/packages/{name}"
+    def resolve_many(self, purls, url_kind):
+        """
+        Return a list of URL of `url_kind` or None for each PackageURL of a
+        `purls` list.
+        """
+        return [self.resolve(purl, url_kind) for purl in purls]
 
 
-@repo_router.route("pkg:hackage/.*")
-def build_hackage_repo_url(purl):
+def get_route_url(router, purl):
     """
-    Return a hackage repo URL from the `purl` string.
+    Return the URL of a `purl` PackageURL built by the endpoint of the regex
+    route of `router` matching this purl, ignoring the endpoints registered for
+    purl types, or None if no route matches.
     """
-    purl_data = PackageURL.from_string(purl)
-
-    name = purl_data.name
-    version = purl_data.version
-
-    if name and version:
-        return f"https://hackage.haskell.org/package/{name}-{version}"
-    elif name:
-        return f"https://hackage.haskell.org/package/{name}"
+    purl_string = purl.to_string()
+    try:
+        endpoint = Router.resolve(router, purl_string)
+    except NoRouteAvailable:
+        return
+    if getattr(endpoint, "accepts_purl", False):
+        return endpoint(purl)
+    return endpoint(purl_string)
 
 
-@repo_router.route("pkg:golang/.*")
-def build_golang_repo_url(purl):
+def get_resolver_endpoint(resolver, url_kind, fallback=None):
     """
-    Return a golang repo URL from the `purl` string.
+    Return a purl2url endpoint that returns the `url_kind` URL of a purl from
+    `resolver` or else from the `fallback` endpoint. Without a `fallback`, the
+    regex routes of the `url_kind` router are tried instead, such that a
+    resolver does not shadow the extension routes of its purl types.
     """
-    purl_data = PackageURL.from_string(purl)
 
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
+    if fallback is None:
+        build_fallback_url = partial(get_route_url, URL_ROUTERS[url_kind])
+    elif getattr(fallback, "accepts_purl", False):
+        build_fallback_url = fallback
+    else:
 
-    if name and version:
-        return f"https://pkg.go.dev/{namespace}/{name}@{version}"
-    elif name:
-        return f"https://pkg.go.dev/{namespace}/{name}"
+        def build_fallback_url(purl):
+            return fallback(purl.to_string())
+
+    @accepts_purl
+    def resolve_url(purl):
+        url = resolver.resolve(purl, url_kind)
+        if url is None and build_fallback_url:
+            return build_fallback_url(purl)
+        return url
+
+    def resolve_urls(purls):
+        urls = list(resolver.resolve_many(purls, url_kind))
+        missing = [index for index, url in enumerate(urls) if url is None]
+        if missing and build_fallback_url:
+            fallback_urls = build_urls(build_fallback_url, [purls[index] for index in missing])
+            for index, url in zip(missing, fallback_urls):
+                urls[index] = url
+        return urls
 
+    resolve_url.build_many = resolve_urls
+    resolve_url.resolver = resolver
+    resolve_url.url_kind = url_kind
+    resolve_url.fallback = fallback
+    return resolve_url
 
-@repo_router.route("pkg:cocoapods/.*")
-def build_cocoapods_repo_url(purl):
+
+def register_resolver(resolver):
     """
-    Return a CocoaPods repo URL from the `purl` string.
+    Register a PurlResolver `resolver` to be tried first for its purl types and
+    URL kinds. When a resolver returns no URL, the previously registered
+    resolvers and then the URL builder of the purl type are tried in turn, or
+    the regex routes for purl types without a URL builder.
     """
-    purl_data = PackageURL.from_string(purl)
-    name = purl_data.name
-    return name and f"https://cocoapods.org/pods/{name}"
+    for url_kind in resolver.url_kinds:
+        router = URL_ROUTERS[url_kind]
+        for purl_type in resolver.purl_types:
+            fallback = router.type_map.get(purl_type.lower())
+            endpoint = get_resolver_endpoint(resolver, url_kind, fallback)
+            router.replace_type(purl_type, endpoint)
 
 
-@repo_router.route("pkg:maven/.*")
-def build_maven_repo_url(purl):
+def unregister_resolver(resolver):
     """
-    Return a Maven repo URL from the `purl` string.
+    Unregister a PurlResolver `resolver` registered with register_resolver.
     """
-    purl_data = PackageURL.from_string(purl)
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
-    qualifiers = purl_data.qualifiers
 
-    base_url = qualifiers.get("repository_url", DEFAULT_MAVEN_REPOSITORY)
+    def remove_resolver(endpoint):
+        if not hasattr(endpoint, "resolver"):
+            return endpoint
+        fallback = remove_resolver(endpoint.fallback)
+        if endpoint.resolver is resolver:
+            return fallback
+        return get_resolver_endpoint(endpoint.resolver, endpoint.url_kind, fallback)
 
-    if namespace and name and version:
-        namespace = namespace.replace(".", "/")
-        return f"{base_url}/{namespace}/{name}/{version}"
+    for url_kind in resolver.url_kinds:
+        router = URL_ROUTERS[url_kind]
+        for purl_type in resolver.purl_types:
+            endpoint = router.type_map.get(purl_type.lower())
+            router.replace_type(purl_type, remove_resolver(endpoint))
 
 
-# Download URLs:
+class FileIndexResolver(PurlResolver):
+    """
+    A PurlResolver using a JSON index file at `location` that maps purl strings
+    to a mapping of {URL kind: URL} such as::
 
+        {"pkg:pypi/django@4.2": {"download_url": "https://...", "api_url": "https://..."}}
 
-@download_router.route("pkg:cargo/.*")
-def build_cargo_download_url(purl):
+    A purl is looked up first with and then without its qualifiers and subpath.
     """
-    Return a cargo download URL from the `purl` string.
-    """
-    purl_data = PackageURL.from_string(purl)
 
-    name = purl_data.name
-    version = purl_data.version
+    def __init__(self, location, purl_types, url_kinds=("download_url",)):
+        super().__init__()
+        self.location = location
+        self.purl_types = tuple(purl_types)
+        self.url_kinds = tuple(url_kinds)
 
-    if name and version:
-        return f"https://crates.io/api/v1/crates/{name}/{version}/download"
+    def load_index(self):
+        with open(self.location, encoding="utf-8") as index_file:
+            urls_by_purl = json.load(index_file)
+        return {
+            PackageURL.from_string(purl).to_string(): urls for purl, urls in urls_by_purl.items()
+        }
 
+    def resolve(self, purl, url_kind):
+        index = self.index
+        urls = index.get(purl.to_string())
+        if urls is None and (purl.qualifiers or purl.subpath):
+            urls = index.get(purl._replace(qualifiers={}, subpath=None).to_string())
+        if urls:
+            return urls.get(url_kind)
 
-@download_router.route("pkg:(gem|rubygems)/.*")
-def build_rubygems_download_url(purl):
+
+URLRewriteRule = namedtuple("URLRewriteRule", ["prefix", "replacement", "purl_type", "url_kind"])
+
+
+def get_url_host(url):
     """
-    Return a rubygems download URL from the `purl` string.
+    Return the lowercased host, with its port and credentials if any, of a
+    `url` string.
     """
-    purl_data = PackageURL.from_string(purl)
+    return url.partition("://")[2].partition("/")[0].lower()
 
-    name = purl_data.name
-    version = purl_data.version
 
-    if name and version:
-        return f"https://rubygems.org/downloads/{name}-{version}.gem"
+def lowercase_scheme_and_host(url):
+    """
+    Return a `url` string with its case-insensitive scheme and host lowercased.
+    """
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        return url
+    host, slash, path = rest.partition("/")
+    return f"{scheme.lower()}://{host.lower()}{slash}{path}"
 
 
-@download_router.route("pkg:npm/.*")
-def build_npm_download_url(purl):
+class URLRewriter:
     """
-    Return a npm download URL from the `purl` string.
+    A table of URL prefix rewrite rules used to rewrite all the inferred URLs,
+    for instance to use internal mirrors of the public package registries.
+
+    A rule replaces the `prefix` of URLs with a `replacement` prefix and can be
+    restricted to a purl type and to a URL kind. Rules are indexed by the host
+    of their prefix and compiled once for each purl type and URL kind: the most
+    specific rule applies first, then the longest prefix. The scheme and host of
+    prefixes and URLs are matched case-insensitively.
+
+    For example::
+
+        >>> rewriter = URLRewriter()
+        >>> rewriter.add_rule(
+        ...     "https://repo.maven.apache.org/maven2/",
+        ...     "https://artifactory.example.com/maven-remote/",
+        ... )
+        >>> rewriter.rewrite(
+        ...     "https://repo.maven.apache.org/maven2/ant/ant/1.5/ant-1.5.jar", "maven"
+        ... )
+        'https://artifactory.example.com/maven-remote/ant/ant/1.5/ant-1.5.jar'
     """
-    purl_data = PackageURL.from_string(purl)
 
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
+    def __init__(self, rules=()):
+        self._rules = []
+        self._rewriters = {}
+        self._lock = threading.Lock()
+        self.add_rules(rules)
 
-    base_url = "https://registry.npmjs.org"
+    @property
+    def rules(self):
+        return list(self._rules)
 
-    if namespace:
-        base_url += f"/{namespace}"
+    def add_rule(self, prefix, replacement, purl_type=None, url_kind=None):
+        """
+        Add a rule to replace the `prefix` of URLs with `replacement` for the
+        URLs of `purl_type` and `url_kind` or of any type or kind if None.
+        Raise ValueError if `prefix` has no scheme and host.
+        """
+        if not get_url_host(prefix):
+            raise ValueError(f"URL prefix must have a scheme and host: {prefix!r}")
+        if url_kind is not None and url_kind not in URL_ROUTERS:
+            raise ValueError(f"Unknown URL kind: {url_kind!r}")
+        rule = URLRewriteRule(prefix, replacement, purl_type and purl_type.lower(), url_kind)
+        with self._lock:
+            self._rules.append(rule)
+            self._rewriters = {}
+
+    def add_rules(self, rules):
+        """
+        Add `rules`, an iterable of mappings with "prefix" and "replacement"
+        keys and optional "purl_type" and "url_kind" keys, as loaded from a JSON
+        configuration file.
+        """
+        for rule in rules:
+            self.add_rule(**rule)
 
-    if name and version:
-        return f"{base_url}/{name}/-/{name}-{version}.tgz"
+    def get_rewriter(self, purl_type=None, url_kind=None):
+        """
+        Return a function that rewrites a URL of `purl_type` and `url_kind`, or
+        None if no rule applies to these URLs.
+        """
+        key = (purl_type, url_kind)
+        rewriters = self._rewriters
+        if key not in rewriters:
+            rewriters[key] = self._compile(purl_type, url_kind)
+        return rewriters[key]
+
+    def _compile(self, purl_type, url_kind):
+        def get_precedence(rule):
+            return (rule.purl_type is None, rule.url_kind is None, -len(rule.prefix))
+
+        rules = [
+            rule
+            for rule in self._rules
+            if rule.purl_type in (None, purl_type) and rule.url_kind in (None, url_kind)
+        ]
+        if not rules:
+            return
 
+        # {host: [(prefix, replacement), ...]}
+        rules_by_host = {}
+        for rule in sorted(rules, key=get_precedence):
+            host_rules = rules_by_host.setdefault(get_url_host(rule.prefix), [])
+            host_rules.append((lowercase_scheme_and_host(rule.prefix), rule.replacement))
 
-@download_router.route("pkg:maven/.*")
-def build_maven_download_url(purl):
-    """
-    Return a maven download URL from the `purl` string.
-    """
-    purl_data = PackageURL.from_string(purl)
+        def rewrite(url):
+            host_rules = rules_by_host.get(get_url_host(url))
+            if host_rules:
+                normalized_url = lowercase_scheme_and_host(url)
+                for prefix, replacement in host_rules:
+                    if normalized_url.startswith(prefix):
+                        return replacement + normalized_url[len(prefix) :]
+            return url
 
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
-    qualifiers = purl_data.qualifiers
+        return rewrite
+
+    def rewrite(self, url, purl_type=None, url_kind=None):
+        """
+        Return `url` of `purl_type` and `url_kind` rewritten with the first
+        matching rule, or unchanged.
+        """
+        rewrite = self.get_rewriter(purl_type, url_kind)
+        if rewrite:
+            return rewrite(url)
+        return url
 
-    base_url = qualifiers.get("repository_url", DEFAULT_MAVEN_REPOSITORY)
-    maven_type = qualifiers.get("type", "jar")  # default to "jar"
-    classifier = qualifiers.get("classifier")
 
-    if namespace and name and version:
-        namespace = namespace.replace(".", "/")
-        classifier = f"-{classifier}" if classifier else ""
-        return f"{base_url}/{namespace}/{name}/{version}/{name}-{version}{classifier}.{maven_type}"
+# The URLRewriter applied to all the inferred URLs, if any
+url_rewriter = None
 
 
-@download_router.route("pkg:hackage/.*")
-def build_hackage_download_url(purl):
+def enable_url_rewriter(rewriter):
     """
-    Return a hackage download URL from the `purl` string.
+    Rewrite all the inferred URLs with a `rewriter` URLRewriter or iterable of
+    rule mappings and return the URLRewriter.
     """
-    purl_data = PackageURL.from_string(purl)
-
-    name = purl_data.name
-    version = purl_data.version
-
-    if name and version:
-        return f"https://hackage.haskell.org/package/{name}-{version}/{name}-{version}.tar.gz"
+    global url_rewriter
+    if not isinstance(rewriter, URLRewriter):
+        rewriter = URLRewriter(rewriter)
+    url_rewriter = rewriter
+    return rewriter
 
 
-@download_router.route("pkg:nuget/.*")
-def build_nuget_download_url(purl):
+def disable_url_rewriter():
     """
-    Return a nuget download URL from the `purl` string.
+    Stop rewriting the inferred URLs.
     """
-    purl_data = PackageURL.from_string(purl)
+    global url_rewriter
+    url_rewriter = None
 
-    name = purl_data.name
-    version = purl_data.version
 
-    if name and version:
-        return f"https://www.nuget.org/api/v2/package/{name}/{version}"
+# Backward compatibility
+purl2url = get_repo_url
+get_url = get_repo_url
 
 
-@download_router.route("pkg:gitlab/.*", "pkg:bitbucket/.*", "pkg:github/.*")
-def build_repo_download_url(purl):
+def get_classifier_suffix(purl):
+    classifier = purl.qualifiers.get("classifier")
+    return f"-{classifier}" if classifier else ""
+
+
+# Fields computed from a PackageURL that can be used in URL templates, in
+# addition to the purl namespace, name and version and the template qualifiers.
+# A field value of None means that the field has no value.
+TEMPLATE_FIELDS = {
+    "namespace_path": lambda purl: purl.namespace and purl.namespace.replace(".", "/"),
+    "name_initial": lambda purl: purl.name and purl.name[0],
+    "dashed_name": lambda purl: purl.name and purl.name.replace("_", "-"),
+    "lowercase_name": lambda purl: purl.name and purl.name.lower(),
+    "classifier_suffix": get_classifier_suffix,
+}
+
+
+def compile_url_template(templates, qualifiers=None):
+    """
+    Return a URL template function compiled once from `templates` that returns
+    a URL formatted from a purl string or PackageURL, or None.
+
+    `templates` is a str.format-style template string or a sequence of
+    template strings tried in order: the first template whose fields all have a
+    value is used to format the URL, and no URL is returned otherwise. Template
+    fields are the purl namespace, name and version, the supported `qualifiers`
+    mapping of {qualifier: default value or None} and the TEMPLATE_FIELDS.
+
+    The returned function is a purl2url endpoint that can be registered in a
+    PurlRouter. Its `build_many` attribute is a function that returns a list
+    of URL or None for each PackageURL of an iterable, formatted one at a time.
+    """
+    if isinstance(templates, str):
+        templates = (templates,)
+    templates = tuple(templates)
+    qualifiers = dict(qualifiers or {})
+    formatters = [_get_url_template_formatter(template, qualifiers) for template in templates]
+
+    def format_url(purl):
+        if not isinstance(purl, PackageURL):
+            purl = PackageURL.from_string(purl)
+        for formatter in formatters:
+            url = formatter(purl)
+            if url is not None:
+                return url
+
+    format_url.templates = templates
+    format_url.qualifiers = qualifiers
+    format_url.accepts_purl = True
+    format_url.build_many = lambda purls: [format_url(purl) for purl in purls]
+    return format_url
+
+
+def _get_url_template_formatter(template, qualifiers):
+    """
+    Return a function that returns a URL formatted from a PackageURL for a
+    `template` string, or None if a template field has no value.
+    """
+    getters = {}
+    for _literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is None or field in getters:
+            continue
+        if spec or conversion:
+            raise ValueError(f"Unsupported format in URL template: {template!r}")
+        if field in ("namespace", "name", "version"):
+            getters[field] = partial(get_purl_field, field)
+        elif field in qualifiers:
+            getters[field] = partial(get_qualifier, field, qualifiers[field])
+        elif field in TEMPLATE_FIELDS:
+            getters[field] = TEMPLATE_FIELDS[field]
+        else:
+            raise ValueError(f"Unknown field {field!r} in URL template: {template!r}")
+    getters = tuple(getters.items())
+
+    def format_template(purl):
+        values = {}
+        for field, getter in getters:
+            value = getter(purl)
+            if value is None:
+                return None
+            values[field] = value
+        return template.format_map(values)
+
+    return format_template
+
+
+def get_purl_field(field, purl):
+    """
+    Return the `field` attribute value of a `purl` PackageURL or None if empty.
+    """
+    return getattr(purl, field) or None
+
+
+def get_qualifier(qualifier, default, purl):
+    """
+    Return the `qualifier` value of a `purl` PackageURL or `default`.
+    """
+    return purl.qualifiers.get(qualifier, default)
+
+
+# Mapping of {purl type: {URL kind: template(s)}} for purl types whose URLs are
+# built from templates. URL kinds are the keys of URL_ROUTERS and their value
+# is one or more template strings for compile_url_template. "qualifiers"
+# is the mapping of supported {qualifier: default value or None} for the type.
+# Use register_url_templates to add a purl type.
+PURL_URL_TEMPLATES = {
+    "alpm": {
+        "download_url": "https://archive.archlinux.org/packages/{name_initial}/{name}/{name}-{version}-{arch}.pkg.tar.zst",
+        "api_url": "https://archlinux.org/packages/search/json/?name={name}",
+        "qualifiers": {"arch": "any"},
+    },
+    "bitbucket": {
+        "repo_url": "https://bitbucket.org/{namespace}/{name}",
+        "api_url": "https://api.bitbucket.org/2.0/repositories/{namespace}/{name}",
+    },
+    "cargo": {
+        "repo_url": (
+            "https://crates.io/crates/{name}/{version}",
+            "https://crates.io/crates/{name}",
+        ),
+        "download_url": "https://crates.io/api/v1/crates/{name}/{version}/download",
+        "api_url": (
+            "https://crates.io/api/v1/crates/{name}/{version}",
+            "https://crates.io/api/v1/crates/{name}",
+        ),
+    },
+    "cocoapods": {
+        "repo_url": "https://cocoapods.org/pods/{name}",
+        "api_url": "https://trunk.cocoapods.org/api/v1/pods/{name}",
+    },
+    "composer": {
+        "repo_url": (
+            "https://packagist.org/packages/{namespace}/{name}#{version}",
+            "https://packagist.org/packages/{namespace}/{name}",
+        ),
+        "api_url": "https://repo.packagist.org/p2/{namespace}/{name}.json",
+    },
+    "cran": {
+        "repo_url": "https://cran.r-project.org/src/contrib/{name}_{version}.tar.gz",
+        "api_url": (
+            "https://crandb.r-pkg.org/{name}/{version}",
+            "https://crandb.r-pkg.org/{name}",
+        ),
+    },
+    "gem": {
+        "repo_url": (
+            "https://rubygems.org/gems/{name}/versions/{version}",
+            "https://rubygems.org/gems/{name}",
+        ),
+        "download_url": "https://rubygems.org/downloads/{name}-{version}.gem",
+        "api_url": (
+            "https://rubygems.org/api/v2/rubygems/{name}/versions/{version}.json",
+            "https://rubygems.org/api/v1/gems/{name}.json",
+        ),
+    },
+    "github": {
+        "repo_url": (
+            "https://github.com/{namespace}/{name}/tree/{version_prefix}{version}",
+            "https://github.com/{namespace}/{name}",
+        ),
+        "api_url": "https://api.github.com/repos/{namespace}/{name}",
+        "qualifiers": {"version_prefix": ""},
+    },
+    "gitlab": {
+        "repo_url": "https://gitlab.com/{namespace}/{name}",
+    },
+    "golang": {
+        "repo_url": (
+            "https://pkg.go.dev/{namespace}/{name}@{version}",
+            "https://pkg.go.dev/{namespace}/{name}",
+            "https://pkg.go.dev/{name}@{version}",
+            "https://pkg.go.dev/{name}",
+        ),
+    },
+    "hackage": {
+        "repo_url": (
+            "https://hackage.haskell.org/package/{name}-{version}",
+            "https://hackage.haskell.org/package/{name}",
+        ),
+        "download_url": "https://hackage.haskell.org/package/{name}-{version}/{name}-{version}.tar.gz",
+    },
+    "hex": {
+        "download_url": "https://repo.hex.pm/tarballs/{name}-{version}.tar",
+        "api_url": (
+            "https://hex.pm/api/packages/{name}/releases/{version}",
+            "https://hex.pm/api/packages/{name}",
+        ),
+    },
+    "luarocks": {
+        "download_url": "{repository_url}/{name}-{version}.src.rock",
+        "qualifiers": {"repository_url": "https://luarocks.org"},
+    },
+    "maven": {
+        "repo_url": "{repository_url}/{namespace_path}/{name}/{version}",
+        "download_url": "{repository_url}/{namespace_path}/{name}/{version}/{name}-{version}{classifier_suffix}.{type}",
+        "api_url": "{repository_url}/{namespace_path}/{name}/maven-metadata.xml",
+        "qualifiers": {
+            "repository_url": DEFAULT_MAVEN_REPOSITORY,
+            "type": "jar",
+            "classifier": None,
+        },
+    },
+    "npm": {
+        "api_url": (
+            "https://registry.npmjs.org/{namespace}/{name}",
+            "https://registry.npmjs.org/{name}",
+        ),
+    },
+    "nuget": {
+        "repo_url": (
+            "https://www.nuget.org/packages/{name}/{version}",
+            "https://www.nuget.org/packages/{name}",
+        ),
+        "download_url": "https://www.nuget.org/api/v2/package/{name}/{version}",
+        "api_url": "https://api.nuget.org/v3-flatcontainer/{lowercase_name}/index.json",
+    },
+    "pub": {
+        "download_url": "https://pub.dev/api/archives/{name}-{version}.tar.gz",
+        "api_url": (
+            "https://pub.dev/api/packages/{name}/versions/{version}",
+            "https://pub.dev/api/packages/{name}",
+        ),
+    },
+    "pypi": {
+        "repo_url": (
+            "https://pypi.org/project/{dashed_name}/{version}/",
+            "https://pypi.org/project/{dashed_name}/",
+        ),
+        "api_url": (
+            "https://pypi.org/pypi/{name}/{version}/json",
+            "https://pypi.org/pypi/{name}/json",
+        ),
+    },
+    "swift": {
+        "download_url": "https://{namespace}/{name}/archive/{version}.zip",
+    },
+}
+
+PURL_URL_TEMPLATES["rubygems"] = PURL_URL_TEMPLATES["gem"]
+
+
+def register_url_templates(purl_type, templates_by_kind):
+    """
+    Compile and register the URL templates of a `templates_by_kind` mapping
+    for `purl_type`, as found in PURL_URL_TEMPLATES.
+    """
+    PURL_URL_TEMPLATES.setdefault(purl_type, templates_by_kind)
+    qualifiers = templates_by_kind.get("qualifiers")
+    for kind, router in URL_ROUTERS.items():
+        templates = templates_by_kind.get(kind)
+        if templates:
+            router.append_type(purl_type, compile_url_template(templates, qualifiers))
+
+
+for _purl_type, _templates_by_kind in PURL_URL_TEMPLATES.items():
+    register_url_templates(_purl_type, _templates_by_kind)
+
+
+# Backward compatibility: these builders are now compiled URL templates
+build_cargo_repo_url = repo_router.type_map["cargo"]
+build_bitbucket_repo_url = repo_router.type_map["bitbucket"]
+build_github_repo_url = repo_router.type_map["github"]
+build_gitlab_repo_url = repo_router.type_map["gitlab"]
+build_rubygems_repo_url = repo_router.type_map["rubygems"]
+build_cran_repo_url = repo_router.type_map["cran"]
+build_pypi_repo_url = repo_router.type_map["pypi"]
+build_composer_repo_url = repo_router.type_map["composer"]
+build_nuget_repo_url = repo_router.type_map["nuget"]
+build_hackage_repo_url = repo_router.type_map["hackage"]
+build_golang_repo_url = repo_router.type_map["golang"]
+build_cocoapods_repo_url = repo_router.type_map["cocoapods"]
+build_maven_repo_url = repo_router.type_map["maven"]
+build_cargo_download_url = download_router.type_map["cargo"]
+build_rubygems_download_url = download_router.type_map["rubygems"]
+build_maven_download_url = download_router.type_map["maven"]
+build_hackage_download_url = download_router.type_map["hackage"]
+build_nuget_download_url = download_router.type_map["nuget"]
+build_hex_download_url = download_router.type_map["hex"]
+build_pub_download_url = download_router.type_map["pub"]
+build_swift_download_url = download_router.type_map["swift"]
+build_luarocks_download_url = download_router.type_map["luarocks"]
+build_alpm_download_url = download_router.type_map["alpm"]
+
+
+@repo_router.route_type("npm")
+@accepts_purl
+def build_npm_repo_url(purl):
     """
-    Return a gitlab download URL from the `purl` string.
+    Return a npm repo URL from the `purl`.
     """
-    return get_repo_download_url(purl)
+    namespace = purl.namespace
+    name = purl.name
+    version = purl.version
 
+    repo_url = "https://www.npmjs.com/package/"
+    if namespace:
+        repo_url += f"{namespace}/"
+
+    repo_url += f"{name}"
+
+    if version:
+        repo_url += f"/v/{version}"
+
+    return repo_url
 
-@download_router.route("pkg:hex/.*")
-def build_hex_download_url(purl):
+
+# Download URLs:
+
+
+@download_router.route_type("npm")
+@accepts_purl
+def build_npm_download_url(purl):
     """
-    Return a hex download URL from the `purl` string.
+    Return a npm download URL from the `purl`.
     """
-    purl_data = PackageURL.from_string(purl)
+    namespace = purl.namespace
+    name = purl.name
+    version = purl.version
 
-    name = purl_data.name
-    version = purl_data.version
+    base_url = "https://registry.npmjs.org"
+
+    if namespace:
+        base_url += f"/{namespace}"
 
     if name and version:
-        return f"https://repo.hex.pm/tarballs/{name}-{version}.tar"
+        return f"{base_url}/{name}/-/{name}-{version}.tgz"
 
 
-@download_router.route("pkg:golang/.*")
-def build_golang_download_url(purl):
+@download_router.route_type("gitlab", "bitbucket", "github")
+@accepts_purl
+def build_repo_download_url(purl):
     """
-    Return a golang download URL from the `purl` string.
+    Return a gitlab download URL from the `purl`.
     """
-    purl_data = PackageURL.from_string(purl)
+    return get_repo_download_url(purl)
 
-    namespace = purl_data.namespace
-    name = purl_data.name
-    version = purl_data.version
+
+@download_router.route_type("golang")
+@accepts_purl
+def build_golang_download_url(purl):
+    """
+    Return a golang download URL from the `purl`.
+    """
+    namespace = purl.namespace
+    name = purl.name
+    version = purl.version
 
     if not name:
         return
@@ -485,56 +1093,45 @@ def build_golang_download_url(purl):
         return f"https://proxy.golang.org/{ename}/@v/{eversion}.zip"
 
 
-@download_router.route("pkg:pub/.*")
-def build_pub_download_url(purl):
+@api_router.route_type("golang")
+@accepts_purl
+def build_golang_api_url(purl):
     """
-    Return a pub download URL from the `purl` string.
+    Return a Go module proxy URL from the `purl`: the version info URL for a
+    versioned purl or the version list URL otherwise.
     """
-    purl_data = PackageURL.from_string(purl)
-
-    name = purl_data.name
-    version = purl_data.version
-
-    if name and version:
-        return f"https://pub.dev/api/archives/{name}-{version}.tar.gz"
-
-
-@download_router.route("pkg:swift/.*")
-def build_swift_download_url(purl):
-    """
-    Return a Swift Package download URL from the `purl` string.
-    """
-    purl_data = PackageURL.from_string(purl)
+    name = purl.name
+    if not name:
+        return
 
-    name = purl_data.name
-    version = purl_data.version
-    namespace = purl_data.namespace
+    if purl.namespace:
+        name = f"{purl.namespace}/{name}"
+    base_url = f"https://proxy.golang.org/{escape_golang_path(name)}/@v"
 
-    if not (namespace or name or version):
-        return
+    version = purl.version
+    if not version:
+        return f"{base_url}/list"
 
-    return f"https://{namespace}/{name}/archive/{version}.zip"
+    eversion = escape_golang_path(version)
+    if not eversion.startswith("v"):
+        eversion = "v" + eversion
+    return f"{base_url}/{eversion}.info"
 
 
-@download_router.route("pkg:luarocks/.*")
-def build_luarocks_download_url(purl):
+def get_conda_channel_url(channel: str) -> str:
     """
-    Return a LuaRocks download URL from the `purl` string.
+    Map a conda channel to its base URL.
+    - 'main' / 'defaults' -> repo.anaconda.com
+    - any other channel    -> conda.anaconda.org/<channel>
     """
-    purl_data = PackageURL.from_string(purl)
-
-    qualifiers = purl_data.qualifiers or {}
-
-    repository_url = qualifiers.get("repository_url", "https://luarocks.org")
-
-    name = purl_data.name
-    version = purl_data.version
-
-    if name and version:
-        return f"{repository_url}/{name}-{version}.src.rock"
+    ch = (channel or "").lower()
+    if ch in ("main", "defaults"):
+        return "https://repo.anaconda.com/pkgs/main"
+    return f"https://conda.anaconda.org/{ch}"
 
 
-@download_router.route("pkg:conda/.*")
+@download_router.route_type("conda")
+@accepts_purl
 def build_conda_download_url(purl):
     """
     Resolve a Conda PURL to a real downloadable URL
@@ -545,30 +1142,18 @@ def build_conda_download_url(purl):
       - build:  exact build string (optional but recommended)
       - type:   'conda' or 'tar.bz2' (preference; fallback to whichever exists)
     """
-    p = PackageURL.from_string(purl)
-    if not p.name or not p.version:
+    if not purl.name or not purl.version:
         return None
 
-    q = p.qualifiers or {}
-    name = p.name
-    version = p.version
+    q = purl.qualifiers or {}
+    name = purl.name
+    version = purl.version
     build = q.get("build")
     channel = q.get("channel") or "main"
     subdir = q.get("subdir") or "noarch"
     req_type = q.get("type")
 
-    def _conda_base_for_channel(channel: str) -> str:
-        """
-        Map a conda channel to its base URL.
-        - 'main' / 'defaults' -> repo.anaconda.com
-        - any other channel    -> conda.anaconda.org/<channel>
-        """
-        ch = (channel or "").lower()
-        if ch in ("main", "defaults"):
-            return "https://repo.anaconda.com/pkgs/main"
-        return f"https://conda.anaconda.org/{ch}"
-
-    base = _conda_base_for_channel(channel)
+    base = get_conda_channel_url(channel)
 
     package_identifier = (
         f"{name}-{version}-{build}.{req_type}" if build else f"{name}-{version}.{req_type}"
@@ -578,21 +1163,6 @@ def build_conda_download_url(purl):
     return download_url
 
 
-@download_router.route("pkg:alpm/.*")
-def build_alpm_download_url(purl_str):
-    purl = PackageURL.from_string(purl_str)
-    name = purl.name
-    version = purl.version
-    arch = purl.qualifiers.get("arch", "any")
-
-    if not name or not version:
-        return None
-
-    first_letter = name[0]
-    url = f"https://archive.archlinux.org/packages/{first_letter}/{name}/{name}-{version}-{arch}.pkg.tar.zst"
-    return url
-
-
 def normalize_version(version: str) -> str:
     """
     Remove the epoch (if any) from a Debian version.
@@ -604,18 +1174,42 @@ def normalize_version(version: str) -> str:
     return version
 
 
-@download_router.route("pkg:deb/.*")
-def build_deb_download_url(purl_str: str) -> str:
+# Mapping of {deb purl namespace: default repository URL}
+DEB_REPOSITORY_URLS = {
+    "debian": "https://deb.debian.org/debian",
+    "ubuntu": "http://archive.ubuntu.com/ubuntu",
+}
+
+
+def get_deb_pool_prefix(name: str) -> str:
+    """
+    Return the prefix directory of a package `name` in a Debian pool: the
+    first letter of the name or "lib" and the next letter for "lib*" names.
+
+    >>> get_deb_pool_prefix("attr")
+    'a'
+    >>> get_deb_pool_prefix("libxml2")
+    'libx'
+    >>> get_deb_pool_prefix("lib")
+    'l'
+    """
+    name = name.lower()
+    if name.startswith("lib") and len(name) > 3:
+        return name[:4]
+    return name[0]
+
+
+@download_router.route_type("deb")
+@accepts_purl
+def build_deb_download_url(purl: PackageURL) -> str:
     """
     Construct a download URL for a Debian or Ubuntu package PURL.
     Supports optional 'repository_url' in qualifiers.
     """
-    p = PackageURL.from_string(purl_str)
-
-    name = p.name
-    version = p.version
-    namespace = p.namespace
-    qualifiers = p.qualifiers or {}
+    name = purl.name
+    version = purl.version
+    namespace = purl.namespace
+    qualifiers = purl.qualifiers or {}
     arch = qualifiers.get("arch")
     repository_url = qualifiers.get("repository_url")
 
@@ -628,11 +1222,8 @@ def build_deb_download_url(purl_str: str) -> str:
     if repository_url:
         base_url = repository_url.rstrip("/")
     else:
-        if namespace == "debian":
-            base_url = "https://deb.debian.org/debian"
-        elif namespace == "ubuntu":
-            base_url = "http://archive.ubuntu.com/ubuntu"
-        else:
+        base_url = DEB_REPOSITORY_URLS.get(namespace)
+        if not base_url:
             raise NotImplementedError(f"Unsupported distro namespace: {namespace}")
 
     norm_version = normalize_version(version)
@@ -642,12 +1233,13 @@ def build_deb_download_url(purl_str: str) -> str:
     else:
         filename = f"{name}_{norm_version}_{arch}.deb"
 
-    pool_path = f"/pool/main/{name[0].lower()}/{name}"
+    pool_path = f"/pool/main/{get_deb_pool_prefix(name)}/{name}"
 
     return f"{base_url}{pool_path}/{filename}"
 
 
-@download_router.route("pkg:apk/.*")
+@download_router.route_type("apk")
+@accepts_purl
 def build_apk_download_url(purl):
     """
     Return a download URL for a fully qualified Alpine Linux package PURL.
@@ -655,7 +1247,6 @@ def build_apk_download_url(purl):
     Example:
     pkg:apk/acct@6.6.4-r0?arch=x86&alpine_version=v3.11&repo=main
     """
-    purl = PackageURL.from_string(purl)
     name = purl.name
     version = purl.version
     arch = purl.qualifiers.get("arch")
@@ -678,7 +1269,7 @@ def get_repo_download_url(purl):
     if ``namespace``, ``name`` and ``version`` are present in ``purl``
     else return None.
     """
-    purl_data = PackageURL.from_string(purl)
+    purl_data = parse_purl(purl)
 
     namespace = purl_data.namespace
     type = purl_data.type
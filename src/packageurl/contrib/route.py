@@ -24,9 +24,30 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+from __future__ import annotations
+
 import inspect
 import re
+import threading
+import time
+from functools import lru_cache
 from functools import wraps
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import KeysView
+    from collections.abc import Mapping
+    from functools import _lru_cache_wrapper
+
+    Endpoint = Callable[..., Any]
+    # an (endpoint or None, error) tuple, where error is None or an
+    # (exception class, message) tuple
+    ResolveResult = tuple[Any, tuple[type[TypeError], str] | None]
 
 """
 Given a URI regex (or some string), this module can route execution to a
@@ -61,7 +82,7 @@ class Rule(object):
     be resolved and eventually invoked for a given string (typically a URI).
     """
 
-    def __init__(self, pattern, endpoint):
+    def __init__(self, pattern: str, endpoint: Endpoint) -> None:
         # To ensure the pattern will match entirely, we wrap the pattern
         # with start of line ^ and  end of line $.
         self.pattern = pattern.lstrip("^").rstrip("$")
@@ -76,10 +97,10 @@ class Rule(object):
 
         self.endpoint = endpoint
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f'Rule(r"""{self.pattern}""", {self.endpoint.__module__}.{self.endpoint.__name__})'
 
-    def match(self, string):
+    def match(self, string: str) -> re.Match[str] | None:
         """
         Match a string with the rule pattern, return True is matching.
         """
@@ -104,6 +125,106 @@ class MultipleRoutesDefined(TypeError):
     """
 
 
+class RuleStats(object):
+    """
+    Hit, miss and cumulative match time counters for a Rule.
+    Counters are updated without locking and are therefore approximate when a
+    router is used concurrently from multiple threads.
+    """
+
+    __slots__ = ("hits", "misses", "match_time")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        # cumulative time spent matching this rule, in seconds
+        self.match_time = 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return dict(hits=self.hits, misses=self.misses, match_time=self.match_time)
+
+
+# the named groups and named back references of a regex pattern
+named_group_pattern = re.compile(r"\(\?P([<=])(\w+)")
+numbered_reference_pattern = re.compile(r"\\[1-9]")
+
+
+@lru_cache(maxsize=256)
+def compile_alternation(patterns: tuple[str, ...]) -> Callable[[str], re.Match[str] | None] | None:
+    """
+    Return a match function of a single regex that matches a string if any of
+    the Rule `patterns` tuple matches this string, or None if these patterns
+    cannot be combined in a regex. Named groups are renamed such that patterns
+    can use the same group names.
+    Compiled alternations are cached: route tables are republished whenever
+    the rules are reordered.
+    """
+    alternatives = []
+    for index, pattern in enumerate(patterns):
+        if numbered_reference_pattern.search(pattern):
+            return None
+        pattern = named_group_pattern.sub(rf"(?P\1r{index}_\2", pattern)
+        alternatives.append(f"(?:^{pattern}$)")
+    if not alternatives:
+        return lambda string: None
+    try:
+        return re.compile("|".join(alternatives)).match
+    except re.error:
+        return None
+
+
+class _RouteTable(object):
+    """
+    An immutable, compiled snapshot of a Router route map.
+
+    A new table is built and published as a whole every time a route is
+    added: a table and its derived indexes are never modified once published
+    and can therefore be read by any number of threads without locking.
+    """
+
+    __slots__ = ("route_map", "rules", "resolve_cache", "_is_routable", "_others_matches")
+
+    def __init__(self, route_map: Mapping[str, Rule], rules: Iterable[Rule] | None = None) -> None:
+        # this is our own private copy, never mutated after publication
+        self.route_map = dict(route_map)
+        # the rules in the order they are tried, by default the map order
+        if rules is None:
+            rules = self.route_map.values()
+        self.rules = tuple(rules)
+        # optional lru_cache'd resolver, set by the Router that owns this table
+        self.resolve_cache: _lru_cache_wrapper[ResolveResult] | None = None
+        # lazy cached pre-compiled regex match() for all route patterns
+        self._is_routable: Callable[[str], re.Match[str] | None] | None = None
+        # lazy cached {pattern: match() of the other rules patterns or None}
+        self._others_matches: dict[str, Callable[[str], re.Match[str] | None] | None] = {}
+
+    def is_routable(self, string: str) -> re.Match[str] | None:
+        is_routable = self._is_routable
+        if not is_routable:
+            # build an alternation regex. Concurrent builds are harmless: they
+            # all compute the same value for this immutable table.
+            routables = "^(" + "|".join(pat for pat in self.route_map) + ")$"
+            is_routable = re.compile(routables, re.UNICODE).match
+            self._is_routable = is_routable
+        return is_routable(string)
+
+    def may_match_others(self, rule: Rule, string: str) -> bool:
+        """
+        Return True if a rule other than `rule` may match `string`. The other
+        rules are matched at once with an alternation of their patterns,
+        compiled on first use. Return True if the patterns cannot be combined.
+        """
+        try:
+            match_others = self._others_matches[rule.pattern]
+        except KeyError:
+            # concurrent builds are harmless, as for is_routable
+            others = tuple(sorted(other.pattern for other in self.rules if other is not rule))
+            match_others = self._others_matches[rule.pattern] = compile_alternation(others)
+        if match_others is None:
+            return True
+        return bool(match_others(string))
+
+
 class Router(object):
     """
     A router is:
@@ -116,35 +237,80 @@ class Router(object):
 
     Multiple routers can co-exist as needed, such as a router to collect,
     another to fetch, etc.
+
+    A router is safe to use from multiple threads: lookups read the current
+    immutable route table without locking and updates are copy-on-write,
+    publishing a new route table atomically.
     """
 
-    def __init__(self, route_map=None):
+    def __init__(self, route_map: Mapping[str, Rule] | None = None) -> None:
         """
         'route_map' is an ordered mapping of pattern -> Rule.
         """
-        self.route_map = route_map or dict()
-        # lazy cached pre-compiled regex match() for all route patterns
-        self._is_routable = None
-
-    def __repr__(self):
-        return repr(self.route_map)
-
-    def __iter__(self):
-        return iter(self.route_map.items())
+        self._lock = threading.Lock()
+        self._table = _RouteTable(route_map or {})
+        # mapping of pattern -> RuleStats, None when stats are disabled
+        self._stats: dict[str, RuleStats] | None = None
+        self._adaptive = False
+        self._reorder_interval = 0
+        self._lookups = 0
+        # max number of resolve cache entries, None when the cache is disabled
+        self._cache_size: int | None = None
+
+    def __repr__(self) -> str:
+        return repr(self._table.route_map)
+
+    def __iter__(self) -> Iterator[tuple[str, Rule]]:
+        return iter(self._table.route_map.items())
+
+    @property
+    def route_map(self) -> Mapping[str, Rule]:
+        """
+        Return a read-only view of the current pattern -> Rule mapping.
+        """
+        return MappingProxyType(self._table.route_map)
 
-    def keys(self):
+    def keys(self) -> KeysView[str]:
         return self.route_map.keys()
 
-    def append(self, pattern, endpoint):
+    def append(self, pattern: str, endpoint: Endpoint) -> None:
         """
         Append a new pattern and endpoint Rule at the end of the map.
         Use this as an alternative to the route decorator.
         """
-        if pattern in self.route_map:
-            raise RouteAlreadyDefined(pattern)
-        self.route_map[pattern] = Rule(pattern, endpoint)
-
-    def route(self, *patterns):
+        rule = Rule(pattern, endpoint)
+        with self._lock:
+            route_map = self._table.route_map
+            if pattern in route_map:
+                raise RouteAlreadyDefined(pattern)
+            route_map = dict(route_map)
+            route_map[pattern] = rule
+            # keep the current, possibly adaptive, order of existing rules
+            self._publish(route_map, self._table.rules + (rule,))
+
+    def _publish(
+        self,
+        route_map: Mapping[str, Rule],
+        rules: Iterable[Rule] | None = None,
+        keep_cache: bool = False,
+    ) -> None:
+        """
+        Publish a new route table for `route_map` and `rules`, with an empty
+        resolve cache if enabled. If `keep_cache` is True, keep the current
+        resolve cache instead: this is only correct if `route_map` is
+        unchanged, as a string resolves to the same endpoint, or error, in any
+        order of the same rules. Must be called with the lock held.
+        """
+        table = _RouteTable(route_map, rules)
+        if self._cache_size:
+            if keep_cache and self._table.resolve_cache is not None:
+                table.resolve_cache = self._table.resolve_cache
+            else:
+                resolve = self._resolve_for_cache
+                table.resolve_cache = lru_cache(maxsize=self._cache_size)(resolve)
+        self._table = table
+
+    def route(self, *patterns: str) -> Callable[[Endpoint], Endpoint]:
         """
         Decorator to make a callable 'endpoint' routed to one or more patterns.
 
@@ -155,26 +321,26 @@ class Router(object):
         ...    pass
         """
 
-        def decorator(endpoint):
+        def decorator(endpoint: Endpoint) -> Endpoint:
             assert patterns
             for pat in patterns:
                 self.append(pat, endpoint)
 
             @wraps(endpoint)
-            def decorated(*args, **kwargs):
+            def decorated(*args: Any, **kwargs: Any) -> Any:
                 return self.process(*args, **kwargs)
 
             return decorated
 
         return decorator
 
-    def process(self, string, *args, **kwargs):
+    def process(self, string: str, *args: Any, **kwargs: Any) -> Any:
         """
         Given a string (typically a URI), resolve this string to an endpoint
         by searching available rules then execute the endpoint callable for
         that string passing down all arguments to the endpoint invocation.
         """
-        endpoint = self.resolve(string)
+        endpoint: Any = self.resolve(string)
         if inspect.isclass(endpoint):
             # instantiate a class, that must define a __call__ method
             # TODO: consider passing args to the constructor?
@@ -182,7 +348,7 @@ class Router(object):
         # call the callable
         return endpoint(string, *args, **kwargs)
 
-    def resolve(self, string):
+    def resolve(self, string: str) -> Endpoint:
         """
         Resolve a string: given a string (typically a URI) resolve and
         return the best endpoint function for that string.
@@ -192,9 +358,29 @@ class Router(object):
         possible for a string (typically a URI), a MultipleRoutesDefined
         TypeError is raised.
         """
+        table = self._table
+        resolve_cache = table.resolve_cache
+        if resolve_cache is not None:
+            endpoint: Endpoint
+            endpoint, error = resolve_cache(string)
+            if error:
+                error_class, message = error
+                raise error_class(message)
+            return endpoint
+        return self._resolve(table, string)
+
+    def _resolve(self, table: _RouteTable, string: str) -> Endpoint:
+        """
+        Resolve a `string` with the rules of a route `table`, bypassing the
+        resolve cache.
+        """
+        stats = self._stats
+        if stats is not None:
+            return self._resolve_with_stats(stats, table, string)
+
         # TODO: we could improve the performance of this by using a single
         # regex and named groups if this ever becomes a bottleneck.
-        candidates = [r for r in self.route_map.values() if r.match(string)]
+        candidates = [r for r in table.rules if r.match(string)]
 
         if not candidates:
             raise NoRouteAvailable(string)
@@ -208,17 +394,183 @@ class Router(object):
 
         return candidates[0].endpoint
 
-    def is_routable(self, string):
+    def _resolve_for_cache(self, string: str) -> ResolveResult:
+        """
+        Return a tuple of (endpoint, error) for a `string` resolved with the
+        current route table, where error is None or an (exception class,
+        message) tuple. Errors are cached as values such that strings without a
+        route are not resolved again.
+        """
+        try:
+            return self._resolve(self._table, string), None
+        except (NoRouteAvailable, MultipleRoutesDefined) as e:
+            return None, (type(e), str(e))
+
+    def enable_cache(self, maxsize: int = 1024) -> None:
+        """
+        Cache up to `maxsize` recently resolved strings. The cache is emptied
+        whenever the routes change and kept when adaptive statistics or
+        `disable_stats` only change their order. When the cache is enabled,
+        rule statistics are only collected for cache misses.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer: {maxsize!r}")
+        with self._lock:
+            self._cache_size = maxsize
+            self._publish(self._table.route_map, self._table.rules)
+
+    def disable_cache(self) -> None:
+        """
+        Stop caching resolved strings and discard the cache.
+        """
+        with self._lock:
+            self._cache_size = None
+            self._publish(self._table.route_map, self._table.rules)
+
+    def cache_info(self) -> dict[str, float | None]:
+        """
+        Return a mapping of {hits, misses, hit_rate, size, maxsize} for the
+        resolve cache of the current route table.
+        Return an empty mapping if the cache is not enabled.
+        """
+        resolve_cache = self._table.resolve_cache
+        if resolve_cache is None:
+            return {}
+        info = resolve_cache.cache_info()
+        lookups = info.hits + info.misses
+        return dict(
+            hits=info.hits,
+            misses=info.misses,
+            hit_rate=info.hits / lookups if lookups else 0.0,
+            size=info.currsize,
+            maxsize=info.maxsize,
+        )
+
+    def _resolve_with_stats(
+        self, stats: dict[str, RuleStats], table: _RouteTable, string: str
+    ) -> Endpoint:
+        """
+        Resolve a `string` with the rules of a route `table` like `_resolve`
+        but also record rule statistics in the `stats` mapping of
+        {pattern: RuleStats}.
+        In adaptive mode, rules are tried hottest first. Once a rule matches,
+        the remaining rules are only tried one by one if their combined
+        alternation also matches, such that ambiguous routes are still
+        detected.
+        """
+        adaptive = self._adaptive
+        timer = time.perf_counter
+        candidates = []
+        for rule in table.rules:
+            rule_stats = stats.get(rule.pattern)
+            if rule_stats is None:
+                rule_stats = stats.setdefault(rule.pattern, RuleStats())
+            start = timer()
+            matched = rule.match(string)
+            rule_stats.match_time += timer() - start
+            if not matched:
+                rule_stats.misses += 1
+                continue
+            rule_stats.hits += 1
+            candidates.append(rule)
+            if adaptive and len(candidates) == 1 and not table.may_match_others(rule, string):
+                break
+
+        if adaptive:
+            self._lookups += 1
+            if self._lookups >= self._reorder_interval:
+                self._lookups = 0
+                self.reorder()
+
+        if not candidates:
+            raise NoRouteAvailable(string)
+
+        if len(candidates) > 1:
+            pats = repr([r.pattern for r in candidates])
+            msg = "%(string)r matches multiple patterns %(pats)r" % locals()
+            raise MultipleRoutesDefined(msg)
+
+        return candidates[0].endpoint
+
+    def enable_stats(self, adaptive: bool = False, reorder_interval: int = 1000) -> None:
+        """
+        Start collecting per-rule hit, miss and match time statistics.
+
+        If `adaptive` is True, the rules are also reordered every
+        `reorder_interval` lookups such that the most frequently hit rules are
+        tried first. After the first matching rule, the other rules are checked
+        at once with a single regex, and ambiguous routes still raise a
+        MultipleRoutesDefined error. Rules that are not tried individually do not
+        count misses.
+        """
+        if reorder_interval < 1:
+            raise ValueError(f"reorder_interval must be a positive integer: {reorder_interval!r}")
+        with self._lock:
+            if self._stats is None:
+                self._stats = {}
+            self._reorder_interval = reorder_interval
+            self._lookups = 0
+            self._adaptive = adaptive
+
+    def disable_stats(self) -> None:
+        """
+        Stop collecting statistics, discard them and restore the original
+        rules order.
+        """
+        with self._lock:
+            self._stats = None
+            self._adaptive = False
+            self._publish(self._table.route_map, keep_cache=True)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Return a mapping of {pattern: {hits, misses, match_time}} for all the
+        rules in the order they are currently tried.
+        Return an empty mapping if statistics are not enabled.
+        """
+        stats = self._stats
+        if stats is None:
+            return {}
+        return {
+            rule.pattern: (stats.get(rule.pattern) or RuleStats()).to_dict()
+            for rule in self._table.rules
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Reset all statistics counters to zero.
+        """
+        with self._lock:
+            if self._stats is not None:
+                self._stats = {}
+                self._lookups = 0
+
+    def reorder(self) -> None:
+        """
+        Reorder the rules such that the rules with the most hits are tried
+        first. The relative order of rules with the same number of hits is
+        kept.
+        """
+        stats = self._stats
+        if not stats:
+            return
+
+        def hits(rule: Rule) -> int:
+            rule_stats = stats.get(rule.pattern)
+            return rule_stats.hits if rule_stats else 0
+
+        with self._lock:
+            table = self._table
+            rules = sorted(table.rules, key=hits, reverse=True)
+            if rules != list(table.rules):
+                self._publish(table.route_map, rules, keep_cache=True)
+
+    def is_routable(self, string: str) -> bool | None:
         """
         Return True if `string` is routable by this router, e.g. if it
         matches any of the route patterns.
         """
         if not string:
-            return
-
-        if not self._is_routable:
-            # build an alternation regex
-            routables = "^(" + "|".join(pat for pat in self.route_map) + ")$"
-            self._is_routable = re.compile(routables, re.UNICODE).match
+            return None
 
-        return bool(self._is_routable(string))
+        return bool(self._table.is_routable(string))
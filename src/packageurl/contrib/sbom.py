@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Extract the purls of large SBOM documents in a streaming fashion, without
+loading the whole document in memory:
+
+- CycloneDX JSON: the "purl" of components, with their "bom-ref"
+- CycloneDX XML: the <purl> of components, with their "bom-ref" attribute
+- SPDX JSON: the "purl" external references of packages, with their "SPDXID"
+- SPDX tag-value: the "ExternalRef: PACKAGE-MANAGER purl" lines of packages,
+  with their "SPDXID"
+
+JSON documents are tokenized in chunks with a regex, or with the ijson library
+when it is installed for faster parsing. XML documents are parsed with the
+ElementTree iterparse parser and their parsed elements are discarded as soon as
+they end. Memory use is bounded by the chunk size, the depth of the document
+and the size of its largest string, not by the size of the document.
+
+For example, with a PersistentCache to validate the purls::
+
+    cache = PersistentCache("purls.sqlite3")
+    for purl, ref, messages in parse_sbom_purls("bom.json", cache.validate_string_many):
+        ...
+"""
+
+import json
+import re
+from itertools import islice
+from xml.etree import ElementTree
+
+from packageurl import PackageURL
+
+try:
+    import ijson
+except ImportError:  # ijson is optional
+    ijson = None
+
+# The number of characters of a JSON document read at once
+CHUNK_SIZE = 1 << 16
+
+# The number of purls parsed at once by parse_sbom_purls
+BATCH_SIZE = 10_000
+
+json_token = re.compile(
+    r"[\s,:]*(?:"
+    # a string
+    r'("[^"\\]*(?:\\.[^"\\]*)*")'
+    r"|([{\[])"
+    r"|([}\]])"
+    # a number, true, false or null
+    r'|([^\s,:{}\[\]"]+)'
+    r")"
+).match
+
+JSON_LITERALS = {
+    "true": ("boolean", True),
+    "false": ("boolean", False),
+    "null": ("null", None),
+}
+
+
+def iter_json_events(stream, chunk_size=CHUNK_SIZE, decode_values=False):
+    """
+    Yield (event, value) tuples for the JSON document of a text `stream` read
+    in chunks of `chunk_size` characters, as ijson.basic_parse does. Numbers
+    are not converted and their value is their string.
+    Raise a ValueError for a truncated document.
+
+    If `decode_values` is True, the objects and arrays that fit in a chunk are
+    decoded at once with the json module and yielded as a single ("value",
+    decoded value) event instead of their events.
+
+    This is not a validating parser: malformed documents may not raise an
+    exception.
+    """
+    decode = json.JSONDecoder().raw_decode
+    # True for an open object and False for an open array
+    containers = []
+    expect_key = False
+    buffer = ""
+    eof = False
+    while not eof:
+        # a string longer than a chunk is read in growing chunks
+        chunk = stream.read(max(chunk_size, len(buffer)))
+        eof = not chunk
+        buffer += chunk
+        end = len(buffer)
+        position = 0
+        while True:
+            match = json_token(buffer, position)
+            if not match:
+                break
+            kind = match.lastindex
+            if kind == 4 and not eof and match.end() == end:
+                # a number may continue in the next chunk
+                break
+
+            if kind == 2 and decode_values:
+                try:
+                    value, decoded_end = decode(buffer, match.start(2))
+                except ValueError:
+                    # a value that may fit in a chunk is decoded again once
+                    # the buffer starts with it, or its events are yielded
+                    if position and not eof:
+                        break
+                else:
+                    position = decoded_end
+                    expect_key = bool(containers) and containers[-1]
+                    yield "value", value
+                    continue
+
+            position = match.end()
+            token = match.group(kind)
+            if kind == 1:
+                value = token[1:-1] if "\\" not in token else json.loads(token)
+                if expect_key:
+                    expect_key = False
+                    yield "map_key", value
+                else:
+                    expect_key = bool(containers) and containers[-1]
+                    yield "string", value
+            elif kind == 2:
+                is_object = token == "{"
+                containers.append(is_object)
+                expect_key = is_object
+                yield ("start_map" if is_object else "start_array"), None
+            elif kind == 3:
+                if not containers:
+                    raise ValueError("Invalid JSON document: unbalanced brackets")
+                containers.pop()
+                expect_key = bool(containers) and containers[-1]
+                yield ("end_map" if token == "}" else "end_array"), None
+            else:
+                expect_key = bool(containers) and containers[-1]
+                yield JSON_LITERALS.get(token) or ("number", token)
+        buffer = buffer[position:]
+
+    if containers or buffer.strip(" \t\r\n,:"):
+        raise ValueError("Invalid JSON document: truncated document")
+
+
+# {JSON key: tracked key} of the values kept for the current objects
+TRACKED_JSON_KEYS = {
+    "purl": "purl",
+    "bom-ref": "ref",
+    "SPDXID": "ref",
+    "referenceType": "referenceType",
+    "referenceLocator": "referenceLocator",
+}
+
+
+def get_object_purls(values, stack):
+    """
+    Yield a (purl, ref) tuple for each purl of an ended JSON object given the
+    tracked `values` of the object and the `stack` of its open parents: a dict
+    of tracked values for an object and None for an array.
+    """
+    if values.get("referenceType") == "purl":
+        # an SPDX external reference: its purl belongs to the package
+        locator = values.get("referenceLocator")
+        for parent in reversed(stack):
+            if parent is not None:
+                if locator:
+                    parent.setdefault("purls", []).append(locator)
+                break
+        return
+    ref = values.get("ref")
+    purl = values.get("purl")
+    if purl:
+        yield purl, ref
+    for purl in values.get("purls", ()):
+        yield purl, ref
+
+
+def collect_decoded_purls(value, stack, purls):
+    """
+    Append a (purl, ref) tuple to the `purls` list for each purl of a decoded
+    JSON `value` given the `stack` of its open parents.
+    """
+    if isinstance(value, dict):
+        values = {}
+        stack.append(values)
+        for key, item in value.items():
+            if isinstance(item, str):
+                tracked_key = TRACKED_JSON_KEYS.get(key)
+                if tracked_key:
+                    values[tracked_key] = item
+            elif isinstance(item, (dict, list)):
+                collect_decoded_purls(item, stack, purls)
+        stack.pop()
+        if values:
+            purls.extend(get_object_purls(values, stack))
+    elif isinstance(value, list):
+        stack.append(None)
+        for item in value:
+            if isinstance(item, (dict, list)):
+                collect_decoded_purls(item, stack, purls)
+        stack.pop()
+
+
+def iter_json_event_purls(events):
+    """
+    Yield a (purl, ref) tuple for each purl of the CycloneDX or SPDX JSON
+    document of the `events` from iter_json_events or ijson.basic_parse, with
+    the "bom-ref" or "SPDXID" of its component or package as ref or None.
+
+    A purl is yielded when its component or package object ends. Only the
+    values of the TRACKED_JSON_KEYS of the open objects are kept.
+    """
+    # A dict of tracked values for an open object and None for an open array
+    stack = []
+    key = None
+    for event, value in events:
+        if event == "map_key":
+            key = TRACKED_JSON_KEYS.get(value)
+        elif event == "string":
+            if key:
+                stack[-1][key] = value
+                key = None
+        elif event == "value":
+            purls = []
+            collect_decoded_purls(value, stack, purls)
+            yield from purls
+            key = None
+        elif event == "start_map":
+            stack.append({})
+            key = None
+        elif event == "end_map":
+            values = stack.pop()
+            if values:
+                yield from get_object_purls(values, stack)
+        elif event == "start_array":
+            stack.append(None)
+            key = None
+        elif event == "end_array":
+            stack.pop()
+        else:
+            key = None
+
+
+def iter_json_purls(location, use_ijson=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield a (purl, ref) tuple for each purl of the CycloneDX or SPDX JSON
+    document at `location`. The document is parsed with ijson if `use_ijson` is
+    True, or if it is None and ijson is installed.
+    """
+    if use_ijson is None:
+        use_ijson = ijson is not None
+    if use_ijson:
+        if ijson is None:
+            raise ImportError("The ijson library is not installed")
+        with open(location, "rb") as stream:
+            yield from iter_json_event_purls(ijson.basic_parse(stream))
+    else:
+        with open(location, encoding="utf-8") as stream:
+            events = iter_json_events(stream, chunk_size, decode_values=True)
+            yield from iter_json_event_purls(events)
+
+
+def get_local_name(tag):
+    """
+    Return the local name of an XML element `tag` without its "{namespace}".
+    """
+    return tag.rpartition("}")[2]
+
+
+def iter_cyclonedx_xml_purls(location):
+    """
+    Yield a (purl, ref) tuple for each component <purl> of the CycloneDX XML
+    document at `location`, with the "bom-ref" of its component or None, in
+    document order.
+    """
+    # the open elements, from the root
+    parents = []
+    for event, element in ElementTree.iterparse(location, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if not parents:
+            break
+        parent = parents[-1]
+        if get_local_name(element.tag) == "purl" and get_local_name(parent.tag) == "component":
+            purl = (element.text or "").strip()
+            if purl:
+                yield purl, parent.get("bom-ref")
+        # discard the ended element. Its parent is still open, but the parser
+        # may already have appended the next siblings of the element to it.
+        parent.remove(element)
+
+
+def iter_spdx_tag_value_purls(location):
+    """
+    Yield a (purl, ref) tuple for each "ExternalRef: PACKAGE-MANAGER purl"
+    line of the SPDX tag-value document at `location`, with the "SPDXID" of
+    its package or None.
+    """
+    ref = None
+    in_text = False
+    with open(location, encoding="utf-8") as lines:
+        for line in lines:
+            if in_text:
+                in_text = "</text>" not in line
+                continue
+            tag, _, value = line.partition(":")
+            value = value.strip()
+            if value.startswith("<text>"):
+                in_text = "</text>" not in value
+            elif tag == "PackageName":
+                ref = None
+            elif tag == "SPDXID":
+                ref = value
+            elif tag == "ExternalRef":
+                fields = value.split(None, 2)
+                if len(fields) == 3 and fields[1] == "purl":
+                    yield fields[2], ref
+
+
+def get_sbom_format(location):
+    """
+    Return the format of the SBOM document at `location` from its first
+    character: "json", "xml" or "tag-value".
+    """
+    with open(location, "rb") as stream:
+        start = stream.read(1024).lstrip(b"\xef\xbb\xbf \t\r\n")
+    if start.startswith(b"{"):
+        return "json"
+    if start.startswith(b"<"):
+        return "xml"
+    return "tag-value"
+
+
+def iter_sbom_purls(location, with_refs=False, use_ijson=None):
+    """
+    Yield each purl string of the CycloneDX (JSON or XML) or SPDX (JSON or
+    tag-value) SBOM document at `location`, or a (purl, ref) tuple if
+    `with_refs` is True, where ref is the "bom-ref" or the "SPDXID" of the
+    component or package of the purl or None.
+    """
+    sbom_format = get_sbom_format(location)
+    if sbom_format == "json":
+        purls = iter_json_purls(location, use_ijson=use_ijson)
+    elif sbom_format == "xml":
+        purls = iter_cyclonedx_xml_purls(location)
+    else:
+        purls = iter_spdx_tag_value_purls(location)
+
+    if with_refs:
+        yield from purls
+    else:
+        for purl, _ref in purls:
+            yield purl
+
+
+def from_string_many(purls):
+    """
+    Return a list of PackageURL or ValueError for each of the `purls` strings,
+    parsing repeated purls only once.
+    """
+    results = {}
+    for purl in purls:
+        if purl not in results:
+            try:
+                results[purl] = PackageURL.from_string(purl)
+            except ValueError as error:
+                results[purl] = error
+    return [results[purl] for purl in purls]
+
+
+def parse_sbom_purls(location, parse_many=from_string_many, batch_size=BATCH_SIZE, use_ijson=None):
+    """
+    Yield a (purl, ref, result) tuple for each purl of the SBOM document at
+    `location`, where result is the result of the `parse_many` function for
+    the purl: a PackageURL or a ValueError by default.
+
+    `parse_many` is called with lists of up to `batch_size` purls and returns
+    a list of results in the same order, such as the from_string_many or
+    validate_string_many methods of a PersistentCache.
+    """
+    purls = iter_sbom_purls(location, with_refs=True, use_ijson=use_ijson)
+    while True:
+        batch = list(islice(purls, batch_size))
+        if not batch:
+            return
+        results = parse_many([purl for purl, _ref in batch])
+        for (purl, ref), result in zip(batch, results):
+            yield purl, ref, result
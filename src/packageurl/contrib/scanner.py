@@ -0,0 +1,499 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Scan the package trees installed on a host and yield a PackageURL for each
+installed package:
+
+- pypi: a site-packages directory with *.dist-info and *.egg-info metadata
+- npm: a node_modules directory, including nested, scoped and pnpm packages
+- maven: a local Maven repository such as ~/.m2/repository
+- cargo: a Cargo registry such as ~/.cargo/registry
+- golang: a Go module cache such as ~/go/pkg/mod
+
+Directories are listed with os.scandir in a pool of threads. Only the minimal
+metadata files are read: METADATA or PKG-INFO headers for pypi and
+package.json for npm. Maven, Cargo and Go packages are named after their
+directory and file names.
+"""
+
+import json
+import os
+import re
+import site
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from pathlib import Path
+
+from packageurl import PackageURL
+from packageurl.utils import get_golang_purl
+
+# Directories at a lower depth than this in a package tree are scanned as
+# separate tasks by the pool of threads, and deeper directories are walked in
+# the task of their ancestor.
+SPLIT_DEPTH = 3
+
+# The result of visiting a directory: a list of PackageURL, a list of
+# subdirectories to visit and the number of metadata files read.
+Visit = namedtuple("Visit", ["purls", "subdirectories", "files"])
+
+
+def list_directory(path):
+    with os.scandir(path) as entries:
+        return list(entries)
+
+
+def is_directory(entry):
+    try:
+        # do not follow symlinks to avoid cycles and duplicated packages
+        return entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def get_relative_parts(root, path):
+    if path == root:
+        return []
+    return path[len(root) :].strip(os.sep).split(os.sep)
+
+
+def read_pkginfo(location):
+    """
+    Return a (name, version) tuple from the headers of a METADATA or PKG-INFO
+    file at `location`.
+    """
+    name = version = None
+    with open(location, encoding="utf-8", errors="replace") as pkginfo:
+        for line in pkginfo:
+            if not line.strip():
+                break
+            key, _, value = line.partition(":")
+            if key == "Name":
+                name = value.strip()
+            elif key == "Version":
+                version = value.strip()
+            if name and version:
+                break
+    return name, version
+
+
+def get_pypi_purl(location):
+    """
+    Return a pypi PackageURL for a *.dist-info or *.egg-info directory or file
+    at `location` or None.
+    """
+    name = version = None
+    if os.path.isdir(location):
+        if location.endswith(".dist-info"):
+            metadata = os.path.join(location, "METADATA")
+        else:
+            metadata = os.path.join(location, "PKG-INFO")
+    else:
+        metadata = location
+
+    try:
+        name, version = read_pkginfo(metadata)
+    except OSError:
+        pass
+
+    if not (name and version):
+        # fall back to the <name>-<version>[-<python tag>] directory name
+        stem = os.path.splitext(os.path.basename(location))[0]
+        name, _, version = stem.partition("-")
+        version = version.partition("-py")[0]
+    if name and version:
+        return PackageURL(type="pypi", name=name, version=version)
+
+
+def visit_site_packages(root, path):
+    """
+    Visit a site-packages `root` directory: *.dist-info and *.egg-info
+    directories are visited as subdirectories of `root`.
+    """
+    if path != root:
+        purl = get_pypi_purl(path)
+        return Visit([purl] if purl else [], [], 1)
+
+    purls = []
+    subdirectories = []
+    files = 0
+    for entry in list_directory(path):
+        if not entry.name.endswith((".dist-info", ".egg-info")):
+            continue
+        if is_directory(entry):
+            subdirectories.append(entry.path)
+        else:
+            files += 1
+            purl = get_pypi_purl(entry.path)
+            if purl:
+                purls.append(purl)
+    return Visit(purls, subdirectories, files)
+
+
+def get_npm_purl(location):
+    """
+    Return an npm PackageURL for the package.json file at `location` or None.
+    """
+    try:
+        with open(location, "rb") as package_json:
+            data = json.load(package_json)
+    except (OSError, ValueError):
+        return
+    if not isinstance(data, dict):
+        return
+    name = data.get("name")
+    version = data.get("version")
+    if not (isinstance(name, str) and isinstance(version, str) and name and version):
+        return
+    namespace = None
+    if name.startswith("@"):
+        namespace, _, name = name.partition("/")
+    return PackageURL(type="npm", namespace=namespace, name=name, version=version)
+
+
+def visit_node_modules(root, path):
+    """
+    Visit a directory of a node_modules `root` directory, either a
+    node_modules, a @scope, a .pnpm store directory or a package directory.
+    """
+    name = os.path.basename(path)
+    parent_name = os.path.basename(os.path.dirname(path))
+    entries = list_directory(path)
+
+    if name == "node_modules" or (name.startswith("@") and parent_name == "node_modules"):
+        subdirectories = [
+            entry.path
+            for entry in entries
+            if is_directory(entry) and (not entry.name.startswith(".") or entry.name == ".pnpm")
+        ]
+        return Visit([], subdirectories, 0)
+
+    subdirectories = [
+        entry.path for entry in entries if entry.name == "node_modules" and is_directory(entry)
+    ]
+    if name == ".pnpm" and parent_name == "node_modules":
+        # .pnpm/<name>@<version>/node_modules/<name> directories
+        subdirectories = [entry.path for entry in entries if is_directory(entry)]
+        return Visit([], subdirectories, 0)
+    if parent_name == ".pnpm":
+        return Visit([], subdirectories, 0)
+
+    if not any(entry.name == "package.json" for entry in entries):
+        return Visit([], subdirectories, 0)
+    purl = get_npm_purl(os.path.join(path, "package.json"))
+    return Visit([purl] if purl else [], subdirectories, 1)
+
+
+def visit_maven_repository(root, path):
+    """
+    Visit a directory of a Maven repository `root` directory laid out as
+    <group/id/path>/<artifact id>/<version>/<artifact id>-<version>.pom
+    """
+    parts = get_relative_parts(root, path)
+    entries = list_directory(path)
+    if len(parts) >= 3:
+        pom_prefix = f"{parts[-2]}-"
+        for entry in entries:
+            if entry.name.startswith(pom_prefix) and entry.name.endswith(".pom"):
+                purl = PackageURL(
+                    type="maven",
+                    namespace=".".join(parts[:-2]),
+                    name=parts[-2],
+                    version=parts[-1],
+                )
+                return Visit([purl], [], 0)
+
+    subdirectories = [
+        entry.path for entry in entries if not entry.name.startswith(".") and is_directory(entry)
+    ]
+    return Visit([], subdirectories, 0)
+
+
+# The crates.io registry index directory names
+CRATES_IO_INDEXES = ("index.crates.io-", "github.com-1ecc6299db9ec823")
+
+split_crate_name = re.compile(
+    r"^(?P<name>[A-Za-z0-9_-]+?)-(?P<version>\d+\.\d+\.\d+(?:[-+][0-9A-Za-z.+-]*)?)$"
+).match
+
+
+def visit_cargo_registry(root, path):
+    """
+    Visit a directory of a Cargo registry `root` directory, with downloaded
+    crates in cache/<index>/<name>-<version>.crate and extracted crates in
+    src/<index>/<name>-<version>/
+    Only the crates of the crates.io index are reported, as the crates of
+    other registries have no known repository URL.
+    """
+    parts = get_relative_parts(root, path)
+    entries = list_directory(path)
+    if not parts:
+        subdirectories = [
+            entry.path
+            for entry in entries
+            if entry.name in ("cache", "src") and is_directory(entry)
+        ]
+        return Visit([], subdirectories, 0)
+    if len(parts) == 1:
+        subdirectories = [
+            entry.path
+            for entry in entries
+            if entry.name.startswith(CRATES_IO_INDEXES) and is_directory(entry)
+        ]
+        return Visit([], subdirectories, 0)
+
+    purls = []
+    for entry in entries:
+        name = entry.name
+        if parts[0] == "cache":
+            if not name.endswith(".crate"):
+                continue
+            name = name[: -len(".crate")]
+        elif not is_directory(entry):
+            continue
+        match = split_crate_name(name)
+        if match:
+            purls.append(PackageURL(type="cargo", **match.groupdict()))
+    return Visit(purls, [], 0)
+
+
+unescape_go_path = re.compile("!([a-z])")
+
+
+def unescape_golang_path(path):
+    """
+    Return a module path or version given an `path` case-encoded string, the
+    reverse of purl2url.escape_golang_path.
+    """
+    return unescape_go_path.sub(lambda match: match.group(1).upper(), path)
+
+
+def visit_golang_module_cache(root, path):
+    """
+    Visit a directory of a Go module cache `root` directory with modules
+    extracted in <escaped module path>@<escaped version>/ directories.
+    """
+    parts = get_relative_parts(root, path)
+    purls = []
+    subdirectories = []
+    for entry in list_directory(path):
+        name = entry.name
+        if not is_directory(entry) or name.startswith("."):
+            continue
+        if not parts and name == "cache":
+            # the download cache of compressed modules
+            continue
+        if "@" in name:
+            module, _, version = name.partition("@")
+            module = unescape_golang_path("/".join(parts + [module]))
+            purl = get_golang_purl(f"{module} {unescape_golang_path(version)}")
+            if purl:
+                purls.append(purl)
+        else:
+            subdirectories.append(entry.path)
+    return Visit(purls, subdirectories, 0)
+
+
+# {ecosystem: directory visitor function}
+VISITORS = {
+    "pypi": visit_site_packages,
+    "npm": visit_node_modules,
+    "maven": visit_maven_repository,
+    "cargo": visit_cargo_registry,
+    "golang": visit_golang_module_cache,
+}
+
+
+def get_default_locations():
+    """
+    Return a list of (ecosystem, path) of the package trees of the current user
+    and Python that exist.
+    """
+    home = Path.home()
+    locations = [("pypi", path) for path in site.getsitepackages()]
+    locations.append(("pypi", site.getusersitepackages()))
+    locations.append(("maven", home / ".m2" / "repository"))
+    cargo_home = os.environ.get("CARGO_HOME") or home / ".cargo"
+    locations.append(("cargo", Path(cargo_home) / "registry"))
+    go_module_cache = os.environ.get("GOMODCACHE")
+    if not go_module_cache:
+        go_path = os.environ.get("GOPATH") or home / "go"
+        go_module_cache = Path(str(go_path).split(os.pathsep)[0]) / "pkg" / "mod"
+    locations.append(("golang", go_module_cache))
+    return [(ecosystem, Path(path)) for ecosystem, path in locations if os.path.isdir(path)]
+
+
+def scan_directory(visit, root, path, depth):
+    """
+    Visit the `path` directory at `depth` in a `root` package tree and the
+    subdirectories of `path` at a depth of SPLIT_DEPTH or more. Return a tuple
+    of (purls, [(subdirectory, depth)] to scan separately, directories, files,
+    errors, elapsed seconds).
+    """
+    start = time.perf_counter()
+    purls = []
+    split = []
+    directories = files = errors = 0
+    stack = [(path, depth)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            visited = visit(root, path)
+        except (OSError, ValueError):
+            errors += 1
+            continue
+        directories += 1
+        files += visited.files
+        purls.extend(visited.purls)
+        for subdirectory in visited.subdirectories:
+            if depth + 1 < SPLIT_DEPTH:
+                split.append((subdirectory, depth + 1))
+            else:
+                stack.append((subdirectory, depth + 1))
+    return purls, split, directories, files, errors, time.perf_counter() - start
+
+
+class PackageScanner:
+    """
+    Scan installed package trees with a pool of `max_workers` threads and
+    collect per-ecosystem statistics.
+
+    For example, to list the installed packages of the current user::
+
+        scanner = PackageScanner()
+        for purl in scanner.scan(get_default_locations()):
+            print(purl)
+        print(scanner.info())
+    """
+
+    def __init__(self, max_workers=None, unique=True):
+        """
+        Use a pool of `max_workers` threads, by default from the number of
+        CPUs, as for a ThreadPoolExecutor. If `unique` is True, a package
+        installed in several locations is yielded only once.
+        """
+        self.max_workers = max_workers
+        self.unique = unique
+        # {ecosystem: statistics mapping}
+        self.stats = {}
+
+    def get_stats(self, ecosystem):
+        stats = self.stats.get(ecosystem)
+        if stats is None:
+            stats = self.stats[ecosystem] = dict(
+                packages=0,
+                directories=0,
+                files=0,
+                errors=0,
+                seconds=0.0,
+            )
+        return stats
+
+    def scan(self, locations):
+        """
+        Yield a PackageURL for each package found in an iterable of
+        (ecosystem, path) `locations` as they are found, where an ecosystem is
+        one of "pypi", "npm", "maven", "cargo" or "golang".
+        Raise a ValueError for an unknown ecosystem.
+
+        Directories that cannot be read are counted as errors and skipped.
+        """
+        tasks = []
+        for ecosystem, location in locations:
+            visit = VISITORS.get(ecosystem)
+            if not visit:
+                raise ValueError(f"Unknown ecosystem: {ecosystem!r}")
+            root = os.path.abspath(os.fspath(location))
+            if ecosystem == "npm" and os.path.basename(root) != "node_modules":
+                root = os.path.join(root, "node_modules")
+            tasks.append((ecosystem, visit, root, root, 0))
+
+        seen = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+
+        def submit(ecosystem, visit, root, path, depth):
+            self.get_stats(ecosystem)
+            future = executor.submit(scan_directory, visit, root, path, depth)
+            pending[future] = (ecosystem, visit, root)
+
+        try:
+            for task in tasks:
+                submit(*task)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ecosystem, visit, root = pending.pop(future)
+                    purls, split, directories, files, errors, seconds = future.result()
+                    for subdirectory, depth in split:
+                        submit(ecosystem, visit, root, subdirectory, depth)
+
+                    stats = self.stats[ecosystem]
+                    stats["directories"] += directories
+                    stats["files"] += files
+                    stats["errors"] += errors
+                    stats["seconds"] += seconds
+                    for purl in purls:
+                        if self.unique:
+                            key = (purl.type, purl.namespace, purl.name, purl.version)
+                            if key in seen:
+                                continue
+                            seen.add(key)
+                        stats["packages"] += 1
+                        yield purl
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+
+    def info(self):
+        """
+        Return a mapping of {ecosystem: statistics mapping} with the number of
+        packages found, directories listed, metadata files read, errors, and
+        the seconds spent and packages per second in the threads scanning each
+        ecosystem.
+        """
+        info = {}
+        for ecosystem, stats in self.stats.items():
+            seconds = stats["seconds"]
+            packages_per_second = stats["packages"] / seconds if seconds else 0.0
+            info[ecosystem] = dict(stats, packages_per_second=packages_per_second)
+        return info
+
+
+def scan_packages(locations=None, max_workers=None, unique=True):
+    """
+    Yield a PackageURL for each package found in an iterable of
+    (ecosystem, path) `locations`, by default the package trees of the current
+    user and Python returned by get_default_locations.
+    """
+    if locations is None:
+        locations = get_default_locations()
+    scanner = PackageScanner(max_workers=max_workers, unique=unique)
+    yield from scanner.scan(locations)
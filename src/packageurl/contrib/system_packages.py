@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Read the databases of the packages installed by system package managers and
+yield a PackageURL for each installed package:
+
+- deb: the dpkg status file, /var/lib/dpkg/status
+- apk: the apk installed database, /lib/apk/db/installed
+- alpm: the pacman local database, /var/lib/pacman/local/*/desc
+
+The databases are streamed one record at a time and only the name, version
+and architecture fields are kept. The values of these databases are already
+in canonical form, so the PackageURL are built with ``normalize_purl=False``
+after the few normalizations these types need.
+"""
+
+import os
+
+from packageurl import PackageURL
+from packageurl.contrib.debian import iter_paragraphs
+
+DPKG_STATUS = "var/lib/dpkg/status"
+APK_INSTALLED = "lib/apk/db/installed"
+PACMAN_LOCAL = "var/lib/pacman/local"
+
+DPKG_FIELDS = {"Package", "Version", "Architecture", "Status"}
+
+
+def open_lines(location):
+    """
+    Return an iterable of text lines for a `location` path or text file
+    object.
+    """
+    if hasattr(location, "read"):
+        return location
+    return open(location, encoding="utf-8", errors="replace")
+
+
+def get_qualifiers(arch, distro):
+    """
+    Return a normalized qualifiers mapping given an `arch` and a `distro`.
+    """
+    qualifiers = {}
+    if arch:
+        qualifiers["arch"] = arch
+    if distro:
+        qualifiers["distro"] = distro
+    return qualifiers
+
+
+def iter_dpkg_status(location, namespace="debian", distro=None):
+    """
+    Yield a deb PackageURL for each installed package of a dpkg status
+    `location` path or text file object, with an "arch" qualifier and a
+    `distro` qualifier if provided. Packages that are not fully installed,
+    such as removed packages with remaining configuration files, are skipped.
+    """
+    lines = open_lines(location)
+    try:
+        for paragraph in iter_paragraphs(lines, fields=DPKG_FIELDS):
+            status = paragraph.get("Status")
+            if status and not status.endswith(" installed"):
+                continue
+            name = paragraph.get("Package")
+            version = paragraph.get("Version")
+            if not name or not version:
+                continue
+            yield PackageURL(
+                type="deb",
+                namespace=namespace,
+                name=name,
+                version=version,
+                qualifiers=get_qualifiers(paragraph.get("Architecture"), distro),
+                normalize_purl=False,
+            )
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+def iter_apk_records(lines):
+    """
+    Yield a mapping of {key: value} for each record of the apk installed
+    database `lines`, with only the name "P", version "V" and architecture "A"
+    keys.
+    """
+    record = {}
+    for line in lines:
+        key = line[:2]
+        if key in ("P:", "V:", "A:"):
+            record[key[0]] = line[2:].strip()
+        elif not line.strip() and record:
+            yield record
+            record = {}
+    if record:
+        yield record
+
+
+def iter_apk_installed(location, namespace="alpine", distro=None):
+    """
+    Yield an apk PackageURL for each installed package of an apk installed
+    database `location` path or text file object, with an "arch" qualifier and
+    a `distro` qualifier if provided.
+    """
+    namespace = namespace and namespace.lower()
+    lines = open_lines(location)
+    try:
+        for record in iter_apk_records(lines):
+            name = record.get("P")
+            version = record.get("V")
+            if not name or not version:
+                continue
+            yield PackageURL(
+                type="apk",
+                namespace=namespace,
+                name=name.lower(),
+                version=version,
+                qualifiers=get_qualifiers(record.get("A"), distro),
+                normalize_purl=False,
+            )
+    finally:
+        if lines is not location:
+            lines.close()
+
+
+def read_pacman_desc(location):
+    """
+    Return a mapping of {section: value} with the %NAME%, %VERSION% and %ARCH%
+    sections of the pacman desc file at `location`. The file is read only up
+    to these sections.
+    """
+    sections = {}
+    with open(location, encoding="utf-8", errors="replace") as desc:
+        section = None
+        for line in desc:
+            line = line.strip()
+            if section:
+                sections[section] = line
+                if len(sections) == 3:
+                    break
+                section = None
+            elif line in ("%NAME%", "%VERSION%", "%ARCH%"):
+                section = line
+    return sections
+
+
+def iter_pacman_local(location, namespace="arch", distro=None):
+    """
+    Yield an alpm PackageURL for each installed package of a pacman local
+    database directory at `location`, with an "arch" qualifier and a `distro`
+    qualifier if provided.
+    """
+    namespace = namespace and namespace.lower()
+    with os.scandir(location) as entries:
+        directories = sorted(entry.path for entry in entries if entry.is_dir())
+    for directory in directories:
+        try:
+            sections = read_pacman_desc(os.path.join(directory, "desc"))
+        except OSError:
+            continue
+        name = sections.get("%NAME%")
+        version = sections.get("%VERSION%")
+        if not name or not version:
+            continue
+        yield PackageURL(
+            type="alpm",
+            namespace=namespace,
+            name=name.lower(),
+            version=version,
+            qualifiers=get_qualifiers(sections.get("%ARCH%"), distro),
+            normalize_purl=False,
+        )
+
+
+def get_os_release(root="/"):
+    """
+    Return a mapping of the fields of the etc/os-release file of a `root`
+    filesystem or an empty mapping.
+    """
+    for path in ("etc/os-release", "usr/lib/os-release"):
+        try:
+            lines = open_lines(os.path.join(root, path))
+        except OSError:
+            continue
+        with lines:
+            os_release = {}
+            for line in lines:
+                key, sep, value = line.strip().partition("=")
+                if sep and not key.startswith("#"):
+                    os_release[key] = value.strip().strip("\"'")
+            return os_release
+    return {}
+
+
+def get_distro(os_release):
+    """
+    Return a distro qualifier value for an `os_release` mapping: the release
+    codename for deb distros such as "bookworm" or "<id>-<version>" such as
+    "alpine-3.19.1".
+    """
+    codename = os_release.get("VERSION_CODENAME")
+    if codename:
+        return codename
+    distro_id = os_release.get("ID")
+    version_id = os_release.get("VERSION_ID")
+    if distro_id and version_id:
+        return f"{distro_id}-{version_id}"
+
+
+def iter_system_packages(root="/"):
+    """
+    Yield a PackageURL for each package installed in the dpkg, apk and pacman
+    databases found in a `root` filesystem, such as an extracted container
+    image. The namespace and distro qualifier are from the os-release file of
+    `root` when available.
+    """
+    os_release = get_os_release(root)
+    distro_id = os_release.get("ID")
+    distro = get_distro(os_release)
+
+    location = os.path.join(root, DPKG_STATUS)
+    if os.path.isfile(location):
+        yield from iter_dpkg_status(location, namespace=distro_id or "debian", distro=distro)
+
+    location = os.path.join(root, APK_INSTALLED)
+    if os.path.isfile(location):
+        yield from iter_apk_installed(location, namespace=distro_id or "alpine", distro=distro)
+
+    location = os.path.join(root, PACMAN_LOCAL)
+    if os.path.isdir(location):
+        yield from iter_pacman_local(location, namespace=distro_id or "arch", distro=distro)
@@ -24,8 +24,18 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+import inspect
 import os
 import re
+import threading
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from functools import partial
+from functools import wraps
+from itertools import chain
+from itertools import islice
 from urllib.parse import unquote_plus
 from urllib.parse import urlparse
 
@@ -45,37 +55,399 @@ in this single Python script.
 purl_router = Router()
 
 
+class ParsedURL(object):
+    """
+    A URL string parsed at most once and shared by all the url2purl builders.
+    Each part is computed lazily on first access and cached:
+    - url: the original URL string
+    - scheme, netloc, query and fragment: as returned by urlparse
+    - path: the unquoted URL path
+    - segments: a tuple of the non-empty unquoted path segments
+    - unquoted: the whole unquoted URL string
+    """
+
+    __slots__ = ("_url", "_parts", "_path", "_segments", "_unquoted")
+
+    def __init__(self, url):
+        self._url = url
+        self._parts = None
+        self._path = None
+        self._segments = None
+        self._unquoted = None
+
+    @classmethod
+    def from_url(cls, url):
+        return cls(url)
+
+    def __repr__(self):
+        return f"ParsedURL({self._url!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, ParsedURL) and other._url == self._url
+
+    def __hash__(self):
+        return hash(self._url)
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def parts(self):
+        parts = self._parts
+        if parts is None:
+            parts = self._parts = urlparse(self._url)
+        return parts
+
+    @property
+    def scheme(self):
+        return self.parts.scheme
+
+    @property
+    def netloc(self):
+        return self.parts.netloc
+
+    @property
+    def query(self):
+        return self.parts.query
+
+    @property
+    def fragment(self):
+        return self.parts.fragment
+
+    @property
+    def path(self):
+        path = self._path
+        if path is None:
+            path = self._path = unquote_plus(self.parts.path)
+        return path
+
+    @property
+    def segments(self):
+        segments = self._segments
+        if segments is None:
+            segments = self._segments = tuple(seg for seg in self.path.split("/") if seg)
+        return segments
+
+    @property
+    def unquoted(self):
+        unquoted = self._unquoted
+        if unquoted is None:
+            unquoted = self._unquoted = unquote_plus(self._url)
+        return unquoted
+
+
+def parse_url(url):
+    """
+    Return a ParsedURL for a `url` string or ParsedURL.
+    """
+    if isinstance(url, ParsedURL):
+        return url
+    return ParsedURL.from_url(url)
+
+
+def accepts_parsed_url(builder):
+    """
+    Decorator for a `builder` callable that accepts a ParsedURL. The decorated
+    builder can be called either with a ParsedURL or with a URL string that is
+    then parsed.
+    """
+
+    @wraps(builder)
+    def adapter(url):
+        return builder(parse_url(url))
+
+    adapter.accepts_parsed_url = True
+    return adapter
+
+
+# Some route patterns backtrack polynomially on crafted URLs. Routing is
+# skipped for URLs longer than MAX_URL_LENGTH characters or with more than
+# MAX_URL_SLASHES slashes once unquoted, which bounds the matching time of every
+# route. Such URLs get a generic PackageURL from url2purl.
+MAX_URL_LENGTH = 2048
+MAX_URL_SLASHES = 32
+
+
+def is_within_url_limits(url):
+    """
+    Return True if the `url` ParsedURL is within the length and slash limits of
+    URLs that are routed.
+    """
+    return len(url.url) <= MAX_URL_LENGTH and url.unquoted.count("/") <= MAX_URL_SLASHES
+
+
+def process_url(url, router=purl_router):
+    """
+    Parse `url` once and process it with `router` endpoints. Endpoints
+    decorated with `accepts_parsed_url` receive the ParsedURL and other
+    endpoints receive the URL string.
+    Raise NoRouteAvailable if `url` is not routable.
+    """
+    parsed_url = parse_url(url)
+    if not is_within_url_limits(parsed_url):
+        raise NoRouteAvailable(parsed_url.url)
+    endpoint = router.resolve(parsed_url.url)
+    if inspect.isclass(endpoint):
+        endpoint = endpoint()
+    if getattr(endpoint, "accepts_parsed_url", False):
+        return endpoint(parsed_url)
+    return endpoint(parsed_url.url)
+
+
 def url2purl(url):
     """
     Return a PackageURL inferred from the `url` string or None.
+    Use the url2purl cache if enabled with `enable_url2purl_cache`.
+    """
+    cache = url2purl_cache
+    if cache is not None:
+        return cache.get_purl(url)
+    return uncached_url2purl(url)
+
+
+def uncached_url2purl(url):
+    """
+    Return a PackageURL inferred from the `url` string or None, bypassing the
+    url2purl cache.
     """
     if url:
+        parsed_url = parse_url(url)
         try:
-            return purl_router.process(url)
+            return process_url(parsed_url)
         except NoRouteAvailable:
             # If `url` does not fit in one of the existing routes,
             # we attempt to create a generic PackageURL for `url`
-            return build_generic_purl(url)
+            return build_generic_purl(parsed_url)
 
 
 get_purl = url2purl
 
+_MISSING = object()
+
+
+class URL2PURLCache(object):
+    """
+    A bounded, thread-safe, least recently used cache of url2purl results keyed
+    by exact URL string. `maxsize` is the maximum number of cached results.
+
+    Each hit returns a PackageURL with its own copy of the qualifiers, such that
+    callers cannot modify the cached results.
+    """
+
+    def __init__(self, maxsize=10000):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer: {maxsize!r}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # {URL: PackageURL or None}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def info(self):
+        """
+        Return a mapping of {hits, misses, hit_rate, size, maxsize}.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hit_rate,
+            size=len(self),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self):
+        """
+        Remove all entries and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_purl(self, url):
+        """
+        Return a PackageURL inferred from the `url` string or None, from the
+        cache when available.
+        """
+        if not url:
+            return None
+        purl = self._lookup(url)
+        if purl is _MISSING:
+            purl = uncached_url2purl(url)
+            self._store(url, purl)
+        if purl is None:
+            return None
+        return purl._replace(qualifiers=dict(purl.qualifiers))
+
+    def _lookup(self, url):
+        with self._lock:
+            entries = self._entries
+            purl = entries.get(url, _MISSING)
+            if purl is _MISSING:
+                self.misses += 1
+            else:
+                entries.move_to_end(url)
+                self.hits += 1
+            return purl
+
+    def _store(self, url, purl):
+        with self._lock:
+            entries = self._entries
+            entries[url] = purl
+            entries.move_to_end(url)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+
+# The url2purl cache, None when disabled
+url2purl_cache = None
+
+
+def enable_url2purl_cache(maxsize=10000):
+    """
+    Enable a new url2purl cache of up to `maxsize` entries and return it.
+    """
+    global url2purl_cache
+    url2purl_cache = URL2PURLCache(maxsize)
+    return url2purl_cache
+
+
+def disable_url2purl_cache():
+    """
+    Disable and discard the url2purl cache.
+    """
+    global url2purl_cache
+    url2purl_cache = None
+
+
+def url2purl_chunk(urls, generic=True):
+    """
+    Return a list of PackageURL or None for each URL string of the `urls` chunk.
+    If `generic` is False, unroutable URLs get None instead of a generic purl.
+    URLs that cannot be converted get None instead of raising an exception.
+    """
+    purls = []
+    for url in urls:
+        try:
+            if generic:
+                purl = url2purl(url)
+            else:
+                purl = process_url(url) if url else None
+        except Exception:
+            # any error of a URL, such as an ambiguous route or an invalid
+            # type, must not stop the conversion of the other URLs
+            purl = None
+        purls.append(purl)
+    return purls
+
+
+# Minimum number of URLs for url2purl_many to convert URLs in a process pool
+# when its number of `processes` is not specified.
+POOL_MIN_URLS = 50_000
+
+
+def url2purl_many(urls, generic=True, processes=None, chunk_size=500):
+    """
+    Yield a (url, PackageURL or None) tuple for each URL string of the `urls`
+    iterable, in the same order as `urls`.
+
+    URLs are converted in chunks of `chunk_size` URLs in the current process
+    if `processes` is 1, or in a pool of `processes` worker processes
+    otherwise. If `processes` is None, a pool of one process per CPU is only
+    used for at least POOL_MIN_URLS URLs.
+
+    If `generic` is True, URLs that do not match any route get a generic
+    PackageURL as with `url2purl`, otherwise they get None. URLs that cannot be
+    converted get None instead of raising an exception.
+    """
+    urls = iter(urls)
+    if processes is None:
+        head = list(islice(urls, POOL_MIN_URLS))
+        processes = 1
+        if len(head) == POOL_MIN_URLS:
+            processes = os.cpu_count() or 1
+        urls = chain(head, urls)
+    processes = max(processes, 1)
+    convert_chunk = partial(url2purl_chunk, generic=generic)
+    window_size = chunk_size * processes
+
+    executor = None
+    map_chunks = map
+    if processes > 1:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        map_chunks = executor.map
+
+    def submit(window):
+        chunks = [window[i : i + chunk_size] for i in range(0, len(window), chunk_size)]
+        return window, map_chunks(convert_chunk, chunks)
+
+    def collect(window, results):
+        return zip(window, chain.from_iterable(results))
+
+    try:
+        # Keep the next window in flight while the results of the previous
+        # window are collected so that the workers are not idle.
+        pending = deque()
+        for window in iter(lambda: list(islice(urls, window_size)), []):
+            pending.append(submit(window))
+            if len(pending) > 1:
+                yield from collect(*pending.popleft())
+        while pending:
+            yield from collect(*pending.popleft())
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern):
+    """
+    Return a compiled regex for a url2purl `pattern` string, compiled only once.
+    """
+    return re.compile(pattern, re.VERBOSE)
+
 
 def purl_from_pattern(type_, pattern, url, qualifiers=None):
-    url = unquote_plus(url)
-    compiled_pattern = re.compile(pattern, re.VERBOSE)
-    match = compiled_pattern.match(url)
+    """
+    Return a PackageURL of `type_` built from matching the unquoted `url`
+    string or ParsedURL with `pattern` (either a regex string or a compiled
+    regex) or None.
+    """
+    if isinstance(url, ParsedURL):
+        url = url.unquoted
+    else:
+        url = unquote_plus(url)
+    if isinstance(pattern, str):
+        pattern = compile_pattern(pattern)
+    match = pattern.match(url)
 
     if not match:
         return
 
-    purl_data = {
-        field: value for field, value in match.groupdict().items() if field in PackageURL._fields
-    }
+    return purl_from_match(type_, match, qualifiers)
+
+
+def purl_from_match(type_, match, qualifiers=None):
+    """
+    Return a PackageURL of `type_` built from the named groups of a regex
+    `match` object.
+    """
+    groups = match.groupdict()
+    purl_data = {field: value for field, value in groups.items() if field in PackageURL._fields}
 
     qualifiers = qualifiers or {}
     # Include the `version_prefix` as a qualifier to infer valid URLs in purl2url
-    version_prefix = match.groupdict().get("version_prefix")
+    version_prefix = groups.get("version_prefix")
     if version_prefix:
         qualifiers.update({"version_prefix": version_prefix})
 
@@ -92,35 +464,34 @@ def register_pattern(type_, pattern, router=purl_router):
     """
     Register a pattern with its type.
     """
+    compiled_pattern = compile_pattern(pattern)
 
+    @accepts_parsed_url
     def endpoint(url):
-        return purl_from_pattern(type_, pattern, url)
+        return purl_from_pattern(type_, compiled_pattern, url)
 
     router.append(pattern, endpoint)
 
 
 def get_path_segments(url):
     """
-    Return a list of path segments from a `url` string.
+    Return a list of path segments from a `url` string or ParsedURL.
     """
-    path = unquote_plus(urlparse(url).path)
-    segments = [seg for seg in path.split("/") if seg]
-    return segments
+    return list(parse_url(url).segments)
 
 
+@accepts_parsed_url
 def build_generic_purl(uri):
     """
     Return a PackageURL from `uri`, if `uri` is a parsable URL, or None
 
     `uri` is assumed to be a download URL, e.g. https://example.com/example.tar.gz
     """
-    parsed_uri = urlparse(uri)
-    if parsed_uri.scheme and parsed_uri.netloc and parsed_uri.path:
+    if uri.scheme and uri.netloc and uri.path:
         # Get file name from `uri`
-        uri_path_segments = get_path_segments(uri)
-        if uri_path_segments:
-            file_name = uri_path_segments[-1]
-            return PackageURL(type="generic", name=file_name, qualifiers={"download_url": uri})
+        if uri.segments:
+            file_name = uri.segments[-1]
+            return PackageURL(type="generic", name=file_name, qualifiers={"download_url": uri.url})
 
 
 @purl_router.route(
@@ -129,19 +500,20 @@ def build_generic_purl(uri):
     "https?://(www\\.)?npmjs.*/package.*",
     "https?://(www\\.)?yarnpkg.com/package.*",
 )
+@accepts_parsed_url
 def build_npm_purl(uri):
     # npm URLs are difficult to disambiguate with regex
-    if "/package/" in uri:
+    if "/package/" in uri.url:
         return build_npm_web_purl(uri)
-    elif "/-/" in uri:
+    elif "/-/" in uri.url:
         return build_npm_download_purl(uri)
     else:
         return build_npm_api_purl(uri)
 
 
+@accepts_parsed_url
 def build_npm_api_purl(uri):
-    path = unquote_plus(urlparse(uri).path)
-    segments = [seg for seg in path.split("/") if seg]
+    segments = uri.segments
 
     if len(segments) < 2:
         return
@@ -158,9 +530,9 @@ def build_npm_api_purl(uri):
     return PackageURL("npm", name=segments[0], version=segments[1])
 
 
+@accepts_parsed_url
 def build_npm_download_purl(uri):
-    path = unquote_plus(urlparse(uri).path)
-    segments = [seg for seg in path.split("/") if seg and seg != "-"]
+    segments = [seg for seg in uri.segments if seg != "-"]
     len_segments = len(segments)
 
     # /@invisionag/eslint-config-ivx/-/eslint-config-ivx-0.0.2.tgz
@@ -183,8 +555,9 @@ def build_npm_download_purl(uri):
     return PackageURL("npm", namespace, name, version)
 
 
+@accepts_parsed_url
 def build_npm_web_purl(uri):
-    path = unquote_plus(urlparse(uri).path)
+    path = uri.path
     if path.startswith("/package/"):
         path = path[9:]
 
@@ -224,9 +597,9 @@ def build_npm_web_purl(uri):
     "https?://central.maven.org/maven2/.*",
     "maven-index://repo1.maven.org/.*",
 )
+@accepts_parsed_url
 def build_maven_purl(uri):
-    path = unquote_plus(urlparse(uri).path)
-    segments = [seg for seg in path.split("/") if seg and seg != "maven2"]
+    segments = [seg for seg in uri.segments if seg != "maven2"]
 
     if len(segments) < 3:
         return
@@ -261,6 +634,7 @@ def build_maven_purl(uri):
 
 # https://rubygems.org/gems/i18n-js-3.0.11.gem
 @purl_router.route("https?://rubygems.org/(downloads|gems)/.*")
+@accepts_parsed_url
 def build_rubygems_purl(uri):
     # We use a more general route pattern instead of using `rubygems_pattern`
     # below by itself because we want to capture all rubygems download URLs,
@@ -268,28 +642,35 @@ def build_rubygems_purl(uri):
     # from attempting to create a generic PackageURL from an invalid rubygems
     # download URL.
 
-    # https://rubygems.org/downloads/jwt-0.1.8.gem
-    # https://rubygems.org/gems/i18n-js-3.0.11.gem
-    rubygems_pattern = (
-        r"^https?://rubygems.org/(downloads|gems)/(?P<name>.+)-(?P<version>.+)(\.gem)$"
-    )
     return purl_from_pattern("gem", rubygems_pattern, uri)
 
 
+# https://rubygems.org/downloads/jwt-0.1.8.gem
+# https://rubygems.org/gems/i18n-js-3.0.11.gem
+rubygems_pattern = compile_pattern(
+    r"^https?://rubygems.org/(downloads|gems)/(?P<name>.+)-(?P<version>.+)(\.gem)$"
+)
+
+
 # https://cran.r-project.org/src/contrib/jsonlite_1.8.8.tar.gz
 # https://packagemanager.rstudio.com/cran/2022-06-23/src/contrib/curl_4.3.2.tar.gz"
 @purl_router.route(
     "https?://cran.r-project.org/.*",
     "https?://packagemanager.rstudio.com/cran/.*",
 )
+@accepts_parsed_url
 def build_cran_purl(uri):
-    cran_pattern = r"^https?://(cran\.r-project\.org|packagemanager\.rstudio\.com/cran)/.*?src/contrib/(?P<name>.+)_(?P<version>.+)\.tar.gz$"
     qualifiers = {}
-    if "//cran.r-project.org/" not in uri:
-        qualifiers["download_url"] = uri
+    if "//cran.r-project.org/" not in uri.url:
+        qualifiers["download_url"] = uri.url
     return purl_from_pattern("cran", cran_pattern, uri, qualifiers)
 
 
+cran_pattern = compile_pattern(
+    r"^https?://(cran\.r-project\.org|packagemanager\.rstudio\.com/cran)/.*?src/contrib/(?P<name>.+)_(?P<version>.+)\.tar.gz$"
+)
+
+
 # https://pypi.org/packages/source/a/anyjson/anyjson-0.3.3.tar.gz
 # https://pypi.python.org/packages/source/a/anyjson/anyjson-0.3.3.tar.gz
 # https://pypi.python.org/packages/2.6/t/threadpool/threadpool-1.2.7-py2.6.egg
@@ -303,7 +684,8 @@ pypi_pattern = r"(?P<name>(\w\.?)+(-\w+)*)-(?P<version>.+)\.(zip|tar.gz|tar.bz2|
 # - setuptools.wheel.WHEEL_NAME
 # - pip._internal.wheel.Wheel.wheel_file_re
 wheel_file_re = re.compile(
-    r"^(?P<namever>(?P<name>.+?)-(?P<version>.*?))"
+    r"^(?=.*\.whl$)"  # check the extension once upfront
+    r"(?P<namever>(?P<name>.+?)-(?P<version>.*?))"
     r"((-(?P<build>\d[^-]*?))?-(?P<pyver>.+?)-(?P<abi>.+?)-(?P<plat>.+?)"
     r"\.whl)$",
     re.VERBOSE,
@@ -312,11 +694,11 @@ wheel_file_re = re.compile(
 
 @purl_router.route(
     "https?://pypi.org/(packages|project)/.+",
-    "https?://.+python.+org/(packages|project)/.*",
+    r"https?://[^/]+python[^/]+org/(packages|project)/.*",
 )
+@accepts_parsed_url
 def build_pypi_purl(uri):
-    path = unquote_plus(urlparse(uri).path)
-    segments = path.split("/")
+    segments = uri.path.split("/")
     last_segment = segments[-1]
 
     # /wheel-0.29.0-py2.py3-none-any.whl
@@ -341,6 +723,7 @@ def build_pypi_purl(uri):
 
 # https://packagist.org/packages/webmozart/assert#1.9.1
 @purl_router.route("https?://packagist.org/packages/.*")
+@accepts_parsed_url
 def build_composer_purl(uri):
     # We use a more general route pattern instead of using `composer_pattern`
     # below by itself because we want to capture all packagist download URLs,
@@ -348,12 +731,16 @@ def build_composer_purl(uri):
     # from attempting to create a generic PackageURL from an invalid packagist
     # download URL.
 
-    # https://packagist.org/packages/ralouphie/getallheaders
-    # https://packagist.org/packages/symfony/process#v7.0.0-BETA3
-    composer_pattern = r"^https?://packagist\.org/packages/(?P<namespace>[^/]+)/(?P<name>[^\#]+?)(\#(?P<version>.+))?$"
     return purl_from_pattern("composer", composer_pattern, uri)
 
 
+# https://packagist.org/packages/ralouphie/getallheaders
+# https://packagist.org/packages/symfony/process#v7.0.0-BETA3
+composer_pattern = compile_pattern(
+    r"^https?://packagist\.org/packages/(?P<namespace>[^/]+)/(?P<name>[^\#]+?)(\#(?P<version>.+))?$"
+)
+
+
 # http://nuget.org/packages/EntityFramework/4.2.0.0
 # https://www.nuget.org/api/v2/package/Newtonsoft.Json/11.0.1
 nuget_www_pattern = r"^https?://.*nuget.org/(api/v2/)?packages?/(?P<name>.+)/(?P<version>.+)$"
@@ -402,6 +789,7 @@ register_pattern("sourceforge", sourceforge_download_pattern_bis)
 
 
 @purl_router.route("https?://.*sourceforge.net/project/.*")
+@accepts_parsed_url
 def build_sourceforge_purl(uri):
     # We use a more general route pattern instead of using `sourceforge_pattern`
     # below by itself because we want to capture all sourceforge download URLs,
@@ -409,23 +797,12 @@ def build_sourceforge_purl(uri):
     # url2purl from attempting to create a generic PackageURL from a sourceforge
     # URL that we can't handle.
 
-    # http://master.dl.sourceforge.net/project/libpng/zlib/1.2.3/zlib-1.2.3.tar.bz2
-    sourceforge_pattern = (
-        r"^https?://.*sourceforge.net/projects?/"
-        r"(?P<namespace>([^/]+))/"  # do not allow more "/" segments
-        r"(OldFiles/)?"
-        r"(?P<name>.+)/"
-        r"(?P<version>[v0-9\.]+)/"  # version restricted to digits and dots
-        r"(?P=name).*(?P=version).*"  # {name}-{version} repeated in the filename
-        r"[^/]$"  # not ending with "/"
-    )
-
     sourceforge_purl = purl_from_pattern("sourceforge", sourceforge_pattern, uri)
 
     if not sourceforge_purl:
         # Get the project name from `uri` and use that as the Package name
         # http://master.dl.sourceforge.net/project/aloyscore/aloyscore/0.1a1%2520stable/0.1a1_stable_AloysCore.zip
-        split_uri = uri.split("/project/")
+        split_uri = uri.url.split("/project/")
 
         # http://master.dl.sourceforge.net, aloyscore/aloyscore/0.1a1%2520stable/0.1a1_stable_AloysCore.zip
         if len(split_uri) >= 2:
@@ -436,11 +813,23 @@ def build_sourceforge_purl(uri):
             if remaining_uri_path_segments:
                 project_name = remaining_uri_path_segments[0]  # aloyscore
                 sourceforge_purl = PackageURL(
-                    type="sourceforge", name=project_name, qualifiers={"download_url": uri}
+                    type="sourceforge", name=project_name, qualifiers={"download_url": uri.url}
                 )
     return sourceforge_purl
 
 
+# http://master.dl.sourceforge.net/project/libpng/zlib/1.2.3/zlib-1.2.3.tar.bz2
+sourceforge_pattern = compile_pattern(
+    r"^https?://.*sourceforge.net/projects?/"
+    r"(?P<namespace>([^/]+))/"  # do not allow more "/" segments
+    r"(OldFiles/)?"
+    r"(?P<name>.+)/"
+    r"(?P<version>[v0-9\.]+)/"  # version restricted to digits and dots
+    r"(?P=name).*(?P=version).*"  # {name}-{version} repeated in the filename
+    r"[^/]$"  # not ending with "/"
+)
+
+
 # https://crates.io/api/v1/crates/rand/0.7.2/download
 cargo_pattern = r"^https?://crates.io/api/v1/crates/(?P<name>.+)/(?P<version>.+)(\/download)$"
 
@@ -457,6 +846,7 @@ register_pattern("github", github_raw_content_pattern)
 
 
 @purl_router.route("https?://api.github\\.com/repos/.*")
+@accepts_parsed_url
 def build_github_api_purl(url):
     """
     Return a PackageURL object from GitHub API `url`.
@@ -465,7 +855,7 @@ def build_github_api_purl(url):
     https://api.github.com/repos/nexB/scancode-toolkit/
     and returns a `PackageURL` object
     """
-    segments = get_path_segments(url)
+    segments = url.segments
 
     if not (len(segments) >= 3):
         return
@@ -488,89 +878,90 @@ def build_github_api_purl(url):
 # https://codeload.github.com/berngp/grails-rest/zip/release/0.7
 github_codeload_pattern = (
     r"https?://codeload.github.com/(?P<namespace>.+)/(?P<name>.+)/"
-    r"(zip|tar.gz|tar.bz2|tgz)/(.*/)*"
+    r"(zip|tar.gz|tar.bz2|tgz)/(?:.*/)?"
     r"(?P<version>.+)$"
 )
 
 register_pattern("github", github_codeload_pattern)
 
 
-@purl_router.route("https?://github\\.com/.*")
-def build_github_purl(url):
-    """
-    Return a PackageURL object from GitHub `url`.
-    """
+# https://github.com/apache/nifi/archive/refs/tags/rel/nifi-2.0.0-M3.tar.gz
+github_archive_tags_pattern = compile_pattern(
+    r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
+    r"/archive/refs/tags/"
+    r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
+)
 
-    # https://github.com/apache/nifi/archive/refs/tags/rel/nifi-2.0.0-M3.tar.gz
-    archive_tags_pattern = (
-        r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
-        r"/archive/refs/tags/"
-        r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
-    )
+# https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip
+github_archive_pattern = compile_pattern(
+    r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
+    r"/archive/(?:.*/)?"
+    r"((?P=name)(-|_|@))?"
+    r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
+)
 
-    # https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip
-    archive_pattern = (
-        r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
-        r"/archive/(.*/)*"
-        r"((?P=name)(-|_|@))?"
-        r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
-    )
+# https://github.com/downloads/mozilla/rhino/rhino1_7R4.zip
+github_download_pattern = compile_pattern(
+    r"https?://github.com/downloads/(?P<namespace>.+)/(?P<name>.+)/"
+    r"((?P=name)(-|@)?)?"
+    r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
+)
 
-    # https://github.com/downloads/mozilla/rhino/rhino1_7R4.zip
-    download_pattern = (
-        r"https?://github.com/downloads/(?P<namespace>.+)/(?P<name>.+)/"
-        r"((?P=name)(-|@)?)?"
-        r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz)"
-    )
+# https://github.com/pypa/get-virtualenv/raw/20.0.31/public/virtualenv.pyz
+github_raw_pattern = compile_pattern(
+    r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
+    r"/raw/(?P<version>[^/]+)/(?P<subpath>.*)$"
+)
 
-    # https://github.com/pypa/get-virtualenv/raw/20.0.31/public/virtualenv.pyz
-    raw_pattern = (
-        r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
-        r"/raw/(?P<version>[^/]+)/(?P<subpath>.*)$"
-    )
+# https://github.com/fanf2/unifdef/blob/master/unifdef.c
+github_blob_pattern = compile_pattern(
+    r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
+    r"/blob/(?P<version>[^/]+)/(?P<subpath>.*)$"
+)
 
-    # https://github.com/fanf2/unifdef/blob/master/unifdef.c
-    blob_pattern = (
-        r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
-        r"/blob/(?P<version>[^/]+)/(?P<subpath>.*)$"
-    )
+# https://github.com/yarnpkg/yarn/releases/download/v1.3.2/yarn-v1.3.2.tar.gz
+github_releases_download_pattern = compile_pattern(
+    r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
+    r"/releases/download/(?P<version>[^/]+)/.*$"
+)
 
-    releases_download_pattern = (
-        r"https?://github.com/(?P<namespace>.+)/(?P<name>.+)"
-        r"/releases/download/(?P<version>[^/]+)/.*$"
-    )
+# https://github.com/pombredanne/schematics.git
+github_git_pattern = compile_pattern(r"https?://github.com/(?P<namespace>.+)/(?P<name>.+).(git)")
 
-    # https://github.com/pombredanne/schematics.git
-    git_pattern = r"https?://github.com/(?P<namespace>.+)/(?P<name>.+).(git)"
+# https://github.com/<namespace>/<name>/commit/<sha>
+github_commit_pattern = compile_pattern(
+    r"https?://github.com/"
+    r"(?P<namespace>[^/]+)/(?P<name>[^/]+)/commit/(?P<version>[0-9a-fA-F]{7,40})/?$"
+)
 
-    # https://github.com/<namespace>/<name>/commit/<sha>
-    commit_pattern = (
-        r"https?://github.com/"
-        r"(?P<namespace>[^/]+)/(?P<name>[^/]+)/commit/(?P<version>[0-9a-fA-F]{7,40})/?$"
-    )
+# GitHub patterns, tried in sequence
+github_patterns = (
+    github_commit_pattern,
+    github_archive_tags_pattern,
+    github_archive_pattern,
+    github_raw_pattern,
+    github_blob_pattern,
+    github_releases_download_pattern,
+    github_download_pattern,
+    github_git_pattern,
+)
 
-    patterns = (
-        commit_pattern,
-        archive_tags_pattern,
-        archive_pattern,
-        raw_pattern,
-        blob_pattern,
-        releases_download_pattern,
-        download_pattern,
-        git_pattern,
-    )
 
-    for pattern in patterns:
-        matches = re.search(pattern, url)
-        qualifiers = {}
-        if matches:
-            if pattern == releases_download_pattern:
-                qualifiers["download_url"] = url
-            return purl_from_pattern(
-                type_="github", pattern=pattern, url=url, qualifiers=qualifiers
-            )
+@purl_router.route("https?://github\\.com/.*")
+@accepts_parsed_url
+def build_github_purl(url):
+    """
+    Return a PackageURL object from GitHub `url`.
+    """
+    for pattern in github_patterns:
+        match = pattern.match(url.unquoted)
+        if match:
+            qualifiers = {}
+            if pattern is github_releases_download_pattern:
+                qualifiers["download_url"] = url.url
+            return purl_from_match("github", match, qualifiers)
 
-    segments = get_path_segments(url)
+    segments = url.segments
     if not len(segments) >= 2:
         return
 
@@ -599,13 +990,21 @@ def build_github_purl(url):
 
 
 # https://bitbucket.org/<namespace>/<name>/commits/<sha>
-bitbucket_commit_pattern = (
+bitbucket_commit_pattern = compile_pattern(
     r"https?://bitbucket.org/"
     r"(?P<namespace>[^/]+)/(?P<name>[^/]+)/commits/(?P<version>[0-9a-fA-F]{7,64})/?$"
 )
 
+# https://bitbucket.org/<namespace>/<name>/downloads/<file>
+bitbucket_download_pattern = compile_pattern(
+    r"https?://bitbucket.org/"
+    r"(?P<namespace>.+)/(?P<name>.+)/downloads/"
+    r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz|exe|msi)"
+)
+
 
 @purl_router.route("https?://bitbucket\\.org/.*")
+@accepts_parsed_url
 def build_bitbucket_purl(url):
     """
     Return a PackageURL object from BitBucket `url`.
@@ -615,7 +1014,7 @@ def build_bitbucket_purl(url):
     https://bitbucket.org/TG1999/first_repo/src/master/new_folder
     https://bitbucket.org/TG1999/first_repo/commits/16a60c4a74ef477cd8c16ca82442eaab2fbe8c86
     """
-    commit_matche = re.search(bitbucket_commit_pattern, url)
+    commit_matche = bitbucket_commit_pattern.search(url.url)
     if commit_matche:
         return PackageURL(
             type="bitbucket",
@@ -626,23 +1025,18 @@ def build_bitbucket_purl(url):
             subpath="",
         )
 
-    segments = get_path_segments(url)
+    segments = url.segments
 
     if not len(segments) >= 2:
         return
     namespace = segments[0]
     name = segments[1]
 
-    bitbucket_download_pattern = (
-        r"https?://bitbucket.org/"
-        r"(?P<namespace>.+)/(?P<name>.+)/downloads/"
-        r"(?P<version>.+).(zip|tar.gz|tar.bz2|.tgz|exe|msi)"
-    )
-    matches = re.search(bitbucket_download_pattern, url)
+    matches = bitbucket_download_pattern.search(url.url)
 
     qualifiers = {}
     if matches:
-        qualifiers["download_url"] = url
+        qualifiers["download_url"] = url.url
         return PackageURL(type="bitbucket", namespace=namespace, name=name, qualifiers=qualifiers)
 
     version = None
@@ -667,7 +1061,16 @@ def build_bitbucket_purl(url):
     )
 
 
+# https://gitlab.com/<ns>/<name>/-/commit/<sha>
+gitlab_commit_pattern = compile_pattern(
+    r"https?://gitlab.com/"
+    r"(?P<namespace>[^/]+)/(?P<name>[^/]+)/-/commit/"
+    r"(?P<version>[0-9a-fA-F]{7,64})/?$"
+)
+
+
 @purl_router.route("https?://gitlab\\.com/(?!.*/archive/).*")
+@accepts_parsed_url
 def build_gitlab_purl(url):
     """
     Return a PackageURL object from Gitlab `url`.
@@ -678,14 +1081,7 @@ def build_gitlab_purl(url):
     https://gitlab.com/tg1999/Firebase/-/tree/master
     https://gitlab.com/tg1999/Firebase/-/commit/bf04e5f289885cf2f20a92b387bcc6df33e30809
     """
-    # https://gitlab.com/<ns>/<name>/-/commit/<sha>
-    commit_pattern = (
-        r"https?://gitlab.com/"
-        r"(?P<namespace>[^/]+)/(?P<name>[^/]+)/-/commit/"
-        r"(?P<version>[0-9a-fA-F]{7,64})/?$"
-    )
-
-    commit_matche = re.search(commit_pattern, url)
+    commit_matche = gitlab_commit_pattern.search(url.url)
     if commit_matche:
         return PackageURL(
             type="gitlab",
@@ -696,7 +1092,7 @@ def build_gitlab_purl(url):
             subpath="",
         )
 
-    segments = get_path_segments(url)
+    segments = url.segments
 
     if not len(segments) >= 2:
         return
@@ -755,10 +1151,11 @@ register_pattern("hackage", hackage_project_pattern)
 @purl_router.route(
     "https?://storage.googleapis.com/google-code-archive-downloads/v2/code.google.com/.*"
 )
+@accepts_parsed_url
 def build_generic_google_code_archive_purl(uri):
     # https://storage.googleapis.com/google-code-archive-downloads/v2/code.google.com
     # /android-notifier/android-notifier-desktop-0.5.1-1.i386.rpm
-    _, remaining_uri = uri.split(
+    _, remaining_uri = uri.url.split(
         "https://storage.googleapis.com/google-code-archive-downloads/v2/code.google.com/"
     )
     if remaining_uri:  # android-notifier/android-notifier-desktop-0.5.1-1.i386.rpm
@@ -770,5 +1167,5 @@ def build_generic_google_code_archive_purl(uri):
                 type="generic",
                 namespace="code.google.com",
                 name=name,
-                qualifiers={"download_url": uri},
+                qualifiers={"download_url": uri.url},
             )
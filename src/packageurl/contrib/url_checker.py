@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+"""
+Verify that the download URLs inferred from purls exist, with HTTP HEAD requests
+sent concurrently with asyncio.
+
+For each purl, ranked candidate download URLs are checked in turn, such as
+GitHub tags with and without a "v" prefix, and the first URL that exists is
+returned. Requests are sent over keep-alive connections pooled per host with a
+limit of concurrent requests per host and overall, and the verdicts of URLs are
+cached.
+
+Only the standard library is used: when a URL cannot be checked, such as on
+network errors, timeouts or for https URLs in a Python built without SSL
+support, its status is None instead of raising an exception.
+"""
+
+import asyncio
+from collections import namedtuple
+from urllib.parse import urljoin
+from urllib.parse import urlsplit
+
+try:
+    import ssl
+except ImportError:  # Python built without SSL support
+    ssl = None
+
+from packageurl.contrib.purl2url import get_download_url
+from packageurl.contrib.purl2url import parse_purl
+
+REDIRECT_STATUSES = frozenset([301, 302, 303, 307, 308])
+
+# HEAD is not supported by some servers: GET is used instead for these statuses
+HEAD_NOT_ALLOWED_STATUSES = frozenset([405, 501])
+
+DEFAULT_PORTS = {
+    "http": 80,
+    "https": 443,
+}
+
+# The verification result of a purl: `url` is the first candidate URL that
+# exists or None, `exists` is True, False or None when unknown and `statuses` is
+# a mapping of {candidate URL: HTTP status or None}.
+VerifiedURL = namedtuple("VerifiedURL", ["purl", "url", "exists", "statuses"])
+
+
+def get_ranked_purls(purl):
+    """
+    Return a list of PackageURL variants of a `purl` PackageURL whose download
+    URLs are candidates, best first.
+    """
+    version = purl.version
+    qualifiers = purl.qualifiers
+
+    if purl.type in ("github", "gitlab", "bitbucket") and version:
+        # Git tags are found with or without a "v" prefix
+        if qualifiers.get("version_prefix"):
+            other_qualifiers = dict(qualifiers)
+            del other_qualifiers["version_prefix"]
+            return [purl, purl._replace(qualifiers=other_qualifiers)]
+        if version[0] in "vV":
+            return [purl, purl._replace(version=version[1:])]
+        return [purl, purl._replace(qualifiers=dict(qualifiers, version_prefix="v"))]
+
+    if purl.type == "golang" and version and "+incompatible" not in version:
+        # Modules with a major version >= 2 and no go.mod have an +incompatible version
+        major = version.lstrip("v").partition(".")[0]
+        if major.isdigit() and int(major) >= 2:
+            return [purl, purl._replace(version=f"{version}+incompatible")]
+
+    if purl.type == "conda" and not qualifiers.get("type"):
+        return [
+            purl._replace(qualifiers=dict(qualifiers, type=archive_type))
+            for archive_type in ("conda", "tar.bz2")
+        ]
+
+    return [purl]
+
+
+def get_candidate_urls(purl):
+    """
+    Return a list of candidate download URLs for a `purl` string or PackageURL,
+    best first.
+    """
+    urls = []
+    for ranked_purl in get_ranked_purls(parse_purl(purl)):
+        try:
+            url = get_download_url(ranked_purl)
+        except Exception:
+            continue
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+class HostPool:
+    """
+    The idle keep-alive connections to a host and the limit of concurrent
+    requests to this host.
+    """
+
+    def __init__(self, limit):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle = []
+
+    def close(self):
+        while self.idle:
+            _reader, writer = self.idle.pop()
+            writer.close()
+
+
+class URLChecker:
+    """
+    Check that URLs exist with HEAD requests and verify the candidate download
+    URLs of purls. Must be created and used in a running event loop, for
+    instance as an async context manager.
+
+    `limit_per_host` and `limit` are the maximum number of concurrent requests
+    to a host and overall. `timeout` is the timeout in seconds of a request.
+    `verdicts` is a mapping of {URL: HTTP status} used to cache the statuses of
+    checked URLs, possibly shared between checkers. Statuses of server errors
+    are not cached. `get_candidates` returns the candidate URLs of a purl.
+    """
+
+    def __init__(
+        self,
+        limit_per_host=4,
+        limit=100,
+        timeout=10.0,
+        max_redirects=5,
+        verdicts=None,
+        get_candidates=get_candidate_urls,
+        user_agent="packageurl-python",
+    ):
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.verdicts = {} if verdicts is None else verdicts
+        self.get_candidates = get_candidates
+        self.user_agent = user_agent
+        self._semaphore = asyncio.Semaphore(limit)
+        self._pools = {}
+        self._pending = {}
+        self._ssl_context = ssl and ssl.create_default_context()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Close the idle connections.
+        """
+        for pool in self._pools.values():
+            pool.close()
+
+    async def _connect(self, scheme, host, port):
+        if scheme == "https":
+            connection = asyncio.open_connection(
+                host, port, ssl=self._ssl_context, server_hostname=host
+            )
+        else:
+            connection = asyncio.open_connection(host, port)
+        return await asyncio.wait_for(connection, self.timeout)
+
+    async def _send(self, reader, writer, method, host, path):
+        request = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"User-Agent: {self.user_agent}\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        )
+        writer.write(request.encode("latin-1"))
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1")
+        http_version, _, status = status_line.partition(" ")
+        status = status.partition(" ")[0]
+        if not http_version.startswith("HTTP/") or not status.isdigit():
+            raise ValueError(f"Invalid HTTP status line: {status_line!r}")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise EOFError("Connection closed while reading headers")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            method == "HEAD"
+            and http_version.strip() == "HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+        )
+        return int(status), headers, keep_alive
+
+    async def request(self, method, url):
+        """
+        Send a `method` request for `url` and return a tuple of (HTTP status,
+        Location header or None). The body of the response is not read.
+        Raise ValueError for unsupported URLs.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url!r}")
+        if scheme == "https" and ssl is None:
+            raise ValueError(f"SSL is not supported: {url!r}")
+
+        host = parts.hostname
+        port = parts.port or DEFAULT_PORTS[scheme]
+        host_header = host if port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        pool = self._pools.get((scheme, host, port))
+        if pool is None:
+            pool = self._pools[(scheme, host, port)] = HostPool(self.limit_per_host)
+
+        async with self._semaphore, pool.semaphore:
+            while True:
+                reused = bool(pool.idle)
+                if reused:
+                    reader, writer = pool.idle.pop()
+                else:
+                    reader, writer = await self._connect(scheme, host, port)
+                try:
+                    status, headers, keep_alive = await asyncio.wait_for(
+                        self._send(reader, writer, method, host_header, path), self.timeout
+                    )
+                except (OSError, EOFError):
+                    writer.close()
+                    # The server may have closed an idle keep-alive connection
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    pool.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers.get("location")
+
+    async def _check_url(self, url):
+        for _ in range(self.max_redirects + 1):
+            try:
+                status, location = await self.request("HEAD", url)
+                if status in HEAD_NOT_ALLOWED_STATUSES:
+                    status, location = await self.request("GET", url)
+            except (OSError, EOFError, ValueError, asyncio.TimeoutError):
+                return
+            if status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            return status
+
+    async def check_url(self, url):
+        """
+        Return the HTTP status of `url` after redirects or None if the URL
+        cannot be checked. Concurrent checks of a URL share one request.
+        """
+        if url in self.verdicts:
+            return self.verdicts[url]
+
+        task = self._pending.get(url)
+        if task is None:
+            task = self._pending[url] = asyncio.ensure_future(self._check_url(url))
+            try:
+                status = await task
+            finally:
+                del self._pending[url]
+            if status is not None and status < 500 and status != 429:
+                self.verdicts[url] = status
+            return status
+        return await task
+
+    async def verify(self, purl):
+        """
+        Return a VerifiedURL for a `purl` string or PackageURL.
+        """
+        statuses = {}
+        try:
+            candidates = self.get_candidates(purl)
+        except ValueError:
+            candidates = []
+
+        for url in candidates:
+            status = statuses[url] = await self.check_url(url)
+            if status is not None and 200 <= status < 300:
+                return VerifiedURL(purl, url, True, statuses)
+
+        exists = False if statuses and None not in statuses.values() else None
+        return VerifiedURL(purl, None, exists, statuses)
+
+    async def verify_many(self, purls):
+        """
+        Return a list of VerifiedURL for the `purls` strings or PackageURL,
+        verified concurrently.
+        """
+        return await asyncio.gather(*(self.verify(purl) for purl in purls))
+
+
+async def async_verify_urls(purls, **options):
+    """
+    Return a list of VerifiedURL for the `purls` strings or PackageURL using a
+    URLChecker created with `options`.
+    """
+    async with URLChecker(**options) as checker:
+        return await checker.verify_many(purls)
+
+
+def verify_urls(purls, **options):
+    """
+    Return a list of VerifiedURL for the `purls` strings or PackageURL using a
+    URLChecker created with `options`, in a new event loop.
+    """
+    return asyncio.run(async_verify_urls(purls, **options))
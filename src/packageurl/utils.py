@@ -24,6 +24,12 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+import re
+from collections import namedtuple
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Union
 
@@ -62,3 +68,213 @@ def ensure_str(value: Optional[Union[str, bytes]]) -> Optional[str]:
     if isinstance(value, bytes):
         return value.decode("utf-8")  # or whatever encoding is right
     return value
+
+
+class ConversionError(namedtuple("ConversionError", ["identifier", "syntax", "message"])):
+    """
+    The error of a native identifier that cannot be converted to a PackageURL.
+    A ConversionError is falsy, such that converted identifiers can be tested
+    as ``if purl:``.
+    """
+
+    def __bool__(self) -> bool:
+        return False
+
+
+make_purl = PackageURL._make
+
+# The converters match identifiers with these compiled patterns and build
+# PackageURL from tuples, skipping the normalizing constructor: the matched
+# values are already valid and the converters apply the normalizations of
+# their package type.
+
+maven_coordinates_pattern = re.compile(
+    r"^(?P<namespace>[^:@/\s]+):(?P<name>[^:@/\s]+)"
+    r"(?::(?P<version>[^:@/\s]+)(?::(?P<classifier>[^:@/\s]+))?)?"
+    r"(?:@(?P<type>[^:@/\s]+))?$"
+).match
+
+
+def get_maven_purl(coordinates: str) -> Union[PackageURL, ConversionError]:
+    """
+    Return a maven PackageURL or a ConversionError for Gradle-style Maven
+    `coordinates` "group:artifact[:version[:classifier]][@extension]".
+
+    >>> get_maven_purl("org.apache.commons:commons-io:1.3.4:sources@jar").to_string()
+    'pkg:maven/org.apache.commons/commons-io@1.3.4?classifier=sources&type=jar'
+    >>> get_maven_purl("commons-io")
+    ConversionError(identifier='commons-io', syntax='maven', message='Invalid Maven coordinates')
+    """
+    match = isinstance(coordinates, str) and maven_coordinates_pattern(coordinates.strip())
+    if not match:
+        return ConversionError(coordinates, "maven", "Invalid Maven coordinates")
+    namespace, name, version, classifier, type_ = match.groups()
+    qualifiers: Dict[str, str] = {}
+    if classifier:
+        qualifiers["classifier"] = classifier
+    if type_:
+        qualifiers["type"] = type_
+    return make_purl(("maven", namespace, name, version, qualifiers, None))
+
+
+npm_spec_pattern = re.compile(
+    r"^(?:@(?P<namespace>[^/@\s]+)/)?(?P<name>[^/@\s]+)(?:@(?P<version>[^@]+))?$"
+).match
+
+# an exact semver version, with an optional "=" or "v" prefix
+npm_exact_version_pattern = re.compile(
+    r"^=?v?(?P<version>\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?)$"
+).match
+
+
+def get_npm_purl(spec: str) -> Union[PackageURL, ConversionError]:
+    """
+    Return an npm PackageURL or a ConversionError for an npm package `spec`
+    "[@scope/]name[@version]".
+    The version of a spec is dropped if it is a range or a dist-tag rather
+    than an exact version.
+
+    >>> get_npm_purl("@babel/core@7.23.0").to_string()
+    'pkg:npm/%40babel/core@7.23.0'
+    >>> get_npm_purl("lodash@^4.17.0").to_string()
+    'pkg:npm/lodash'
+    """
+    match = isinstance(spec, str) and npm_spec_pattern(spec.strip())
+    if not match:
+        return ConversionError(spec, "npm", "Invalid npm package spec")
+    namespace, name, version = match.groups()
+    namespace = namespace and f"@{namespace}"
+    exact_version = version and npm_exact_version_pattern(version.strip())
+    version = exact_version and exact_version.group("version") or None
+    return make_purl(("npm", namespace, name.lower(), version, {}, None))
+
+
+go_module_pattern = re.compile(
+    r"^(?:(?P<namespace>[^@\s]+)/)?(?P<name>[^/@\s]+)(?:(?:@|\s+)(?P<version>v[^@\s]+))?$"
+).match
+
+
+def get_go_module_purl(module: str) -> Union[PackageURL, ConversionError]:
+    """
+    Return a golang PackageURL or a ConversionError for a Go `module` path
+    and optional version, either as "module version" as in a go.mod file or
+    as "module@version". A trailing "// indirect" comment is ignored.
+
+    >>> get_go_module_purl("github.com/gorilla/mux@v1.8.1 // indirect").to_string()
+    'pkg:golang/github.com/gorilla/mux@v1.8.1'
+    """
+    match = isinstance(module, str) and go_module_pattern(module.partition("//")[0].strip())
+    if not match:
+        return ConversionError(module, "golang", "Invalid Go module")
+    namespace, name, version = match.groups()
+    return make_purl(("golang", namespace, name, version, {}, None))
+
+
+docker_reference_pattern = re.compile(
+    # a registry is a first component with a dot or a port, or localhost
+    r"^(?:(?P<registry>[^/\s.:]*[.:][^/\s]*|localhost)/)?"
+    r"(?P<path>[a-z0-9]+(?:(?:[._]|__|-+)[a-z0-9]+)*(?:/[a-z0-9]+(?:(?:[._]|__|-+)[a-z0-9]+)*)*)"
+    r"(?::(?P<tag>[A-Za-z0-9_][A-Za-z0-9_.-]{0,127}))?"
+    r"(?:@(?P<digest>[A-Za-z][A-Za-z0-9]*(?:[-_+.][A-Za-z][A-Za-z0-9]*)*:[0-9a-fA-F]{32,}))?$"
+).match
+
+DOCKER_HUB_REGISTRIES = {"docker.io", "index.docker.io", "registry-1.docker.io"}
+
+
+def get_docker_purl(reference: str) -> Union[PackageURL, ConversionError]:
+    """
+    Return a docker PackageURL or a ConversionError for a Docker image
+    `reference` "[registry/]repository[:tag][@digest]".
+
+    The version is the digest if any or the tag. The tag of a reference with
+    both is kept as a "tag" qualifier. Images of other registries than Docker
+    Hub get a "repository_url" qualifier, and the "library/" namespace of the
+    Docker Hub official images is omitted.
+
+    >>> get_docker_purl("gcr.io/distroless/static:nonroot").to_string()
+    'pkg:docker/distroless/static@nonroot?repository_url=gcr.io'
+    >>> get_docker_purl("docker.io/library/debian:bookworm").to_string()
+    'pkg:docker/debian@bookworm'
+    """
+    match = isinstance(reference, str) and docker_reference_pattern(reference.strip())
+    if not match:
+        return ConversionError(reference, "docker", "Invalid Docker image reference")
+    registry, path, tag, digest = match.groups()
+    namespace, _, name = path.rpartition("/")
+    qualifiers: Dict[str, str] = {}
+    if registry in DOCKER_HUB_REGISTRIES or not registry:
+        if namespace == "library":
+            namespace = None
+    else:
+        qualifiers["repository_url"] = registry
+    if digest and tag:
+        qualifiers["tag"] = tag
+    return make_purl(("docker", namespace or None, name, digest or tag, qualifiers, None))
+
+
+pypi_requirement_pattern = re.compile(
+    r"^(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:\[[^\]]*\])?"
+    r"\s*===?\s*(?P<version>[^\s;,#*]+)\s*(?:[;#].*)?$"
+).match
+
+
+def get_pypi_purl(requirement: str) -> Union[PackageURL, ConversionError]:
+    """
+    Return a pypi PackageURL or a ConversionError for a pinned Python
+    `requirement` "name[extras]==version", with optional environment markers
+    and comments.
+
+    >>> get_pypi_purl("Flask_Cors[all]==4.0.0 ; python_version >= '3.8'").to_string()
+    'pkg:pypi/flask-cors@4.0.0'
+    >>> get_pypi_purl("requests>=2").message
+    'Invalid or unpinned requirement'
+    """
+    match = isinstance(requirement, str) and pypi_requirement_pattern(requirement.strip())
+    if not match:
+        return ConversionError(requirement, "pypi", "Invalid or unpinned requirement")
+    name, version = match.groups()
+    name = name.lower().replace("_", "-")
+    return make_purl(("pypi", None, name, version, {}, None))
+
+
+# {syntax: converter function}
+NATIVE_CONVERTERS: Dict[str, Callable[[str], Union[PackageURL, ConversionError]]] = {
+    "maven": get_maven_purl,
+    "npm": get_npm_purl,
+    "golang": get_go_module_purl,
+    "docker": get_docker_purl,
+    "pypi": get_pypi_purl,
+}
+
+
+def get_purls(identifiers: Iterable[str], syntax: str) -> List[Union[PackageURL, ConversionError]]:
+    """
+    Return a list of PackageURL or ConversionError, one for each of an
+    iterable of native `identifiers` strings of the `syntax`, one of "maven",
+    "npm", "golang", "docker" or "pypi".
+    Raise a ValueError for an unknown syntax.
+
+    Identifiers repeated in `identifiers` are converted only once. Each
+    repeated PackageURL has its own copy of the qualifiers.
+
+    >>> purls = get_purls(["six==1.16.0", "six", "six==1.16.0"], "pypi")
+    >>> [purl.to_string() if purl else purl.message for purl in purls]
+    ['pkg:pypi/six@1.16.0', 'Invalid or unpinned requirement', 'pkg:pypi/six@1.16.0']
+    """
+    convert = NATIVE_CONVERTERS.get(syntax)
+    if not convert:
+        raise ValueError(f"Unknown native identifier syntax: {syntax!r}")
+    converted: Dict[str, Union[PackageURL, ConversionError]] = {}
+    purls = []
+    for identifier in identifiers:
+        try:
+            purl = converted[identifier]
+            if isinstance(purl, PackageURL):
+                purl = purl._replace(qualifiers=dict(purl.qualifiers))
+        except KeyError:
+            purl = converted[identifier] = convert(identifier)
+        except TypeError:
+            # unhashable identifiers
+            purl = convert(identifier)
+        purls.append(purl)
+    return purls
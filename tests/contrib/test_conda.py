@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import os
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib.conda import CondaIndex
+from packageurl.contrib.conda import CondaRecord
+from packageurl.contrib.conda import get_filename
+from packageurl.contrib.conda import load_repodata
+
+CONDA_DATA = os.path.join(os.path.dirname(__file__), "data", "conda")
+
+
+@pytest.fixture
+def conda_index():
+    index = CondaIndex()
+    index.add_channel_directory(os.path.join(CONDA_DATA, "main"))
+    index.add_channel_directory(os.path.join(CONDA_DATA, "conda-forge"))
+    return index
+
+
+def test_load_repodata_keeps_compact_records():
+    index = load_repodata(os.path.join(CONDA_DATA, "main", "linux-64", "repodata.json"))
+    assert [("absl-py", "0.4.1"), ("numpy", "1.11.3")] == list(index)
+    record, filename = index[("absl-py", "0.4.1")][0]
+    assert ".tar.bz2" == filename
+    assert "absl-py-0.4.1-py36h06a4308_0.tar.bz2" == get_filename(record, filename)
+    assert isinstance(record, CondaRecord)
+    assert "py36h06a4308_0" == record.build
+    assert isinstance(record.sha256, bytes)
+    assert record.sha256.hex().startswith("4b3b2d9b")
+    assert 3 == len(index[("numpy", "1.11.3")])
+
+
+def test_conda_index_loads_repodata_lazily(conda_index):
+    assert ["main", "conda-forge"] == conda_index.channels
+    assert ["linux-64", "noarch"] == conda_index.get_subdirs("main")
+    assert {} == conda_index._indexes
+    conda_index.resolve("pkg:conda/six@1.16.0?channel=main&subdir=noarch")
+    assert [("main", "noarch")] == list(conda_index._indexes)
+
+
+def test_conda_index_resolves_exact_artifacts(conda_index):
+    purl = "pkg:conda/absl-py@0.4.1?build=py36h06a4308_0&channel=main&subdir=linux-64&type=tar.bz2"
+    artifact = conda_index.resolve(purl)
+    assert (
+        "https://repo.anaconda.com/pkgs/main/linux-64/absl-py-0.4.1-py36h06a4308_0.tar.bz2"
+        == artifact.url
+    )
+    assert artifact.sha256.startswith("4b3b2d9b")
+    assert artifact == conda_index.resolve(PackageURL.from_string(purl))
+
+    # the build and archive type are filled in: highest build number and .conda first
+    artifact = conda_index.resolve("pkg:conda/numpy@1.11.3?channel=main&subdir=linux-64")
+    assert "numpy-1.11.3-py36h1b885b7_9.conda" == artifact.filename
+    assert "3" * 64 == artifact.sha256
+    artifact = conda_index.resolve("pkg:conda/numpy@1.11.3?channel=main&type=tar.bz2")
+    assert "numpy-1.11.3-py36h1b885b7_9.tar.bz2" == artifact.filename
+    artifact = conda_index.resolve("pkg:conda/numpy@1.11.3?build=py36h1b885b7_8")
+    assert 8 == artifact.build_number
+
+    # without a subdir, all the channel subdirs are searched
+    artifact = conda_index.resolve("pkg:conda/six@1.16.0?channel=main")
+    assert (
+        "https://repo.anaconda.com/pkgs/main/noarch/six-1.16.0-pyhd3eb1b0_1.conda" == artifact.url
+    )
+
+    assert (
+        "https://conda.anaconda.org/conda-forge/linux-64/numpy-1.11.3-py36_0.conda"
+        == conda_index.get_download_url("pkg:conda/numpy@1.11.3?channel=conda-forge")
+    )
+    # without a channel, all the channels are searched
+    assert 4 == len(conda_index.get_artifacts("pkg:conda/numpy@1.11.3"))
+
+
+def test_conda_index_returns_none_for_unknown_packages(conda_index):
+    purls = [
+        "pkg:conda/numpy@9.9",
+        "pkg:conda/numpy",
+        "pkg:conda/numpy@1.11.3?channel=bioconda",
+        "pkg:conda/numpy@1.11.3?subdir=win-64",
+        "pkg:conda/numpy@1.11.3?build=py27_0",
+        "pkg:pypi/numpy@1.11.3",
+    ]
+    assert [None] * 6 == conda_index.resolve_many(purls)
+
+    with pytest.raises(ValueError):
+        conda_index.resolve("numpy")
+    assert None is conda_index.get_download_url(purls[0])
+
+
+def test_conda_index_keeps_non_standard_filenames_and_missing_checksums(conda_index):
+    artifact = conda_index.resolve("pkg:conda/six@1.15.0")
+    assert "https://repo.anaconda.com/pkgs/main/noarch/six-1.15.0-custom.tar.bz2" == artifact.url
+    assert None is artifact.sha256
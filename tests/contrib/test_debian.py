@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import gzip
+import lzma
+import os
+import shutil
+
+import pytest
+
+from packageurl.contrib.debian import DebianIndex
+from packageurl.contrib.debian import iter_paragraphs
+
+DEBIAN_DATA = os.path.join(os.path.dirname(__file__), "data", "debian")
+PACKAGES = os.path.join(DEBIAN_DATA, "Packages")
+SOURCES = os.path.join(DEBIAN_DATA, "Sources")
+
+
+@pytest.fixture
+def debian_index():
+    with DebianIndex() as index:
+        assert 3 == index.add_index(PACKAGES)
+        assert 1 == index.add_index(SOURCES)
+        yield index
+
+
+def test_iter_paragraphs_keeps_selected_fields():
+    with open(SOURCES) as lines:
+        paragraphs = list(iter_paragraphs(lines, fields={"Package", "Checksums-Sha256"}))
+    assert 1 == len(paragraphs)
+    assert "attr" == paragraphs[0]["Package"]
+    checksums = paragraphs[0]["Checksums-Sha256"].splitlines()
+    assert ["", "3e4f5a6b", "5f2bdbad"] == [checksum[:8] for checksum in checksums]
+
+
+def test_debian_index_resolves_binary_and_source_packages(debian_index):
+    artifact = debian_index.resolve("pkg:deb/debian/attr@1:2.4.48-6?arch=amd64")
+    assert "https://deb.debian.org/debian/pool/main/a/attr/attr_2.4.48-6_amd64.deb" == artifact.url
+    assert artifact.sha256.startswith("0b9f8e7d")
+    assert 25248 == artifact.size
+
+    artifact = debian_index.resolve("pkg:deb/debian/attr@1:2.4.48-6")
+    assert "pool/main/a/attr/attr_2.4.48-6.dsc" == artifact.filename
+    assert "source" == artifact.arch
+    assert artifact.sha256.startswith("3e4f5a6b")
+
+    url = debian_index.get_download_url("pkg:deb/debian/libxml2@2.9.14+dfsg-1.3?arch=amd64")
+    assert (
+        "https://deb.debian.org/debian/pool/main/libx/libxml2/libxml2_2.9.14+dfsg-1.3_amd64.deb"
+        == url
+    )
+
+    # architecture independent packages are found for any arch
+    artifact = debian_index.resolve("pkg:deb/debian/tzdata@2024a-0+deb12u1?arch=arm64")
+    assert "all" == artifact.arch
+
+    purl = "pkg:deb/debian/tzdata@2024a-0+deb12u1?arch=all"
+    url = debian_index.get_download_url(purl + "&repository_url=http://mirror.example.com/debian/")
+    assert "http://mirror.example.com/debian/pool/main/t/tzdata/" in url
+
+
+def test_debian_index_resolve_many(debian_index):
+    purls = [
+        "pkg:deb/debian/attr@1:2.4.48-6?arch=amd64",
+        "pkg:deb/debian/attr@1:2.4.48-6?arch=arm64",
+        "pkg:deb/ubuntu/attr@1:2.4.48-6?arch=amd64",
+        "pkg:deb/debian/attr",
+        "pkg:deb/debian/broken@1.0?arch=amd64",
+        "pkg:rpm/fedora/attr@1:2.4.48-6",
+    ]
+    artifacts = debian_index.resolve_many(purls)
+    assert "attr_2.4.48-6_amd64.deb" == artifacts[0].filename.rpartition("/")[-1]
+    assert [None] * 5 == artifacts[1:]
+
+
+def test_debian_index_reads_compressed_indexes_for_other_distros(tmp_path):
+    packages_gz = tmp_path / "Packages.gz"
+    with open(PACKAGES, "rb") as packages, gzip.open(packages_gz, "wb") as compressed:
+        shutil.copyfileobj(packages, compressed)
+    sources_xz = tmp_path / "Sources.xz"
+    with open(SOURCES, "rb") as sources, lzma.open(sources_xz, "wb") as compressed:
+        shutil.copyfileobj(sources, compressed)
+
+    with DebianIndex() as index:
+        assert 3 == index.add_index(packages_gz, namespace="ubuntu")
+        assert 1 == index.add_index(sources_xz, repository_url="http://archive.debian.org/debian")
+        assert (
+            "http://archive.ubuntu.com/ubuntu/pool/main/a/attr/attr_2.4.48-6_amd64.deb"
+            == index.get_download_url("pkg:deb/ubuntu/attr@1:2.4.48-6?arch=amd64")
+        )
+        assert (
+            "http://archive.debian.org/debian/pool/main/a/attr/attr_2.4.48-6.dsc"
+            == index.get_download_url("pkg:deb/debian/attr@1:2.4.48-6")
+        )
+
+        with pytest.raises(ValueError):
+            index.add_index(packages_gz, namespace="devuan")
+        # adding an index again with another namespace replaces its packages
+        assert 3 == index.add_index(
+            packages_gz, namespace="devuan", repository_url="http://deb.devuan.org/merged"
+        )
+        assert None is index.resolve("pkg:deb/ubuntu/attr@1:2.4.48-6?arch=amd64")
+        assert (
+            "http://deb.devuan.org/merged/pool/main/a/attr/attr_2.4.48-6_amd64.deb"
+            == index.get_download_url("pkg:deb/devuan/attr@1:2.4.48-6?arch=amd64")
+        )
+
+
+def test_debian_index_is_persisted_and_skips_unchanged_indexes(tmp_path):
+    path = tmp_path / "debian.sqlite"
+    packages = tmp_path / "Packages"
+    shutil.copyfile(PACKAGES, packages)
+    with DebianIndex(path) as index:
+        assert 3 == index.add_index(packages)
+
+    with DebianIndex(path) as index:
+        assert 0 == index.add_index(packages)
+        assert 3 == len(index)
+        assert index.resolve("pkg:deb/debian/attr@1:2.4.48-6?arch=amd64")
+
+        # a changed index replaces the packages of its previous version
+        with open(PACKAGES) as original:
+            packages.write_text(original.read().split("\n\n")[0] + "\n")
+        os.utime(packages, (1, 1))
+        assert 1 == index.add_index(packages)
+        assert 1 == len(index)
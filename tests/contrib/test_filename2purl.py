@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import time
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib.filename2purl import SuffixIndex
+from packageurl.contrib.filename2purl import filename2purl
+from packageurl.contrib.filename2purl import filename2purl_many
+from packageurl.contrib.filename2purl import filename_parsers
+from packageurl.contrib.filename2purl import make_purl
+
+
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        ("requests-2.31.0-py3-none-any.whl", "pkg:pypi/requests@2.31.0"),
+        ("Flask_Cors-4.0.0-py2.py3-none-any.whl", "pkg:pypi/flask-cors@4.0.0"),
+        (
+            "numpy-1.26.2-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl",
+            "pkg:pypi/numpy@1.26.2",
+        ),
+        ("setuptools-0.6c11-py2.7.egg", "pkg:pypi/setuptools@0.6c11"),
+        ("curl-8.4.0.tar.gz", "pkg:generic/curl@8.4.0"),
+        ("my-lib-2.0.zip", "pkg:generic/my-lib@2.0"),
+        ("foo_1.2-3_amd64.deb", "pkg:deb/foo@1.2-3?arch=amd64"),
+        ("foo_1%3a2.0-1_all.deb", "pkg:deb/foo@1:2.0-1?arch=all"),
+        ("debian-installer_20230607_amd64.udeb", "pkg:deb/debian-installer@20230607?arch=amd64"),
+        ("bash_5.2.15-2.dsc", "pkg:deb/bash@5.2.15-2?arch=source"),
+        ("bar-1.0-1.el9.x86_64.rpm", "pkg:rpm/bar@1.0-1.el9?arch=x86_64"),
+        ("bash-5.2.26-3.fc40.src.rpm", "pkg:rpm/bash@5.2.26-3.fc40?arch=src"),
+        ("baz-0.1.0.crate", "pkg:cargo/baz@0.1.0"),
+        ("tokio-util-1.0.0-alpha.1.crate", "pkg:cargo/tokio-util@1.0.0-alpha.1"),
+        ("qux-2.0.gem", "pkg:gem/qux@2.0"),
+        ("net-http-0.4.1.gem", "pkg:gem/net-http@0.4.1"),
+        (
+            "nokogiri-1.15.5-x86_64-linux.gem",
+            "pkg:gem/nokogiri@1.15.5?platform=x86_64-linux",
+        ),
+        ("x-1.2.3-r0.apk", "pkg:apk/x@1.2.3-r0"),
+        ("py3-cryptography-41.0.7-r0.apk", "pkg:apk/py3-cryptography@41.0.7-r0"),
+        (
+            "numpy-1.26.2-py311h64a7726_0.conda",
+            "pkg:conda/numpy@1.26.2?build=py311h64a7726_0&type=conda",
+        ),
+        ("Newtonsoft.Json.13.0.3.nupkg", "pkg:nuget/Newtonsoft.Json@13.0.3"),
+        ("/srv/store/pool/main/b/bash/bash_5.2.15-2_amd64.deb", "pkg:deb/bash@5.2.15-2?arch=amd64"),
+        ("REQUESTS-2.31.0-PY3-NONE-ANY.WHL", "pkg:pypi/requests@2.31.0"),
+    ],
+)
+def test_filename2purl(filename, expected):
+    purl = filename2purl(filename)
+    assert expected == purl.to_string()
+    assert PackageURL.from_string(expected) == purl
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        None,
+        "",
+        "README.md",
+        "Makefile",
+        ".tar.gz",
+        "requests.whl",
+        "app-release.apk",
+        "foo_1.2.deb",
+        "foo-1.0.rpm",
+        "serde.crate",
+        "rails.gem",
+        "numpy-1.26.2.conda",
+        "Newtonsoft.Json.nupkg",
+        "a" * 300 + "-1.0.0.crate",
+    ],
+)
+def test_filename2purl_returns_none(filename):
+    assert filename2purl(filename) is None
+
+
+def get_best_time(function, *args):
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_filename2purl_runs_in_linear_time():
+    # a stem ten times longer takes at most about ten times longer to parse,
+    # with a wide margin for timing noise but not for a polynomial backtracking
+    for fill in ("a-", "a.", "a_", "-1", "1.", "a-1.", "1-r"):
+        for suffix in filename_parsers.parsers:
+            short = get_best_time(filename2purl, (fill * 100)[:25] + suffix)
+            long = get_best_time(filename2purl, (fill * 1000)[:250] + suffix)
+            assert long < 50 * short + 0.001, (fill, suffix)
+
+
+def test_filename2purl_many():
+    listing = ["qux-2.0.gem\n", "README.md\n", "baz-0.1.0.crate\n", "\n"]
+    results = list(filename2purl_many(listing))
+    assert listing == [filename for filename, _purl in results]
+    purls = [purl and purl.to_string() for _filename, purl in results]
+    assert ["pkg:gem/qux@2.0", None, "pkg:cargo/baz@0.1.0", None] == purls
+
+
+def test_suffix_index_uses_longest_suffix():
+    parsers = SuffixIndex()
+
+    @parsers.register(".gz")
+    def parse_gzip(stem, suffix):
+        return make_purl(("generic", None, stem, None, {}, None))
+
+    @parsers.register(".tar.gz", ".TGZ")
+    def parse_tarball(stem, suffix):
+        return make_purl(("generic", None, stem, suffix, {}, None))
+
+    assert "pkg:generic/foo.json" == filename2purl("foo.json.gz", parsers).to_string()
+    assert "pkg:generic/foo@.tar.gz" == filename2purl("foo.tar.gz", parsers).to_string()
+    assert "pkg:generic/foo@.tgz" == filename2purl("foo.tgz", parsers).to_string()
+    assert filename2purl("foo.whl", parsers) is None
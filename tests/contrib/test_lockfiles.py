@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import io
+import os
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib.lockfiles import iter_lockfile
+from packageurl.contrib.lockfiles import iter_package_lock
+from packageurl.contrib.lockfiles import iter_yarn_lock
+
+LOCKFILES = os.path.join(os.path.dirname(__file__), "data", "lockfiles")
+
+SHA512_MS = (
+    "sha512:b0690fc7e56332d980e8c5f6ee80381411442c50996784b85ea7863970afebcb"
+    "53fa36f7be4fd1c9a2963f43d32b25ad98b48cd1bf9a7544c4bdbb353c4687db"
+)
+
+
+def parse(path):
+    """
+    Return a list of (purl string without checksum, checksum) for the lockfile
+    at `path` relative to the test lockfiles directory, and check that each
+    PackageURL is normalized.
+    """
+    results = []
+    for purl in iter_lockfile(os.path.join(LOCKFILES, path)):
+        assert PackageURL.from_string(purl.to_string()) == purl
+        qualifiers = dict(purl.qualifiers)
+        checksum = qualifiers.pop("checksum", None)
+        results.append((purl._replace(qualifiers=qualifiers).to_string(), checksum))
+    return results
+
+
+def get_purls(results):
+    return [purl for purl, _checksum in results]
+
+
+def test_iter_package_lock_v3():
+    results = parse("npm-v3/package-lock.json")
+    assert [
+        "pkg:npm/%40babel/core@7.23.0",
+        "pkg:npm/debug@4.3.4",
+        "pkg:npm/ms@2.1.2",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:npm/from-git@1.0.0?vcs_url=git%2Bssh://git%40github.com/user/from-git.git"
+        "%230123456789abcdef0123456789abcdef01234567",
+    ] == get_purls(results)
+    assert SHA512_MS == results[2][1]
+    assert None is results[4][1]
+
+
+def test_iter_package_lock_v1():
+    results = parse("npm-v1/package-lock.json")
+    assert [
+        "pkg:npm/debug@4.3.4",
+        "pkg:npm/ms@2.1.2",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:npm/ms@2.0.0",
+    ] == get_purls(results)
+    assert SHA512_MS == results[1][1]
+    assert "sha1:5608aeadfc00be6c2901df5f9861788de0d597c8" == results[3][1]
+
+
+def test_iter_yarn_lock_v1():
+    results = parse("yarn-v1/yarn.lock")
+    assert [
+        "pkg:npm/%40babel/code-frame@7.22.13",
+        "pkg:npm/debug@4.3.4",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:npm/from-git@1.0.0?vcs_url=git%2Bhttps://github.com/user/from-git.git"
+        "%230123456789abcdef0123456789abcdef01234567",
+    ] == get_purls(results)
+    assert results[0][1].startswith("sha512:5e4b6e856949e60fb74c95dce6ea5df4ab351eeb")
+    assert "sha1:1319f6579357f2338d3337d2cdd4914bb5dcc865" == results[1][1]
+    assert None is results[3][1]
+
+
+def test_iter_yarn_lock_berry():
+    assert [
+        ("pkg:npm/%40babel/code-frame@7.22.13", None),
+        ("pkg:npm/lodash@4.17.21", None),
+    ] == parse("yarn-berry/yarn.lock")
+
+
+def test_iter_poetry_lock():
+    results = parse("poetry/poetry.lock")
+    assert [
+        "pkg:pypi/flask-cors@4.0.0",
+        "pkg:pypi/internal-lib@1.2.0?repository_url=https://pypi.example.com/simple",
+        "pkg:pypi/requests@2.31.0",
+        "pkg:pypi/six@1.16.0?vcs_url=git%2Bhttps://github.com/benjaminp/six.git"
+        "%4065486e4383f9f411da95937451205d3c7b61b9e1",
+    ] == get_purls(results)
+    checksums = results[0][1].split(",")
+    assert 2 == len(checksums)
+    assert checksums[0].startswith("sha256:bc3492bfd6368d27")
+    assert None is results[1][1]
+
+
+def test_iter_pipfile_lock():
+    results = parse("pipenv/Pipfile.lock")
+    assert [
+        "pkg:pypi/certifi@2023.7.22",
+        "pkg:pypi/django@4.2.6",
+        "pkg:pypi/pytest@7.4.2",
+    ] == get_purls(results)
+    assert 2 == len(results[0][1].split(","))
+    assert None is results[2][1]
+
+
+def test_iter_cargo_lock():
+    results = parse("cargo/Cargo.lock")
+    assert [
+        "pkg:cargo/memchr@2.6.4",
+        "pkg:cargo/private-crate@1.0.0?repository_url=https://cargo.example.com/index/",
+        "pkg:cargo/serde@1.0.189?vcs_url=git%2Bhttps://github.com/serde-rs/serde"
+        "%3Fbranch%3Dmaster%235e102c4da1f0b1e5d9e1c1f5d1c4d2e5b7a4b7e3",
+    ] == get_purls(results)
+    assert "sha256:f665ee40bc4a3c5590afb1e9677db74a508659dfd71e126420da8274909a0167" == (
+        results[0][1]
+    )
+
+
+def test_iter_go_sum():
+    assert [
+        ("pkg:golang/github.com/Azure/go-autorest@v14.2.0%2Bincompatible", None),
+        ("pkg:golang/github.com/davecgh/go-spew@v1.1.1", None),
+        ("pkg:golang/golang.org/x/text@v0.13.0", None),
+        ("pkg:golang/gopkg.in/yaml.v3@v3.0.1", None),
+    ] == parse("go/go.sum")
+
+
+def test_iter_gemfile_lock():
+    results = parse("bundler/Gemfile.lock")
+    assert [
+        "pkg:gem/activesupport@7.2.0.alpha?vcs_url=git%2Bhttps://github.com/rails/rails.git"
+        "%400a9c4d6e2f3b8b6c8a5f3a2d1e0f9c8b7a6d5e4f",
+        "pkg:gem/concurrent-ruby@1.2.2",
+        "pkg:gem/nokogiri@1.15.4?platform=x86_64-linux",
+        "pkg:gem/racc@1.7.1",
+        "pkg:gem/private_gem@2.0.0?repository_url=https://gems.example.com/",
+    ] == get_purls(results)
+    assert results[2][1].startswith("sha256:e4a801e5ef643cc0")
+    assert None is results[3][1]
+
+
+def test_iter_composer_lock():
+    assert [
+        ("pkg:composer/psr/log@3.0.0", None),
+        ("pkg:composer/symfony/console@v6.3.4", "sha1:eca495f2ee845130855ddf1cf18460c38966c8b6"),
+        ("pkg:composer/phpunit/phpunit@10.4.1", None),
+    ] == parse("composer/composer.lock")
+
+
+def test_parsers_accept_file_objects():
+    lockfile = io.StringIO('{"packages": {"node_modules/A": {"version": "1.0.0"}}}')
+    assert ["pkg:npm/a@1.0.0"] == [str(purl) for purl in iter_package_lock(lockfile)]
+    lockfile = io.StringIO('"@scope/a@^1", "@scope/a@^1.1":\n  version "1.1.0"\n')
+    assert ["pkg:npm/%40scope/a@1.1.0"] == [str(purl) for purl in iter_yarn_lock(lockfile)]
+
+
+def test_iter_lockfile_rejects_unknown_lockfiles():
+    with pytest.raises(ValueError):
+        iter_lockfile("requirements.txt")
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib import persistent_cache
+from packageurl.contrib.persistent_cache import Operation
+from packageurl.contrib.persistent_cache import PersistentCache
+from packageurl.contrib.persistent_cache import decode_purl
+from packageurl.contrib.persistent_cache import encode_purl
+from packageurl.contrib.purl2url import get_inferred_urls
+from packageurl.contrib.url2purl import url2purl
+
+PURLS = [
+    "pkg:pypi/Django@4.2",
+    "pkg:npm/%40babel/core@7.0.0",
+    "pkg:maven/org.apache.commons/commons-io@1.3.2?classifier=sources",
+    "pkg:golang/github.com/gorilla/mux@v1.8.1#subpath",
+]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "cache.sqlite"
+
+
+def test_persistent_cache_returns_the_operation_results(cache_path):
+    with PersistentCache(cache_path) as cache:
+        expected = [PackageURL.from_string(purl) for purl in PURLS]
+        assert expected == cache.from_string_many(PURLS)
+        assert expected == cache.from_string_many(PURLS)
+        assert expected[0] == cache.from_string(PURLS[0])
+        assert 5 / 9 == cache.hit_rate
+
+        url = "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        assert url2purl(url) == cache.url2purl(url) == cache.url2purl(url)
+        assert get_inferred_urls(PURLS[1]) == cache.get_inferred_urls(PURLS[1])
+        assert [get_inferred_urls(PURLS[2])] == cache.get_inferred_urls_many(PURLS[2:3])
+
+        for purl in PURLS + ["pkg:pypi/foo@1.0?a=1"]:
+            for strict in (False, True):
+                expected = PackageURL.validate_string(purl, strict=strict)
+                assert expected == cache.validate_string(purl, strict=strict)
+                assert expected == cache.validate_string_many([purl], strict=strict)[0]
+
+
+def test_persistent_cache_warm_restart_skips_seen_inputs(cache_path, monkeypatch):
+    with PersistentCache(cache_path) as cache:
+        expected = cache.from_string_many(PURLS)
+        assert {"hits": 0, "misses": 4, "size": 4} == {
+            key: value for key, value in cache.info().items() if key in ("hits", "misses", "size")
+        }
+
+    def from_string(purl):
+        raise AssertionError(f"Unexpected parse: {purl}")
+
+    monkeypatch.setitem(
+        persistent_cache.OPERATIONS,
+        "from_string",
+        Operation(from_string, encode_purl, decode_purl),
+    )
+    with PersistentCache(cache_path) as cache:
+        assert expected == cache.from_string_many(PURLS)
+        assert 1.0 == cache.hit_rate
+
+
+def test_persistent_cache_caches_errors(cache_path):
+    with PersistentCache(cache_path) as cache:
+        for _ in range(2):
+            with pytest.raises(ValueError, match="scheme"):
+                cache.from_string("not a purl")
+            with pytest.raises(NotImplementedError, match="fedora"):
+                cache.get_inferred_urls("pkg:deb/fedora/attr@1.0")
+        assert 2 == cache.hits
+
+        results = cache.from_string_many(["not a purl", PURLS[0]])
+        assert isinstance(results[0], ValueError)
+        assert "django" == results[1].name
+
+
+def test_persistent_cache_does_not_store_non_string_inputs(cache_path):
+    with PersistentCache(cache_path) as cache:
+        assert [None, None] == cache.url2purl_many([None, ""])
+        assert 1 == len(cache)
+        with pytest.raises(ValueError):
+            cache.from_string(None)
+
+
+def test_persistent_cache_is_invalidated_by_a_new_version(cache_path):
+    with PersistentCache(cache_path, version="1.0") as cache:
+        cache.from_string_many(PURLS)
+        assert 4 == len(cache)
+    with PersistentCache(cache_path, version="1.0") as cache:
+        assert 4 == len(cache)
+    with PersistentCache(cache_path, version="2.0") as cache:
+        assert 0 == len(cache)
+        assert {} == cache.get_many("from_string", PURLS)
+
+
+def test_persistent_cache_is_bounded(cache_path):
+    with PersistentCache(cache_path, maxsize=2) as cache:
+        cache.from_string_many(PURLS[:3])
+        assert 2 == len(cache)
+        assert set(PURLS[1:3]) == set(cache.get_many("from_string", PURLS))
+
+    with pytest.raises(ValueError):
+        PersistentCache(cache_path, maxsize=0)
+
+
+def test_persistent_cache_evicts_the_oldest_stored_entries_first(cache_path):
+    with PersistentCache(cache_path, maxsize=2) as cache:
+        cache.from_string_many(PURLS[:2])
+        # reading an entry does not protect it from eviction
+        assert [PURLS[0]] == list(cache.get_many("from_string", PURLS[:1]))
+        cache.from_string_many(PURLS[2:3])
+        assert set(PURLS[1:3]) == set(cache.get_many("from_string", PURLS))
+
+
+def test_persistent_cache_get_and_put_many(cache_path):
+    with PersistentCache(cache_path) as cache:
+        cache.put_many("custom", {"a": [1, "b"], "c": None})
+        assert {"a": [1, "b"], "c": None} == cache.get_many("custom", ["a", "c", "d"])
+        assert {} == cache.get_many("other", ["a"])
+        cache.clear()
+        assert 0 == len(cache)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import json
+import os
+from pathlib import PurePath
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib.purl2path import escape_path_segment
+from packageurl.contrib.purl2path import path2purl
+from packageurl.contrib.purl2path import path2purl_many
+from packageurl.contrib.purl2path import purl2path
+from packageurl.contrib.purl2path import purl2path_many
+from packageurl.contrib.purl2path import unescape_path_segment
+
+
+def get_test_purls():
+    test_file = os.path.join(os.path.dirname(__file__), "data", "url2purl.json")
+    with open(test_file, encoding="utf-8") as tests:
+        purls = {purl for purl in json.load(tests).values() if purl}
+    return sorted(purls) + [
+        "pkg:npm/%40babel/core@7.0.0",
+        "pkg:golang/github.com/Azure/go-autorest@v0.11.0#autorest/azure",
+        "pkg:golang/github.com/azure/go-autorest@v0.11.0#autorest/azure",
+        "pkg:generic/Con@1.0%2Fbeta?download_url=https://example.com/a%20b.zip",
+        "pkg:generic/con.tar.gz@..",
+        "pkg:generic/%C3%A9t%C3%A9@1%252F2",
+        "pkg:maven/org.apache.commons/io@1.3.4?classifier=sources&type=jar",
+        "pkg:deb/debian/curl@7.50.3-1+b1?arch=i386&distro=jessie",
+    ]
+
+
+def test_purl2path_layout():
+    assert "npm/a6/%40babel/core/7.0.0/@/@" == purl2path("pkg:npm/%40babel/core@7.0.0")
+    assert "deb/2c/debian/curl/7.50.3-1+b1/arch=i386%26distro=jessie/@" == purl2path(
+        "pkg:deb/debian/curl@7.50.3-1+b1?distro=jessie&arch=i386"
+    )
+    purl = PackageURL(type="generic", name="a", subpath="lib/x.py")
+    assert "generic/e2/@/a/@/@/lib%2Fx.py" == purl2path(purl)
+
+
+def test_purl2path_and_path2purl_round_trip():
+    purls = get_test_purls()
+    paths = [purl2path(purl) for purl in purls]
+    for purl, path in zip(purls, paths):
+        assert PackageURL.from_string(purl) == path2purl(path)
+        assert 7 == len(path.split("/"))
+    # paths are unique, also on case-insensitive filesystems
+    assert len(purls) == len({path.lower() for path in paths})
+
+
+def test_escape_path_segment_is_filesystem_safe():
+    for value in ["con", "Con", "COM1.txt", ".", "..", "a.", "a b", "a:b", "a\\b", "!", "%", "@"]:
+        segment = escape_path_segment(value)
+        assert value == unescape_path_segment(segment)
+        assert segment.partition(".")[0].lower() not in ("con", "com1")
+        assert not segment.endswith(".")
+        assert not set(segment) & set(' /\\:*?"<>|@')
+
+    with pytest.raises(ValueError):
+        escape_path_segment("a" * 256)
+    with pytest.raises(ValueError):
+        purl2path(PackageURL(type="generic", name="a", version="Z" * 128))
+
+
+def test_path2purl_accepts_path_like_objects():
+    path = purl2path("pkg:pypi/django@4.2")
+    assert "pkg:pypi/django@4.2" == path2purl(PurePath(path)).to_string()
+    assert "pkg:pypi/django@4.2" == path2purl(f"/{path}/").to_string()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "pypi/00/@/django/4.2/@/@",
+        "pypi/ef/@/django/4.2/@",
+        "pypi/ef/@/Django/4.2/@/@",
+        "generic/b1/@/a%2fb/@/@/@",
+        "generic/e2/@/%FF/@/@/@",
+        "",
+    ],
+)
+def test_path2purl_rejects_non_canonical_paths(path):
+    with pytest.raises(ValueError):
+        path2purl(path)
+    assert [None] == path2purl_many([path])
+
+
+def test_purl2path_many_and_path2purl_many():
+    purls = get_test_purls()
+    paths = [purl2path(purl) for purl in purls]
+    assert paths + [None] == purl2path_many(purls + ["pkg:pypi"])
+    assert [PackageURL.from_string(purl) for purl in purls] == path2purl_many(paths)
@@ -24,9 +24,15 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+import json
+
 import pytest
 
+from packageurl import PackageURL
 from packageurl.contrib import purl2url
+from packageurl.contrib.route import NoRouteAvailable
+from packageurl.contrib.route import RouteAlreadyDefined
+from packageurl.contrib.route import Router
 
 
 def test_purl2url_get_repo_url():
@@ -112,6 +118,7 @@ def test_purl2url_get_download_url():
         "pkg:alpm/arch/pacman@6.0.1-1?arch=x86_64": "https://archive.archlinux.org/packages/p/pacman/pacman-6.0.1-1-x86_64.pkg.tar.zst",
         "pkg:deb/debian/attr@1:2.4.48-6?arch=amd64": "https://deb.debian.org/debian/pool/main/a/attr/attr_2.4.48-6_amd64.deb",
         "pkg:deb/debian/attr@1:2.4.48-6?arch=amd64&repository_url=http://archive.debian.org/debian": "http://archive.debian.org/debian/pool/main/a/attr/attr_2.4.48-6_amd64.deb",
+        "pkg:deb/debian/libxml2@2.9.14+dfsg-1.3?arch=amd64": "https://deb.debian.org/debian/pool/main/libx/libxml2/libxml2_2.9.14+dfsg-1.3_amd64.deb",
         "pkg:apk/acct@6.6.4-r0?arch=x86&alpine_version=v3.11&repo=main": "https://dl-cdn.alpinelinux.org/alpine/v3.11/main/x86/acct-6.6.4-r0.apk",
         # From `download_url` qualifier
         "pkg:github/yarnpkg/yarn@1.3.2?download_url=https://github.com/yarnpkg/yarn/releases/download/v1.3.2/yarn-v1.3.2.tar.gz&version_prefix=v": "https://github.com/yarnpkg/yarn/releases/download/v1.3.2/yarn-v1.3.2.tar.gz",
@@ -194,3 +201,518 @@ def test_purl2url_get_repo_url_with_invalid_purls():
         with pytest.raises(Exception) as e_info:
             purl2url.get_repo_url(purl)
             assert "Invalid PURL" == e_info
+
+
+def test_purl2url_accepts_package_url_objects():
+    purls = [
+        "pkg:cargo/rand@0.7.2",
+        "pkg:github/nexb/scancode-toolkit@3.1.1?version_prefix=v",
+        "pkg:maven/org.apache.commons/commons-io@1.3.2?type=pom",
+        "pkg:pypi/aboutcode-toolkit@3.4.0rc1?download_url=https://example.com/a.whl",
+        "pkg:deb/debian/attr@1:2.4.47-2?arch=amd64",
+        "pkg:generic/foo",
+    ]
+    for purl in purls:
+        package_url = PackageURL.from_string(purl)
+        assert purl2url.get_repo_url(purl) == purl2url.get_repo_url(package_url)
+        assert purl2url.get_download_url(purl) == purl2url.get_download_url(package_url)
+        assert purl2url.get_inferred_urls(purl) == purl2url.get_inferred_urls(package_url)
+
+
+def test_purl2url_get_inferred_urls_parses_purl_once(monkeypatch):
+    calls = []
+    from_string = PackageURL.from_string.__func__
+
+    def counting_from_string(cls, purl):
+        calls.append(purl)
+        return from_string(cls, purl)
+
+    monkeypatch.setattr(PackageURL, "from_string", classmethod(counting_from_string))
+    purl = "pkg:sourceforge/zclasspath?download_url=http://example.com/zclasspath-1.5.jar"
+    assert ["http://example.com/zclasspath-1.5.jar"] == purl2url.get_inferred_urls(purl)
+    assert 2 == len(purl2url.get_inferred_urls("pkg:cargo/rand@0.7.2"))
+    assert [purl, "pkg:cargo/rand@0.7.2"] == calls
+
+    calls.clear()
+    assert purl2url.get_inferred_urls(PackageURL.from_string("pkg:cargo/rand@0.7.2"))
+    assert 1 == len(calls)
+
+
+def test_purl2url_builders_accept_purl_strings():
+    assert "https://crates.io/crates/rand" == purl2url.build_cargo_repo_url("pkg:cargo/rand")
+
+
+def test_purl2url_process_purl_passes_purl_or_string_to_endpoints():
+    router = Router()
+    router.append("pkg:foo/.*", lambda purl: purl)
+    router.append("pkg:bar/.*", purl2url.accepts_purl(lambda purl: purl))
+
+    assert "pkg:foo/a" == purl2url.process_purl(PackageURL("foo", name="a"), router)
+    assert PackageURL("bar", name="a") == purl2url.process_purl("pkg:bar/a", router)
+
+
+def test_purl2url_get_purl_type():
+    assert "cargo" == purl2url.get_purl_type("pkg:cargo/rand@0.7.2")
+    assert "cargo" == purl2url.get_purl_type("pkg://Cargo/rand")
+    assert None is purl2url.get_purl_type("pkg:cargo")
+    assert None is purl2url.get_purl_type("PKG:cargo/rand")
+    assert None is purl2url.get_purl_type("cargo/rand")
+
+
+def test_purl2url_routers_dispatch_on_purl_type():
+    assert purl2url.build_cargo_repo_url is purl2url.repo_router.type_map["cargo"]
+    assert purl2url.build_rubygems_repo_url is purl2url.repo_router.type_map["rubygems"]
+    assert purl2url.repo_router.type_map["gem"].templates
+    assert purl2url.build_repo_download_url is purl2url.download_router.type_map["github"]
+    with pytest.raises(TypeError):
+        purl2url.repo_router.type_map["foo"] = None
+
+
+def test_purl_router_type_map_and_extension_routes():
+    router = purl2url.PurlRouter()
+
+    @router.route_type("Foo", "bar")
+    @purl2url.accepts_purl
+    def build_foo_url(purl):
+        return f"https://foo.example/{purl.name}"
+
+    router.append("pkg:baz/.*", lambda purl: f"https://baz.example/{purl}")
+
+    assert ["foo", "bar"] == list(router.type_map)
+    assert router.is_routable("pkg:foo/a")
+    assert router.is_routable("pkg:baz/a")
+    assert not router.is_routable("pkg:qux/a")
+    assert "https://foo.example/a" == purl2url.process_purl("pkg:foo/a", router)
+    assert "https://foo.example/a" == purl2url.process_purl(PackageURL("bar", name="a"), router)
+    baz_url = purl2url.process_purl(PackageURL("baz", name="a"), router)
+    assert "https://baz.example/pkg:baz/a" == baz_url
+    assert build_foo_url is router.resolve("pkg:bar/a")
+    with pytest.raises(NoRouteAvailable):
+        router.resolve("pkg:qux/a")
+
+    with pytest.raises(RouteAlreadyDefined):
+        router.append_type("foo", build_foo_url)
+
+
+def test_url_template_uses_the_first_template_with_values_for_all_fields():
+    template = purl2url.compile_url_template(
+        (
+            "https://example.com/{namespace_path}/{name}/{version}?{kind}",
+            "https://example.com/{name}",
+        ),
+        qualifiers={"kind": "jar"},
+    )
+    assert "https://example.com/org/foo/bar/1.0?jar" == template("pkg:maven/org.foo/bar@1.0")
+    assert "https://example.com/org/foo/bar/1.0?war" == template(
+        PackageURL.from_string("pkg:maven/org.foo/bar@1.0?kind=war")
+    )
+    assert "https://example.com/bar" == template("pkg:maven/org.foo/bar")
+    versioned_template = purl2url.compile_url_template("https://example.com/{name}/{version}")
+    assert None is versioned_template("pkg:pypi/bar")
+    assert [
+        "https://example.com/bar",
+        "https://example.com/org/foo/bar/2?jar",
+    ] == template.build_many(
+        [
+            PackageURL("maven", name="bar"),
+            PackageURL("maven", "org.foo", "bar", "2"),
+        ]
+    )
+
+
+def test_purl2url_get_inferred_urls_many_formats_templates_in_bulk(monkeypatch):
+    template = purl2url.repo_router.type_map["cargo"]
+    batches = []
+
+    def build_many(purls):
+        batches.append(purls)
+        return ["https://example.com/crate"] * len(purls)
+
+    monkeypatch.setattr(template, "build_many", build_many)
+    purls = ["pkg:cargo/rand@0.7.2", "pkg:cargo/clap@2.33.0"]
+    repo_urls = purl2url.get_inferred_urls_many(purls).repo_url
+    assert ["https://example.com/crate"] * 2 == repo_urls
+    assert [[PackageURL.from_string(purl) for purl in purls]] == batches
+
+
+def test_url_template_qualifiers_without_default_are_required():
+    template = purl2url.compile_url_template("https://example.com/{name}/{arch}", {"arch": None})
+    assert None is template("pkg:alpm/bar")
+    assert "https://example.com/bar/x86" == template("pkg:alpm/bar?arch=x86")
+
+
+def test_url_template_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        purl2url.compile_url_template("https://example.com/{arch}")
+    with pytest.raises(ValueError):
+        purl2url.compile_url_template("https://example.com/{name!r}")
+
+
+def test_purl2url_templates_are_registered():
+    routers = {
+        "repo_url": purl2url.repo_router,
+        "download_url": purl2url.download_router,
+    }
+    for purl_type, templates_by_kind in purl2url.PURL_URL_TEMPLATES.items():
+        for kind, router in routers.items():
+            templates = templates_by_kind.get(kind)
+            if not templates:
+                continue
+            if isinstance(templates, str):
+                templates = (templates,)
+            assert tuple(templates) == router.type_map[purl_type].templates
+
+
+def test_purl2url_get_repo_url_without_namespace():
+    assert "https://pkg.go.dev/xorm@v0.8.2" == purl2url.get_repo_url("pkg:golang/xorm@v0.8.2")
+    assert None is purl2url.get_repo_url("pkg:composer/log@1.1.3")
+    assert None is purl2url.get_download_url("pkg:swift/Alamofire@5.4.3")
+
+
+def test_purl2url_get_inferred_urls_many_returns_aligned_columns():
+    purls = [
+        "pkg:cargo/rand@0.7.2",
+        PackageURL.from_string("pkg:maven/org.apache.commons/commons-io@1.3.2"),
+        "pkg:pypi/sortedcontainers@2.4.0",
+        "pkg:cargo/abc",
+        "pkg:sourceforge/zclasspath?download_url=http://example.com/zclasspath-1.5.jar",
+        "pkg:github/nexb/scancode-toolkit@3.1.1?version_prefix=v",
+        "pkg:generic/foo",
+    ]
+    columns = purl2url.get_inferred_urls_many(iter(purls))
+    assert [purl2url.get_repo_url(purl) for purl in purls] == columns.repo_url
+    assert [purl2url.get_download_url(purl) for purl in purls] == columns.download_url
+    assert [purl2url.get_api_url(purl) for purl in purls] == columns.api_url
+    assert [None] * len(purls) == columns.error
+
+
+def test_purl2url_get_inferred_urls_many_does_not_raise_on_errors():
+    purls = [
+        "pkg:deb/debian/attr@1:2.4.47-2?arch=amd64",
+        "pkg:deb/debian/attr",
+        "pkg:deb/fedora/attr@1.0",
+        "pkg:apk/acct@6.6.4-r0",
+        "not a purl",
+        None,
+        "pkg:npm/is-npm@1.0.0",
+    ]
+    repo_urls, download_urls, api_urls, errors = purl2url.get_inferred_urls_many(purls)
+    assert 7 == len(repo_urls) == len(download_urls) == len(api_urls) == len(errors)
+    deb_url = "https://deb.debian.org/debian/pool/main/a/attr/attr_2.4.47-2_amd64.deb"
+    assert deb_url == download_urls[0]
+    assert None is errors[0]
+    assert isinstance(errors[1], ValueError)
+    assert isinstance(errors[2], NotImplementedError)
+    assert isinstance(errors[3], ValueError)
+    assert isinstance(errors[4], ValueError)
+    assert isinstance(errors[5], ValueError)
+    assert [None] * 5 == download_urls[1:6]
+    assert "https://registry.npmjs.org/is-npm/-/is-npm-1.0.0.tgz" == download_urls[6]
+    assert "https://www.npmjs.com/package/is-npm/v/1.0.0" == repo_urls[6]
+    assert None is errors[6]
+
+
+def test_purl2url_get_api_url():
+    purls_api_url = {
+        "pkg:pypi/sortedcontainers@2.4.0": "https://pypi.org/pypi/sortedcontainers/2.4.0/json",
+        "pkg:pypi/sortedcontainers": "https://pypi.org/pypi/sortedcontainers/json",
+        "pkg:npm/%40babel/core@7.0.0": "https://registry.npmjs.org/@babel/core",
+        "pkg:npm/is-npm@1.0.0": "https://registry.npmjs.org/is-npm",
+        "pkg:cargo/rand@0.7.2": "https://crates.io/api/v1/crates/rand/0.7.2",
+        "pkg:cargo/rand": "https://crates.io/api/v1/crates/rand",
+        "pkg:gem/bundler@2.3.23": "https://rubygems.org/api/v2/rubygems/bundler/versions/2.3.23.json",
+        "pkg:rubygems/bundler": "https://rubygems.org/api/v1/gems/bundler.json",
+        "pkg:maven/org.apache.commons/commons-io@1.3.2": "https://repo.maven.apache.org/maven2/org/apache/commons/commons-io/maven-metadata.xml",
+        "pkg:maven/org.apache.commons/commons-io?repository_url=https://repo.example.com": "https://repo.example.com/org/apache/commons/commons-io/maven-metadata.xml",
+        "pkg:golang/github.com/Sirupsen/logrus@1.0.0": "https://proxy.golang.org/github.com/!sirupsen/logrus/@v/v1.0.0.info",
+        "pkg:golang/github.com/sirupsen/logrus": "https://proxy.golang.org/github.com/sirupsen/logrus/@v/list",
+        "pkg:nuget/Newtonsoft.Json@13.0.1": "https://api.nuget.org/v3-flatcontainer/newtonsoft.json/index.json",
+        "pkg:composer/guzzlehttp/psr7@2.6.1": "https://repo.packagist.org/p2/guzzlehttp/psr7.json",
+        "pkg:hex/phoenix@1.7.0": "https://hex.pm/api/packages/phoenix/releases/1.7.0",
+        "pkg:pub/http@0.13.3": "https://pub.dev/api/packages/http/versions/0.13.3",
+        "pkg:github/nexb/scancode-toolkit@3.1.1": "https://api.github.com/repos/nexb/scancode-toolkit",
+        "pkg:generic/foo@1.0": None,
+        "pkg:deb/debian/attr@1.0": None,
+    }
+
+    for purl, url in purls_api_url.items():
+        assert url == purl2url.get_api_url(purl), f"Failed for {purl}"
+
+
+def test_purl2url_get_urls_returns_all_url_kinds():
+    purl = "pkg:gem/bundler@2.3.23"
+    expected = {
+        "repo_url": "https://rubygems.org/gems/bundler/versions/2.3.23",
+        "download_url": "https://rubygems.org/downloads/bundler-2.3.23.gem",
+        "api_url": "https://rubygems.org/api/v2/rubygems/bundler/versions/2.3.23.json",
+    }
+    assert expected == purl2url.get_urls(purl)
+    assert expected == purl2url.get_urls(PackageURL.from_string(purl))
+
+    expected = {
+        "repo_url": None,
+        "download_url": "http://example.com/foo.zip",
+        "api_url": None,
+    }
+    assert expected == purl2url.get_urls("pkg:generic/foo?download_url=http://example.com/foo.zip")
+
+
+class RecordingResolver(purl2url.PurlResolver):
+    purl_types = ("pypi", "deb")
+    url_kinds = ("download_url", "repo_url")
+
+    def __init__(self, urls):
+        super().__init__()
+        self.urls = urls
+        self.calls = []
+
+    def load_index(self):
+        self.calls.append("load_index")
+        return dict(self.urls)
+
+    def resolve(self, purl, url_kind):
+        index = self.index
+        self.calls.append("resolve")
+        return index.get((purl.name, url_kind))
+
+    def resolve_many(self, purls, url_kind):
+        index = self.index
+        self.calls.append("resolve_many")
+        return [index.get((purl.name, url_kind)) for purl in purls]
+
+
+@pytest.fixture
+def file_index_resolver(tmp_path):
+    index = {
+        "pkg:pypi/django@4.2": {
+            "download_url": "https://files.example.com/Django-4.2.tar.gz",
+            "api_url": "https://mirror.example.com/pypi/django/4.2/json",
+        },
+        "pkg:pypi/Sortedcontainers@2.4.0": {
+            "download_url": "https://files.example.com/sortedcontainers-2.4.0.tar.gz",
+        },
+    }
+    location = tmp_path / "index.json"
+    location.write_text(json.dumps(index))
+    resolver = purl2url.FileIndexResolver(
+        location, purl_types=["pypi"], url_kinds=["download_url", "api_url"]
+    )
+    purl2url.register_resolver(resolver)
+    try:
+        yield resolver
+    finally:
+        purl2url.unregister_resolver(resolver)
+
+
+def test_purl2url_file_index_resolver_is_tried_before_builders(file_index_resolver):
+    assert not file_index_resolver.is_loaded
+    assert "https://files.example.com/Django-4.2.tar.gz" == purl2url.get_download_url(
+        "pkg:pypi/django@4.2"
+    )
+    assert file_index_resolver.is_loaded
+    # qualifiers and subpath are ignored when the purl is not found with them
+    assert "https://files.example.com/sortedcontainers-2.4.0.tar.gz" == purl2url.get_download_url(
+        "pkg:pypi/sortedcontainers@2.4.0?file_name=sortedcontainers-2.4.0.tar.gz"
+    )
+    assert {
+        "repo_url": "https://pypi.org/project/django/4.2/",
+        "download_url": "https://files.example.com/Django-4.2.tar.gz",
+        "api_url": "https://mirror.example.com/pypi/django/4.2/json",
+    } == purl2url.get_urls("pkg:pypi/django@4.2")
+
+    # unknown purls fall back to the URL builders
+    assert None is purl2url.get_download_url("pkg:pypi/flask@2.0")
+    assert "https://pypi.org/pypi/flask/2.0/json" == purl2url.get_api_url("pkg:pypi/flask@2.0")
+
+    file_index_resolver.unload()
+    assert not file_index_resolver.is_loaded
+    columns = purl2url.get_inferred_urls_many(["pkg:pypi/django@4.2", "pkg:pypi/flask@2.0"])
+    assert ["https://files.example.com/Django-4.2.tar.gz", None] == columns.download_url
+
+
+def test_purl2url_resolver_falls_back_to_regex_routes(monkeypatch):
+    router = purl2url.PurlRouter()
+    router.append("pkg:baz/.*", lambda purl: f"https://baz.example/{purl}")
+    monkeypatch.setitem(purl2url.URL_ROUTERS, "download_url", router)
+    resolver = RecordingResolver({("known", "download_url"): "https://index.example/known"})
+    resolver.purl_types = ("baz",)
+    resolver.url_kinds = ("download_url",)
+    purl2url.register_resolver(resolver)
+
+    assert "https://index.example/known" == purl2url.get_download_url("pkg:baz/known")
+    assert "https://baz.example/pkg:baz/other" == purl2url.get_download_url("pkg:baz/other")
+    columns = purl2url.get_inferred_urls_many(["pkg:baz/known", "pkg:baz/other"])
+    assert ["https://index.example/known", "https://baz.example/pkg:baz/other"] == (
+        columns.download_url
+    )
+
+    purl2url.unregister_resolver(resolver)
+    assert "baz" not in router.type_map
+
+
+def test_purl2url_unregister_resolver_restores_builders(file_index_resolver):
+    builder = purl2url.api_router.type_map["pypi"]
+    assert file_index_resolver is builder.resolver
+    purl2url.unregister_resolver(file_index_resolver)
+    assert "pypi" not in purl2url.download_router.type_map
+    assert builder.fallback is purl2url.api_router.type_map["pypi"]
+    assert "https://pypi.org/pypi/django/4.2/json" == purl2url.get_api_url("pkg:pypi/django@4.2")
+
+
+def test_purl2url_resolvers_are_chained_and_resolve_in_bulk():
+    first = RecordingResolver({("attr", "download_url"): "https://first.example.com/attr.deb"})
+    second = RecordingResolver({("django", "download_url"): "https://second.example.com/django"})
+    purl2url.register_resolver(first)
+    purl2url.register_resolver(second)
+    try:
+        assert [] == first.calls
+        purls = [
+            "pkg:deb/debian/attr@1.0?arch=amd64",
+            "pkg:pypi/django@4.2",
+            "pkg:deb/fedora/attr@1.0",
+            "pkg:deb/fedora/other@1.0",
+        ]
+        columns = purl2url.get_inferred_urls_many(purls)
+        assert [
+            "https://first.example.com/attr.deb",
+            "https://second.example.com/django",
+            "https://first.example.com/attr.deb",
+            None,
+        ] == columns.download_url
+        assert isinstance(columns.error[3], NotImplementedError)
+        assert "https://pypi.org/project/django/4.2/" == columns.repo_url[1]
+        assert ["load_index"] + ["resolve_many"] * 4 == second.calls
+        # unresolved purls are passed in bulk to the next resolver
+        assert ["load_index", "resolve_many", "resolve_many", "resolve_many"] == first.calls
+
+        purl2url.unregister_resolver(second)
+        assert first is purl2url.download_router.type_map["deb"].resolver
+        assert "https://first.example.com/attr.deb" == purl2url.get_download_url(purls[0])
+        assert ["resolve"] == first.calls[-1:]
+    finally:
+        purl2url.unregister_resolver(first)
+        purl2url.unregister_resolver(second)
+    assert purl2url.build_deb_download_url is purl2url.download_router.type_map["deb"]
+
+
+def test_purl_router_replace_type():
+    router = purl2url.PurlRouter()
+    endpoint = lambda purl: "a"
+    assert None is router.replace_type("Foo", endpoint)
+    assert endpoint is router.replace_type("foo", lambda purl: "b")
+    assert "b" == router.process("pkg:foo/bar")
+    router.replace_type("foo", None)
+    assert {} == dict(router.type_map)
+
+
+def test_url_rewriter_applies_the_most_specific_rule():
+    rewriter = purl2url.URLRewriter(
+        [
+            {"prefix": "https://github.com/", "replacement": "https://mirror.example.com/gh/"},
+            {
+                "prefix": "https://github.com/nexb/",
+                "replacement": "https://mirror.example.com/nexb/",
+            },
+            {
+                "prefix": "https://github.com/",
+                "replacement": "https://swift.example.com/",
+                "purl_type": "Swift",
+            },
+            {
+                "prefix": "https://github.com/",
+                "replacement": "https://archives.example.com/",
+                "url_kind": "download_url",
+            },
+        ]
+    )
+    url = "https://github.com/nexb/scancode-toolkit"
+    assert "https://mirror.example.com/nexb/scancode-toolkit" == rewriter.rewrite(url, "github")
+    assert "https://swift.example.com/nexb/scancode-toolkit" == rewriter.rewrite(url, "swift")
+    assert "https://archives.example.com/nexb/scancode-toolkit" == rewriter.rewrite(
+        url, "github", "download_url"
+    )
+    assert "https://mirror.example.com/gh/apple/swift" == rewriter.rewrite(
+        "https://github.com/apple/swift", "github", "repo_url"
+    )
+    # rules are looked up by host
+    assert "https://gitlab.com/a/b" == rewriter.rewrite("https://gitlab.com/a/b")
+    assert "https://github.company.com/a" == rewriter.rewrite("https://github.company.com/a")
+
+
+def test_url_rewriter_matches_scheme_and_host_case_insensitively():
+    rewriter = purl2url.URLRewriter(
+        [{"prefix": "HTTPS://Repo.Example.com/Maven/", "replacement": "https://mirror/"}]
+    )
+    url = "https://REPO.example.COM/Maven/ant/ant-1.5.jar"
+    assert "https://mirror/ant/ant-1.5.jar" == rewriter.rewrite(url)
+    assert "Https://repo.example.com/mirror/ant/ant-1.5.jar" == rewriter.rewrite(
+        "Https://repo.example.com/mirror/ant/ant-1.5.jar"
+    )
+    # paths are case-sensitive
+    assert "https://repo.example.com/maven/ant" == rewriter.rewrite(
+        "https://repo.example.com/maven/ant"
+    )
+
+    assert None is purl2url.URLRewriter().get_rewriter("github", "repo_url")
+    with pytest.raises(ValueError):
+        rewriter.add_rule("/maven2/", "https://mirror.example.com/")
+    with pytest.raises(ValueError):
+        rewriter.add_rule("https://github.com/", "https://mirror.example.com/", url_kind="foo")
+
+
+def test_url_rewriter_rewrites_all_inferred_urls():
+    rules = [
+        {
+            "prefix": "https://repo.maven.apache.org/maven2/",
+            "replacement": "https://artifactory.example.com/maven-remote/",
+        },
+        {
+            "prefix": "https://pypi.org/pypi/",
+            "replacement": "https://devpi.example.com/root/pypi/",
+            "purl_type": "pypi",
+        },
+        {
+            "prefix": "https://registry.npmjs.org/",
+            "replacement": "https://verdaccio.example.com/",
+            "purl_type": "npm",
+        },
+        {
+            "prefix": "https://example.com/",
+            "replacement": "https://files.example.com/",
+        },
+    ]
+    purls = [
+        "pkg:maven/org.apache.commons/commons-io@1.3.2",
+        "pkg:pypi/django@4.2",
+        "pkg:npm/%40babel/core@7.0.0",
+        "pkg:generic/foo@1.0?download_url=https://example.com/foo.zip",
+    ]
+    original_urls = [purl2url.get_urls(purl) for purl in purls]
+    purl2url.enable_url_rewriter(rules)
+    try:
+        assert (
+            "https://artifactory.example.com/maven-remote/org/apache/commons/commons-io/1.3.2/commons-io-1.3.2.jar"
+            == purl2url.get_download_url(purls[0])
+        )
+        assert (
+            "https://artifactory.example.com/maven-remote/org/apache/commons/commons-io/1.3.2"
+            == purl2url.get_repo_url(PackageURL.from_string(purls[0]))
+        )
+        assert "https://devpi.example.com/root/pypi/django/4.2/json" == purl2url.get_api_url(
+            purls[1]
+        )
+        assert "https://pypi.org/project/django/4.2/" == purl2url.get_repo_url(purls[1])
+        assert {
+            "repo_url": "https://www.npmjs.com/package/@babel/core/v/7.0.0",
+            "download_url": "https://verdaccio.example.com/@babel/core/-/core-7.0.0.tgz",
+            "api_url": "https://verdaccio.example.com/@babel/core",
+        } == purl2url.get_urls(purls[2])
+        assert ["https://files.example.com/foo.zip"] == purl2url.get_inferred_urls(purls[3])
+
+        rewritten_urls = [purl2url.get_urls(purl) for purl in purls]
+        columns = purl2url.get_inferred_urls_many(purls)
+        for kind in purl2url.URL_ROUTERS:
+            assert [urls[kind] for urls in rewritten_urls] == getattr(columns, kind)
+    finally:
+        purl2url.disable_url_rewriter()
+    assert original_urls == [purl2url.get_urls(purl) for purl in purls]
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import threading
+
+import pytest
+
+from packageurl.contrib.route import MultipleRoutesDefined
+from packageurl.contrib.route import NoRouteAvailable
+from packageurl.contrib.route import RouteAlreadyDefined
+from packageurl.contrib.route import Router
+
+
+def test_router_is_routable_sees_routes_appended_after_first_lookup():
+    router = Router()
+    router.append("https?://example.com/.*", lambda uri: "example")
+    assert router.is_routable("https://example.com/foo")
+    assert not router.is_routable("https://example.org/foo")
+
+    router.append("https?://example.org/.*", lambda uri: "example.org")
+    assert router.is_routable("https://example.org/foo")
+    assert "example.org" == router.process("https://example.org/foo")
+
+
+def test_router_append_duplicate_route_raises():
+    router = Router()
+    router.append("a.*", lambda uri: uri)
+    with pytest.raises(RouteAlreadyDefined):
+        router.append("a.*", lambda uri: uri)
+    assert ["a.*"] == list(router.keys())
+
+
+def test_router_route_map_is_read_only():
+    router = Router()
+    router.append("a.*", lambda uri: uri)
+    with pytest.raises(TypeError):
+        router.route_map["b.*"] = None
+
+
+def test_router_concurrent_append_and_resolve():
+    router = Router()
+    router.append("base/.*", lambda uri: "base")
+    errors = []
+
+    def register(start):
+        for i in range(start, start + 50):
+            router.append(f"site{i}/.*", lambda uri, i=i: i)
+
+    def lookup():
+        try:
+            for _ in range(500):
+                assert "base" == router.process("base/x")
+                assert router.is_routable("base/x")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=register, args=(i * 50,)) for i in range(4)]
+    threads += [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert 201 == len(router.route_map)
+    for i in range(200):
+        assert i == router.process(f"site{i}/x")
+        assert router.is_routable(f"site{i}/x")
+    with pytest.raises(NoRouteAvailable):
+        router.resolve("site200/x")
+
+
+def test_router_stats_are_disabled_by_default():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.process("abc")
+    assert {} == router.stats()
+
+
+def test_router_stats_count_hits_and_misses():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.append("b.*", lambda uri: "b")
+    router.enable_stats()
+
+    router.process("abc")
+    router.process("bcd")
+    router.process("bcd")
+    with pytest.raises(NoRouteAvailable):
+        router.resolve("cde")
+
+    stats = router.stats()
+    assert ["a.*", "b.*"] == list(stats)
+    assert 1 == stats["a.*"]["hits"]
+    assert 3 == stats["a.*"]["misses"]
+    assert 2 == stats["b.*"]["hits"]
+    assert 2 == stats["b.*"]["misses"]
+    assert stats["b.*"]["match_time"] > 0
+
+    router.reset_stats()
+    assert {"hits": 0, "misses": 0, "match_time": 0.0} == router.stats()["a.*"]
+
+
+def test_router_adaptive_stats_reorder_hottest_rules_first():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.append("b.*", lambda uri: "b")
+    router.append("c.*", lambda uri: "c")
+    router.enable_stats(adaptive=True, reorder_interval=5)
+
+    for _ in range(4):
+        assert "c" == router.process("cde")
+    assert "a" == router.process("abc")
+    assert ["c.*", "a.*", "b.*"] == list(router.stats())
+    # the route map keeps its registration order
+    assert ["a.*", "b.*", "c.*"] == list(router.keys())
+
+    # first match wins: the "a.*" rule is not tried anymore for "cde"
+    router.reset_stats()
+    router.process("cde")
+    assert 0 == router.stats()["a.*"]["misses"]
+
+    router.append("d.*", lambda uri: "d")
+    assert ["c.*", "a.*", "b.*", "d.*"] == list(router.stats())
+
+    router.disable_stats()
+    assert {} == router.stats()
+    assert ["a.*", "b.*", "c.*", "d.*"] == [rule.pattern for _, rule in router]
+
+
+@pytest.mark.parametrize("ambiguous_pattern", [".*b", r"(.)\1?b"])
+def test_router_adaptive_stats_detect_ambiguous_routes(ambiguous_pattern):
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.append(ambiguous_pattern, lambda uri: "b")
+    router.enable_stats(adaptive=True, reorder_interval=1)
+    for _ in range(3):
+        assert "b" == router.process("xb")
+    assert [ambiguous_pattern, "a.*"] == list(router.stats())
+
+    with pytest.raises(MultipleRoutesDefined):
+        router.resolve("ab")
+    assert "a" == router.process("ax")
+
+
+def test_router_stats_resolve_with_the_given_route_table():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.enable_stats(adaptive=True)
+    table = router._table
+    router.append("ab.*", lambda uri: "ab")
+    assert "a" == router._resolve(table, "abc")("abc")
+    with pytest.raises(MultipleRoutesDefined):
+        router.resolve("abc")
+
+
+def test_router_resolve_cache():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    assert {} == router.cache_info()
+
+    router.enable_cache(maxsize=10)
+    assert "a" == router.process("abc")
+    assert "a" == router.process("abc")
+    for _ in range(2):
+        with pytest.raises(NoRouteAvailable):
+            router.resolve("cde")
+    info = router.cache_info()
+    assert 2 == info["hits"]
+    assert 2 == info["misses"]
+    assert 0.5 == info["hit_rate"]
+    assert 2 == info["size"]
+    assert 10 == info["maxsize"]
+
+    # appending a route empties the cache
+    router.append("c.*", lambda uri: "c")
+    assert 0 == router.cache_info()["size"]
+    assert "c" == router.process("cde")
+
+    router.disable_cache()
+    assert {} == router.cache_info()
+    assert "c" == router.process("cde")
+
+    with pytest.raises(ValueError):
+        router.enable_cache(maxsize=0)
+
+
+def test_router_resolve_cache_is_kept_when_rules_are_reordered():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.append("b.*", lambda uri: "b")
+    router.enable_cache()
+    router.enable_stats(adaptive=True, reorder_interval=1)
+    assert "a" == router.process("abc")
+    for _ in range(2):
+        assert "b" == router.process("bcd")
+        assert "b" == router.process("bce")
+    assert ["b.*", "a.*"] == list(router.stats())
+    info = router.cache_info()
+    assert 3 == info["size"]
+    assert 2 == info["hits"]
+    assert "a" == router.process("abc")
+    assert 3 == router.cache_info()["hits"]
+
+    router.disable_stats()
+    assert ["a.*", "b.*"] == [rule.pattern for rule in router._table.rules]
+    assert 3 == router.cache_info()["size"]
+
+
+def test_router_resolve_cache_with_stats_counts_misses_only():
+    router = Router()
+    router.append("a.*", lambda uri: "a")
+    router.enable_cache()
+    router.enable_stats()
+    for _ in range(3):
+        router.process("abc")
+    assert 1 == router.stats()["a.*"]["hits"]
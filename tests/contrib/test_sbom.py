@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import io
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib.persistent_cache import PersistentCache
+from packageurl.contrib.sbom import get_sbom_format
+from packageurl.contrib.sbom import iter_json_event_purls
+from packageurl.contrib.sbom import iter_json_events
+from packageurl.contrib.sbom import iter_json_purls
+from packageurl.contrib.sbom import iter_sbom_purls
+from packageurl.contrib.sbom import parse_sbom_purls
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data", "sbom")
+
+EXPECTED_PURLS = {
+    "cyclonedx.json": [
+        ("pkg:npm/app@1.0.0", "app"),
+        ("pkg:npm/debug@4.3.4", "pkg:npm/debug@4.3.4"),
+        ("pkg:npm/%40babel/core@7.23.0", "babel-core"),
+        ("pkg:pypi/requests@2.31.0?file_name=requests-2.31.0-py3-none-any.whl", "requests"),
+        ("pkg:generic/café@1.0?download_url=https://example.com/a%20b", "escaped"),
+    ],
+    "cyclonedx.xml": [
+        ("pkg:maven/com.example/app@1.0.0", "app"),
+        ("pkg:maven/org.springframework/spring-core@6.1.1?type=jar", "spring-core"),
+        (
+            "pkg:maven/org.springframework/spring-jcl@6.1.1?type=jar&classifier=sources",
+            None,
+        ),
+        ("pkg:maven/com.google.guava/guava@32.1.3-jre", "guava"),
+    ],
+    "spdx.json": [
+        ("pkg:deb/debian/bash@5.2.15-2?arch=amd64", "SPDXRef-Package-bash"),
+        ("pkg:deb/debian/zlib1g@1:1.2.13.dfsg-1?arch=amd64", "SPDXRef-Package-zlib"),
+        ("pkg:deb/debian/zlib@1:1.2.13.dfsg-1?arch=source", "SPDXRef-Package-zlib"),
+    ],
+    "spdx.spdx": [
+        ("pkg:deb/debian/bash@5.2.15-2?arch=amd64", "SPDXRef-Package-bash"),
+        ("pkg:deb/debian/zlib1g@1:1.2.13.dfsg-1?arch=amd64", "SPDXRef-Package-zlib"),
+    ],
+}
+
+
+def get_location(filename):
+    return os.path.join(DATA_DIR, filename)
+
+
+@pytest.mark.parametrize("filename", sorted(EXPECTED_PURLS))
+def test_iter_sbom_purls(filename):
+    location = get_location(filename)
+    expected = EXPECTED_PURLS[filename]
+    assert expected == list(iter_sbom_purls(location, with_refs=True, use_ijson=False))
+    purls = [purl for purl, _ref in expected]
+    assert purls == list(iter_sbom_purls(location, use_ijson=False))
+
+
+def test_get_sbom_format():
+    assert "json" == get_sbom_format(get_location("spdx.json"))
+    assert "xml" == get_sbom_format(get_location("cyclonedx.xml"))
+    assert "tag-value" == get_sbom_format(get_location("spdx.spdx"))
+
+
+def get_events(document, chunk_size, decode_values=False):
+    return list(iter_json_events(io.StringIO(document), chunk_size, decode_values))
+
+
+@pytest.mark.parametrize("filename", ["cyclonedx.json", "spdx.json"])
+def test_iter_json_events_with_any_chunk_size(filename):
+    with open(get_location(filename), encoding="utf-8") as document:
+        document = document.read()
+    expected_events = get_events(document, chunk_size=1 << 20)
+    assert ("start_map", None) == expected_events[0]
+    assert ("end_map", None) == expected_events[-1]
+    expected = EXPECTED_PURLS[filename]
+    for chunk_size in (1, 2, 3, 7, 64, 1000):
+        assert expected_events == get_events(document, chunk_size)
+        for decode_values in (False, True):
+            events = iter_json_events(io.StringIO(document), chunk_size, decode_values)
+            assert expected == list(iter_json_event_purls(events))
+        assert expected == list(iter_json_purls(get_location(filename), False, chunk_size))
+
+
+def test_iter_json_events():
+    document = '{"a": [1, -2.5e3, true, false, null, "x\\"y"], "b\\u00e9": {}, "c": "]"}'
+    expected = [
+        ("start_map", None),
+        ("map_key", "a"),
+        ("start_array", None),
+        ("number", "1"),
+        ("number", "-2.5e3"),
+        ("boolean", True),
+        ("boolean", False),
+        ("null", None),
+        ("string", 'x"y'),
+        ("end_array", None),
+        ("map_key", "bé"),
+        ("start_map", None),
+        ("end_map", None),
+        ("map_key", "c"),
+        ("string", "]"),
+        ("end_map", None),
+    ]
+    for chunk_size in (1, 5, 100):
+        assert expected == get_events(document, chunk_size)
+    assert [("value", json.loads(document))] == get_events(document, 100, decode_values=True)
+
+
+@pytest.mark.parametrize("document", ['{"a": [1, 2', '{"a": "b', '{"a": 1}}', '{"a": [1, 2]'])
+def test_iter_json_events_raises_on_truncated_documents(document):
+    for decode_values in (False, True):
+        with pytest.raises(ValueError):
+            get_events(document, chunk_size=4, decode_values=decode_values)
+
+
+def test_iter_json_events_reads_strings_longer_than_chunks():
+    description = "x" * 10000
+    document = json.dumps({"description": description, "purl": "pkg:npm/a@1"})
+    assert ("string", description) == get_events(document, chunk_size=16)[2]
+
+
+def write_cyclonedx_json(location, size):
+    with open(location, "w", encoding="utf-8") as bom:
+        bom.write('{"bomFormat": "CycloneDX", "specVersion": "1.5", "components": [')
+        for i in range(size):
+            component = {
+                "bom-ref": f"ref-{i}",
+                "type": "library",
+                "name": f"package-{i}",
+                "version": "1.0.0",
+                "purl": f"pkg:npm/package-{i}@1.0.0",
+                "hashes": [{"alg": "SHA-256", "content": f"{i:064x}"}],
+                "licenses": [{"license": {"id": "MIT"}}],
+            }
+            bom.write((", " if i else "") + json.dumps(component))
+        bom.write("]}")
+
+
+def test_iter_json_purls_memory_is_bounded(tmp_path):
+    location = tmp_path / "bom.json"
+    write_cyclonedx_json(location, 2000)
+    assert location.stat().st_size > 500_000
+
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_json_purls(location, use_ijson=False, chunk_size=1 << 12))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert 2000 == count
+    assert peak < 100_000
+
+
+def test_iter_cyclonedx_xml_purls_memory_is_bounded(tmp_path):
+    location = tmp_path / "bom.xml"
+    with open(location, "w", encoding="utf-8") as bom:
+        bom.write('<bom xmlns="http://cyclonedx.org/schema/bom/1.5"><components>')
+        for i in range(2000):
+            bom.write(
+                f'<component type="library" bom-ref="ref-{i}"><name>package-{i}</name>'
+                f'<hashes><hash alg="SHA-256">{i:064x}</hash></hashes>'
+                f"<purl>pkg:npm/package-{i}@1.0.0</purl></component>"
+            )
+        bom.write("</components></bom>")
+    assert location.stat().st_size > 300_000
+
+    tracemalloc.start()
+    try:
+        count = 0
+        for purl in iter_sbom_purls(location, with_refs=True):
+            count += 1
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert 2000 == count
+    assert ("pkg:npm/package-1999@1.0.0", "ref-1999") == purl
+    assert peak < 200_000
+
+
+def test_iter_json_purls_with_ijson():
+    pytest.importorskip("ijson")
+    for filename in ("cyclonedx.json", "spdx.json"):
+        location = get_location(filename)
+        assert EXPECTED_PURLS[filename] == list(iter_json_purls(location, use_ijson=True))
+
+
+def test_parse_sbom_purls(tmp_path):
+    location = tmp_path / "bom.json"
+    components = [
+        {"bom-ref": "a", "purl": "pkg:pypi/Django@4.2"},
+        {"bom-ref": "b", "purl": "not a purl"},
+        {"bom-ref": "c", "purl": "pkg:pypi/Django@4.2"},
+    ]
+    location.write_text(json.dumps({"components": components}), encoding="utf-8")
+
+    results = list(parse_sbom_purls(location, use_ijson=False))
+    assert ["a", "b", "c"] == [ref for _purl, ref, _result in results]
+    assert PackageURL("pypi", name="django", version="4.2") == results[0][2]
+    assert isinstance(results[1][2], ValueError)
+    # repeated purls of a batch are parsed once
+    assert results[0][2] is results[2][2]
+    batched_results = parse_sbom_purls(location, batch_size=2, use_ijson=False)
+    assert [str(result) for result in results] == [str(result) for result in batched_results]
+
+    cache = PersistentCache(":memory:")
+    results = list(parse_sbom_purls(location, cache.validate_string_many, use_ijson=False))
+    assert [] == results[0][2]
+    assert "pkg" in results[1][2][0].message
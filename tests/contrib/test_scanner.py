@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import json
+import os
+
+import pytest
+
+from packageurl.contrib.scanner import PackageScanner
+from packageurl.contrib.scanner import scan_packages
+
+
+def write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def write_package_json(directory, name, version):
+    write(directory / "package.json", json.dumps({"name": name, "version": version}))
+
+
+@pytest.fixture
+def site_packages(tmp_path):
+    root = tmp_path / "site-packages"
+    write(root / "Django-4.2.dist-info" / "METADATA", "Name: Django\nVersion: 4.2\n\nName: x\n")
+    write(root / "six-1.16.0.dist-info" / "RECORD")
+    write(root / "attrs.egg-info" / "PKG-INFO", "Metadata-Version: 1.0\nName: attrs\nVersion: 21.1")
+    write(root / "chardet-3.0.4-py3.8.egg-info", "Name: chardet\nVersion: 3.0.4\n")
+    write(root / "django" / "__init__.py")
+    return root
+
+
+@pytest.fixture
+def node_modules(tmp_path):
+    root = tmp_path / "project" / "node_modules"
+    write_package_json(root / "lodash", "lodash", "4.17.21")
+    write_package_json(root / "@babel" / "core", "@babel/core", "7.0.0")
+    write_package_json(root / "@babel" / "core" / "node_modules" / "ms", "ms", "2.0.0")
+    write_package_json(root / "debug" / "node_modules" / "ms", "ms", "2.1.2")
+    write_package_json(root / "debug", "debug", "4.3.4")
+    write(root / "broken" / "package.json", "{")
+    write(root / ".bin" / "debug")
+    pnpm = root / ".pnpm" / "is-odd@3.0.1" / "node_modules"
+    write_package_json(pnpm / "is-odd", "is-odd", "3.0.1")
+    if hasattr(os, "symlink"):
+        try:
+            os.symlink(pnpm / "is-odd", root / "is-odd")
+        except OSError:
+            pass
+    return root
+
+
+@pytest.fixture
+def maven_repository(tmp_path):
+    root = tmp_path / ".m2" / "repository"
+    write(root / "junit" / "junit" / "4.13" / "junit-4.13.pom")
+    write(root / "junit" / "junit" / "maven-metadata-central.xml")
+    write(root / "org" / "apache" / "commons" / "commons-io" / "1.3.2" / "commons-io-1.3.2.pom")
+    snapshot = root / "com" / "example" / "app" / "1.0-SNAPSHOT"
+    write(snapshot / "app-1.0-20200101.120000-1.pom")
+    write(root / "com" / "example" / "app" / "2.0" / "app-2.0.jar.lastUpdated")
+    return root
+
+
+@pytest.fixture
+def cargo_registry(tmp_path):
+    root = tmp_path / ".cargo" / "registry"
+    crates_io = "index.crates.io-6f17d22bba15001f"
+    write(root / "cache" / crates_io / "serde-1.0.193.crate")
+    write(root / "cache" / crates_io / "curve25519-dalek-4.1.1.crate")
+    write(root / "src" / crates_io / "serde-1.0.193" / "Cargo.toml")
+    write(root / "src" / crates_io / "wasm-bindgen-0.2.89-alpha.1" / "Cargo.toml")
+    write(root / "cache" / "my-registry-0123456789abcdef" / "private-1.0.0.crate")
+    write(root / "index" / crates_io / "config.json")
+    return root
+
+
+@pytest.fixture
+def go_module_cache(tmp_path):
+    root = tmp_path / "go" / "pkg" / "mod"
+    write(root / "github.com" / "!azure" / "go-autorest@v0.11.0" / "go.mod")
+    write(root / "github.com" / "!azure" / "go-autorest@v0.11.0" / "autorest" / "a@b" / "x.go")
+    write(root / "gopkg.in" / "yaml.v2@v2.4.0" / "go.mod")
+    write(root / "golang.org" / "x" / "text@v0.3.0" / "go.mod")
+    write(root / "cache" / "download" / "golang.org" / "x" / "net" / "@v" / "v0.1.0.zip")
+    return root
+
+
+def scan(ecosystem, root, **kwargs):
+    return sorted(purl.to_string() for purl in scan_packages([(ecosystem, root)], **kwargs))
+
+
+def test_scan_site_packages(site_packages):
+    expected = [
+        "pkg:pypi/attrs@21.1",
+        "pkg:pypi/chardet@3.0.4",
+        "pkg:pypi/django@4.2",
+        "pkg:pypi/six@1.16.0",
+    ]
+    assert expected == scan("pypi", site_packages)
+
+
+def test_scan_node_modules(node_modules):
+    expected = [
+        "pkg:npm/%40babel/core@7.0.0",
+        "pkg:npm/debug@4.3.4",
+        "pkg:npm/is-odd@3.0.1",
+        "pkg:npm/lodash@4.17.21",
+        "pkg:npm/ms@2.0.0",
+        "pkg:npm/ms@2.1.2",
+    ]
+    assert expected == scan("npm", node_modules)
+    assert expected == scan("npm", node_modules.parent)
+
+
+def test_scan_maven_repository(maven_repository):
+    expected = [
+        "pkg:maven/com.example/app@1.0-SNAPSHOT",
+        "pkg:maven/junit/junit@4.13",
+        "pkg:maven/org.apache.commons/commons-io@1.3.2",
+    ]
+    assert expected == scan("maven", maven_repository)
+
+
+def test_scan_cargo_registry(cargo_registry):
+    expected = [
+        "pkg:cargo/curve25519-dalek@4.1.1",
+        "pkg:cargo/serde@1.0.193",
+        "pkg:cargo/wasm-bindgen@0.2.89-alpha.1",
+    ]
+    assert expected == scan("cargo", cargo_registry)
+    assert expected[:1] + expected[1:2] * 2 + expected[2:] == scan(
+        "cargo", cargo_registry, unique=False
+    )
+
+
+def test_scan_go_module_cache(go_module_cache):
+    expected = [
+        "pkg:golang/github.com/Azure/go-autorest@v0.11.0",
+        "pkg:golang/golang.org/x/text@v0.3.0",
+        "pkg:golang/gopkg.in/yaml.v2@v2.4.0",
+    ]
+    assert expected == scan("golang", go_module_cache)
+
+
+def test_package_scanner_reports_per_ecosystem_stats(
+    site_packages, node_modules, maven_repository, tmp_path
+):
+    scanner = PackageScanner(max_workers=4)
+    locations = [
+        ("pypi", site_packages),
+        ("npm", node_modules),
+        ("maven", maven_repository),
+        ("cargo", tmp_path / "missing"),
+    ]
+    purls = list(scanner.scan(locations))
+    assert 4 + 6 + 3 == len(purls)
+
+    info = scanner.info()
+    assert ["pypi", "npm", "maven", "cargo"] == list(info)
+    assert 4 == info["pypi"]["packages"]
+    assert 4 == info["pypi"]["files"]
+    assert 7 == info["npm"]["files"]
+    assert 0 == info["maven"]["files"]
+    assert 0 == info["maven"]["errors"]
+    assert 0 == info["cargo"]["packages"]
+    assert 0 == info["cargo"]["directories"]
+    assert 1 == info["cargo"]["errors"]
+    for stats in info.values():
+        assert stats["seconds"] >= 0
+        assert stats["packages_per_second"] >= 0
+
+
+def test_package_scanner_can_be_stopped_early(node_modules):
+    purls = PackageScanner(max_workers=2).scan([("npm", node_modules)])
+    assert "npm" == next(purls).type
+    purls.close()
+
+
+def test_package_scanner_rejects_unknown_ecosystems(tmp_path):
+    with pytest.raises(ValueError):
+        list(PackageScanner().scan([("conda", tmp_path)]))
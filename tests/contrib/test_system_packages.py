@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import io
+import os
+
+from packageurl import PackageURL
+from packageurl.contrib.system_packages import get_os_release
+from packageurl.contrib.system_packages import iter_apk_installed
+from packageurl.contrib.system_packages import iter_dpkg_status
+from packageurl.contrib.system_packages import iter_pacman_local
+from packageurl.contrib.system_packages import iter_system_packages
+
+ROOTS = os.path.join(os.path.dirname(__file__), "data", "system_packages")
+
+RECORDS_COUNT = 20_000
+
+
+def assert_normalized(purls):
+    for purl in purls:
+        assert PackageURL.from_string(purl.to_string()) == purl
+
+
+def test_iter_system_packages_debian():
+    purls = list(iter_system_packages(os.path.join(ROOTS, "debian")))
+    expected = [
+        "pkg:deb/debian/adduser@3.134?arch=all&distro=bookworm",
+        "pkg:deb/debian/libc6@2.36-9%2Bdeb12u4?arch=amd64&distro=bookworm",
+        "pkg:deb/debian/passwd@1:4.13%2Bdfsg1-1%2Bb1?arch=amd64&distro=bookworm",
+        "pkg:deb/debian/zlib1g@1:1.2.13.dfsg-1?arch=amd64&distro=bookworm",
+    ]
+    assert expected == [purl.to_string() for purl in purls]
+    assert_normalized(purls)
+
+
+def test_iter_system_packages_alpine():
+    purls = list(iter_system_packages(os.path.join(ROOTS, "alpine")))
+    expected = [
+        "pkg:apk/alpine/musl@1.2.4_git20230717-r4?arch=x86_64&distro=alpine-3.19.1",
+        "pkg:apk/alpine/ca-certificates-bundle@20240226-r0?arch=x86_64&distro=alpine-3.19.1",
+        "pkg:apk/alpine/libsm@1.2.4-r3?arch=x86_64&distro=alpine-3.19.1",
+    ]
+    assert expected == [purl.to_string() for purl in purls]
+    assert_normalized(purls)
+
+
+def test_iter_system_packages_arch():
+    purls = list(iter_system_packages(os.path.join(ROOTS, "arch")))
+    expected = [
+        "pkg:alpm/arch/xorg-server@21.1.13-1?arch=x86_64",
+        "pkg:alpm/arch/filesystem@2024.04.07-1?arch=any",
+        "pkg:alpm/arch/glibc@2.39-4?arch=x86_64",
+    ]
+    assert expected == [purl.to_string() for purl in purls]
+    assert_normalized(purls)
+
+
+def test_iter_system_packages_without_databases(tmp_path):
+    assert [] == list(iter_system_packages(tmp_path))
+    assert {} == get_os_release(tmp_path)
+
+
+def test_readers_accept_file_objects_and_namespaces():
+    status = io.StringIO("Package: curl\nVersion: 7.50.3-1\nArchitecture: i386\n")
+    purls = list(iter_dpkg_status(status, namespace="ubuntu", distro="jessie"))
+    assert ["pkg:deb/ubuntu/curl@7.50.3-1?arch=i386&distro=jessie"] == [str(p) for p in purls]
+    assert not status.closed
+
+    installed = io.StringIO("P:curl\nV:8.5.0-r0\n\nP:\nV:1\n")
+    purls = list(iter_apk_installed(installed, namespace="Wolfi"))
+    assert ["pkg:apk/wolfi/curl@8.5.0-r0"] == [str(p) for p in purls]
+
+
+def get_dpkg_status(count):
+    paragraph = (
+        "Package: package{i}\nStatus: install ok installed\nArchitecture: amd64\n"
+        "Version: 1:1.{i}-1\nDepends: libc6 (>= 2.34)\nDescription: a package\n"
+        " with a long description\n .\n spanning several lines.\n\n"
+    )
+    return "".join(paragraph.format(i=i) for i in range(count))
+
+
+def get_apk_installed(count):
+    record = (
+        "C:Q1/Jl6Cpj9UiQoNSBI/VzMKv9gt1c=\nP:package{i}\nV:1.{i}-r0\nA:x86_64\nS:407278\n"
+        "T:a package\no:package{i}\nF:usr/lib\nR:libpackage{i}.so\na:0:0:755\n\n"
+    )
+    return "".join(record.format(i=i) for i in range(count))
+
+
+def assert_last_purl(expected, purls, count):
+    purls = list(purls)
+    assert count == len(purls)
+    assert expected == purls[-1].to_string()
+
+
+def test_iter_dpkg_status_large_database(tmp_path):
+    location = tmp_path / "status"
+    location.write_text(get_dpkg_status(RECORDS_COUNT), encoding="utf-8")
+    assert_last_purl(
+        "pkg:deb/debian/package19999@1:1.19999-1?arch=amd64&distro=bookworm",
+        iter_dpkg_status(location, distro="bookworm"),
+        RECORDS_COUNT,
+    )
+
+
+def test_iter_apk_installed_large_database(tmp_path):
+    location = tmp_path / "installed"
+    location.write_text(get_apk_installed(RECORDS_COUNT), encoding="utf-8")
+    assert_last_purl(
+        "pkg:apk/alpine/package19999@1.19999-r0?arch=x86_64",
+        iter_apk_installed(location),
+        RECORDS_COUNT,
+    )
+
+
+def test_iter_pacman_local_large_database(tmp_path):
+    for i in range(RECORDS_COUNT // 10):
+        directory = tmp_path / f"package{i}-1.{i}-1"
+        directory.mkdir()
+        desc = f"%NAME%\npackage{i}\n\n%VERSION%\n1.{i}-1\n\n%DESC%\nA package\n\n%ARCH%\nany\n"
+        (directory / "desc").write_text(desc, encoding="utf-8")
+    purls = list(iter_pacman_local(tmp_path))
+    assert RECORDS_COUNT // 10 == len(purls)
+    assert_normalized(purls)
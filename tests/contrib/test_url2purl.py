@@ -29,8 +29,19 @@ import json
 import os
 import re
 from unittest import TestCase
+from unittest import mock
 
+from packageurl.contrib import url2purl
+from packageurl.contrib.route import MultipleRoutesDefined
+from packageurl.contrib.route import Router
+from packageurl.contrib.url2purl import ParsedURL
+from packageurl.contrib.url2purl import URL2PURLCache
+from packageurl.contrib.url2purl import accepts_parsed_url
+from packageurl.contrib.url2purl import disable_url2purl_cache
+from packageurl.contrib.url2purl import enable_url2purl_cache
 from packageurl.contrib.url2purl import get_purl as purl_getter
+from packageurl.contrib.url2purl import process_url
+from packageurl.contrib.url2purl import url2purl_many
 
 
 def get_purl(url):
@@ -48,6 +59,246 @@ class TestURL2PURL(TestCase):
     def test_get_purl_unroutable_uri(self):
         self.assertEqual(None, get_purl("dsf.example"))
 
+    def test_get_purl_parses_url_once(self):
+        calls = []
+        original_from_url = ParsedURL.from_url.__func__
+
+        def from_url(cls, url):
+            calls.append(url)
+            return original_from_url(cls, url)
+
+        url = "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        ParsedURL.from_url = classmethod(from_url)
+        try:
+            self.assertEqual("pkg:github/nexb/scancode-toolkit@v3.1.1", get_purl(url))
+            self.assertEqual(
+                "pkg:generic/a.zip?download_url=https://example.com/a.zip",
+                get_purl("https://example.com/a.zip"),
+            )
+        finally:
+            ParsedURL.from_url = classmethod(original_from_url)
+        self.assertEqual([url, "https://example.com/a.zip"], calls)
+
+    def test_parsed_url(self):
+        parsed = ParsedURL.from_url("https://example.com/a%20b//c+d/?q=1#frag")
+        self.assertEqual("https", parsed.scheme)
+        self.assertEqual("example.com", parsed.netloc)
+        self.assertEqual("/a b//c d/", parsed.path)
+        self.assertEqual(("a b", "c d"), parsed.segments)
+        self.assertEqual("q=1", parsed.query)
+        self.assertEqual("frag", parsed.fragment)
+        self.assertEqual("https://example.com/a b//c d/?q=1#frag", parsed.unquoted)
+
+    def test_process_url_passes_parsed_url_or_string_to_endpoints(self):
+        router = Router()
+        router.append("https://example.com/.*", lambda url: url)
+        router.append("https://example.org/.*", accepts_parsed_url(lambda url: url))
+
+        self.assertEqual("https://example.com/a", process_url("https://example.com/a", router))
+        parsed = process_url("https://example.org/a", router)
+        self.assertIsInstance(parsed, ParsedURL)
+        self.assertEqual(("a",), parsed.segments)
+
+    def test_builders_accept_url_strings(self):
+        purl = url2purl.build_maven_purl("https://repo1.maven.org/maven2/ant/ant/1.5/ant-1.5.jar")
+        self.assertEqual("pkg:maven/ant/ant@1.5", purl.to_string())
+        purl = url2purl.build_generic_purl("https://example.com/a.zip")
+        self.assertEqual("a.zip", purl.name)
+
+    def test_get_purl_pypi_hosts(self):
+        self.assertEqual(
+            "pkg:pypi/c@1.0",
+            get_purl("https://mirror-python.example.org/packages/a/b/c-1.0.tar.gz"),
+        )
+        self.assertEqual(
+            "pkg:pypi/c@1.0",
+            get_purl("https://files.pythonhosted.org/packages/a/b/c-1.0.tar.gz"),
+        )
+
+
+class TestURL2PURLMany(TestCase):
+    def get_test_urls(self):
+        test_file = os.path.join(os.path.dirname(__file__), "data", "url2purl.json")
+        with io.open(test_file, encoding="utf-8") as tests:
+            urls = list(json.load(tests))
+        return urls + ["", None, "dsf.example", "https://example.com/a.zip"]
+
+    def test_url2purl_many_yields_results_in_order(self):
+        urls = self.get_test_urls()
+        expected = [(url, purl_getter(url)) for url in urls]
+        self.assertEqual(expected, list(url2purl_many(urls, processes=1, chunk_size=7)))
+
+    def test_url2purl_many_with_process_pool(self):
+        urls = self.get_test_urls()
+        expected = [(url, purl_getter(url)) for url in urls]
+        results = url2purl_many(iter(urls), processes=2, chunk_size=10)
+        self.assertEqual(expected, list(results))
+
+    def test_url2purl_many_without_generic_fallback(self):
+        urls = [
+            "https://example.com/a.zip",
+            "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip",
+        ]
+        results = list(url2purl_many(urls, generic=False, processes=1))
+        self.assertEqual(("https://example.com/a.zip", None), results[0])
+        self.assertEqual("pkg:github/nexb/scancode-toolkit@v3.1.1", results[1][1].to_string())
+
+        results = list(url2purl_many(urls, generic=True, processes=1))
+        self.assertEqual("generic", results[0][1].type)
+
+    def test_url2purl_many_does_not_raise_on_invalid_urls(self):
+        url = "https://sourceforge.net/project/"
+        with self.assertRaises(ValueError):
+            purl_getter(url)
+        self.assertEqual([(url, None)], list(url2purl_many([url], processes=1)))
+
+    def test_url2purl_many_does_not_raise_on_any_error(self):
+        def raise_error(url):
+            raise MultipleRoutesDefined(url)
+
+        urls = ["https://example.com/a.zip", "https://example.com/b.zip"]
+        with mock.patch("packageurl.contrib.url2purl.url2purl", side_effect=raise_error):
+            self.assertEqual([(url, None) for url in urls], list(url2purl_many(urls)))
+        with mock.patch("packageurl.contrib.url2purl.process_url", side_effect=TypeError):
+            results = list(url2purl_many(urls, generic=False, processes=1))
+        self.assertEqual([(url, None) for url in urls], results)
+
+    def test_url2purl_many_converts_small_inputs_in_process_by_default(self):
+        urls = ["https://example.com/a.zip"]
+        with mock.patch("packageurl.contrib.url2purl.ProcessPoolExecutor") as executor:
+            results = list(url2purl_many(urls))
+        executor.assert_not_called()
+        self.assertEqual([(urls[0], purl_getter(urls[0]))], results)
+
+    def test_url2purl_many_empty_input(self):
+        self.assertEqual([], list(url2purl_many([], processes=2)))
+
+
+class TestURL2PURLCache(TestCase):
+    def test_cache_counts_hits_and_returns_copies(self):
+        cache = URL2PURLCache()
+        url = "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        purl = cache.get_purl(url)
+        self.assertEqual("pkg:github/nexb/scancode-toolkit@v3.1.1", purl.to_string())
+        self.assertEqual(purl, cache.get_purl(url))
+        self.assertEqual(
+            dict(hits=1, misses=1, hit_rate=1 / 2, size=1, maxsize=10000),
+            cache.info(),
+        )
+        self.assertEqual(None, cache.get_purl(""))
+        self.assertEqual(None, cache.get_purl(None))
+
+        url = "https://example.com/a.zip"
+        purl = cache.get_purl(url)
+        purl.qualifiers["download_url"] = "modified"
+        self.assertEqual(url, cache.get_purl(url).qualifiers["download_url"])
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0.0, cache.hit_rate)
+
+    def test_cache_converts_the_original_url(self):
+        cache = URL2PURLCache()
+        url = "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        same_url = "HTTPS://GitHub.com:443/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        self.assertEqual(purl_getter(url), cache.get_purl(url))
+        self.assertEqual(purl_getter(same_url), cache.get_purl(same_url))
+        self.assertEqual("generic", cache.get_purl(same_url).type)
+        self.assertEqual(dict(hits=1, misses=2), dict(hits=cache.hits, misses=cache.misses))
+        self.assertEqual(2, len(cache))
+
+        url = "https://example.com:443/a.zip"
+        self.assertEqual(url, cache.get_purl(url).qualifiers["download_url"])
+
+    def test_cache_caches_none_results(self):
+        cache = URL2PURLCache()
+        self.assertEqual(None, cache.get_purl("https://github.com/a"))
+        self.assertEqual(None, cache.get_purl("https://github.com/a"))
+        self.assertEqual(1, cache.hits)
+
+    def test_cache_keeps_fragments(self):
+        cache = URL2PURLCache()
+        url = "https://packagist.org/packages/guzzlehttp/psr7"
+        purl = cache.get_purl(url + "#2.6.1")
+        self.assertEqual("pkg:composer/guzzlehttp/psr7@2.6.1", purl.to_string())
+        purl = cache.get_purl(url + "#2.6.0")
+        self.assertEqual("pkg:composer/guzzlehttp/psr7@2.6.0", purl.to_string())
+        self.assertEqual("pkg:composer/guzzlehttp/psr7", cache.get_purl(url).to_string())
+        self.assertEqual(3, len(cache))
+
+        purl = cache.get_purl("https://example.com/a.zip#x")
+        self.assertEqual("https://example.com/a.zip#x", purl.qualifiers["download_url"])
+        purl = cache.get_purl("https://example.com/a.zip#y")
+        self.assertEqual("https://example.com/a.zip#y", purl.qualifiers["download_url"])
+
+    def test_cache_converts_once_per_url(self):
+        cache = URL2PURLCache()
+        calls = []
+        original_uncached_url2purl = url2purl.uncached_url2purl
+
+        def uncached_url2purl(url):
+            calls.append(url)
+            return original_uncached_url2purl(url)
+
+        url = "https://pypi.python.org/packages/source/a/anyjson/anyjson-0.3.3.tar.gz#md5=1234"
+        url2purl.uncached_url2purl = uncached_url2purl
+        try:
+            cache.get_purl(url)
+            cache.get_purl(url)
+        finally:
+            url2purl.uncached_url2purl = original_uncached_url2purl
+        self.assertEqual([url], calls)
+
+    def test_cache_results_are_the_uncached_results(self):
+        test_file = os.path.join(os.path.dirname(__file__), "data", "url2purl.json")
+        with io.open(test_file, encoding="utf-8") as tests:
+            urls = list(json.load(tests))
+        variants = []
+        for url in urls:
+            scheme, sep, rest = url.partition("://")
+            host, slash, path = rest.partition("/")
+            port = {"http": ":80", "https": ":443"}.get(scheme.lower(), "")
+            variants.append(f"{scheme.upper()}{sep}{host.upper()}{port}{slash}{path}")
+            variants.append(url + "#fragment")
+        cache = URL2PURLCache()
+        for url in urls + variants + urls + variants:
+            try:
+                expected = purl_getter(url)
+            except ValueError as error:
+                with self.assertRaises(type(error), msg=url):
+                    cache.get_purl(url)
+                continue
+            self.assertEqual(expected, cache.get_purl(url), msg=url)
+        self.assertTrue(cache.hits)
+
+    def test_cache_is_bounded(self):
+        cache = URL2PURLCache(maxsize=2)
+        urls = [f"https://github.com/nexB/project{i}/archive/v1.0.zip" for i in range(3)]
+        for url in urls:
+            cache.get_purl(url)
+        self.assertEqual(2, len(cache))
+        cache.get_purl(urls[2])
+        self.assertEqual(1, cache.hits)
+        cache.get_purl(urls[0])
+        self.assertEqual(4, cache.misses)
+        # urls[1] was the least recently used and is evicted
+        self.assertEqual([urls[2], urls[0]], list(cache._entries))
+
+        with self.assertRaises(ValueError):
+            URL2PURLCache(maxsize=0)
+
+    def test_url2purl_uses_the_cache_when_enabled(self):
+        url = "https://github.com/nexB/scancode-toolkit/archive/v3.1.1.zip"
+        self.assertIsNot(purl_getter(url), purl_getter(url))
+        cache = enable_url2purl_cache(maxsize=10)
+        try:
+            self.assertEqual(purl_getter(url), purl_getter(url))
+            self.assertEqual(1, cache.hits)
+        finally:
+            disable_url2purl_cache()
+        purl_getter(url)
+        self.assertEqual(dict(hits=1, misses=1), dict(hits=cache.hits, misses=cache.misses))
+
 
 def python_safe(s):
     """
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import json
+import os
+import re
+import time
+
+import pytest
+
+from packageurl.contrib.url2purl import MAX_URL_LENGTH
+from packageurl.contrib.url2purl import MAX_URL_SLASHES
+from packageurl.contrib.url2purl import build_generic_purl
+from packageurl.contrib.url2purl import compile_pattern
+from packageurl.contrib.url2purl import purl_router
+from packageurl.contrib.url2purl import pypi_pattern
+from packageurl.contrib.url2purl import url2purl
+from packageurl.contrib.url2purl import wheel_file_re
+
+# Worst-case time allowed for a single url2purl call on a crafted input. Route
+# patterns may backtrack polynomially, but URLs are only routed up to
+# MAX_URL_LENGTH characters and MAX_URL_SLASHES slashes, which keeps every call
+# around 0.1s on these inputs. Without these limits, a polynomial backtracking
+# on a FILL_SIZE input takes minutes: this generous bound still catches it on
+# slow or loaded machines without false failures.
+MAX_SECONDS = 2.0
+
+FILL_SIZE = 10000
+
+FILLS = (
+    "a",
+    "a-",
+    "a.",
+    "a/",
+    "/",
+    "-",
+    "a_",
+    "1.",
+    "/archive/",
+    "/src/contrib/",
+    ".zip",
+    "/files/",
+    "/-/archive/",
+)
+
+
+def get_url2purl_samples():
+    test_file = os.path.join(os.path.dirname(__file__), "data", "url2purl.json")
+    with open(test_file) as tests:
+        return list(json.load(tests))
+
+
+def get_samples_by_rule():
+    urls = get_url2purl_samples()
+    samples_by_rule = {}
+    for pattern, rule in purl_router:
+        samples_by_rule[pattern] = [url for url in urls if rule.match(url)][:2]
+    return samples_by_rule
+
+
+def get_pattern_fills(pattern):
+    """
+    Return a list of the literal words of a route ``pattern``, such as host
+    names and path segments, to repeat in crafted URLs.
+    """
+    words = re.findall(r"[\w.-]{3,}/?", pattern.replace("\\", ""))
+    return [word for word in words if word != "https"]
+
+
+def get_fill_counts(url, fill):
+    """
+    Yield the number of times ``fill`` is repeated in crafted URLs built from
+    ``url``: once to exceed the routing limits, once to stay just below them.
+    """
+    yield FILL_SIZE // len(fill)
+    max_count = (MAX_URL_LENGTH - len(url)) // len(fill)
+    slashes = fill.count("/")
+    if slashes:
+        max_count = min(max_count, (MAX_URL_SLASHES - url.count("/")) // slashes)
+    if max_count > 0:
+        yield max_count
+
+
+def get_crafted_urls(url, fills=FILLS):
+    """
+    Yield long URLs built from ``url`` that are known to trigger catastrophic
+    backtracking in naive patterns.
+    """
+    head, _, last_segment = url.rpartition("/")
+    middle = len(url) // 2
+    for fill in fills:
+        for count in get_fill_counts(url, fill):
+            filler = fill * count
+            yield url + filler
+            yield url + filler + "!"
+            yield url[:middle] + filler + url[middle:]
+            yield f"{head}/{filler}"
+
+
+def assert_fast(function, value):
+    start = time.perf_counter()
+    try:
+        function(value)
+    except ValueError:
+        # some crafted URLs are routed to builders that reject them
+        pass
+    elapsed = time.perf_counter() - start
+    assert elapsed < MAX_SECONDS, f"{elapsed:.3f}s for: {value[:80]!r}..."
+
+
+def test_url2purl_every_route_has_samples():
+    missing = [pattern for pattern, samples in get_samples_by_rule().items() if not samples]
+    assert not missing
+
+
+@pytest.mark.parametrize("pattern,samples", sorted(get_samples_by_rule().items()))
+def test_url2purl_route_worst_case_latency(pattern, samples):
+    fills = FILLS + tuple(get_pattern_fills(pattern))
+    for sample in samples:
+        for url in get_crafted_urls(sample, fills):
+            assert_fast(url2purl, url)
+
+
+@pytest.mark.parametrize("pattern,rule", list(purl_router))
+def test_url2purl_route_pattern_worst_case_latency(pattern, rule):
+    for fill in get_pattern_fills(pattern):
+        for prefix in ("http://", "https://", "https://" + fill):
+            count = (MAX_URL_LENGTH - len(prefix)) // len(fill)
+            for suffix in ("", "!", "/"):
+                assert_fast(rule.match, prefix + fill * count + suffix)
+
+
+def test_url2purl_does_not_route_urls_beyond_limits():
+    url = "https://github.com/package-url/packageurl-python/archive/v0.1.zip"
+    long_url = url.replace("/archive/", "/" + "a" * MAX_URL_LENGTH + "/archive/")
+    deep_url = url.replace("/archive/", "/a" * MAX_URL_SLASHES + "/archive/")
+    assert url2purl(url).type == "github"
+    assert url2purl(long_url) == build_generic_purl(long_url)
+    assert url2purl(deep_url) == build_generic_purl(deep_url)
+
+
+def test_url2purl_pypi_filename_patterns_worst_case_latency():
+    pypi_re = compile_pattern(pypi_pattern)
+    for fill in FILLS:
+        # file names are the last segment of a URL routed to the pypi builders
+        filler = fill * (MAX_URL_LENGTH // 2 // len(fill))
+        for filename in (
+            filler,
+            filler + ".zip",
+            filler + ".whl",
+            "a-" + filler + "-py3-none-any.whl",
+            "name-" + filler + "-1.0.tar.gz",
+        ):
+            assert_fast(pypi_re.match, filename)
+            assert_fast(wheel_file_re.match, filename)
+
+
+def test_url2purl_patterns_do_not_use_nested_quantifiers():
+    nested_quantifier = re.compile(r"\((?:\?:)?\.[*+][^)]*\)[*+]")
+    for pattern, _rule in purl_router:
+        assert not nested_quantifier.search(pattern), pattern
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) the purl authors
+# SPDX-License-Identifier: MIT
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Visit https://github.com/package-url/packageurl-python for support and
+# download.
+
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from packageurl import PackageURL
+from packageurl.contrib import url_checker
+from packageurl.contrib.url_checker import URLChecker
+from packageurl.contrib.url_checker import get_candidate_urls
+from packageurl.contrib.url_checker import verify_urls
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Respond 200 for /ok/ paths, 302 to /ok/ for /redirect/ paths, 405 to HEAD
+    requests for /get-only/ paths and 404 otherwise. /slow/ paths respond
+    after one second.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def respond(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+        path = self.path
+        headers = {}
+        if path.startswith("/ok/"):
+            status = 200
+        elif path.startswith("/redirect/"):
+            status = 302
+            headers["Location"] = "/ok/" + path[len("/redirect/") :]
+        elif path.startswith("/get-only/"):
+            status = 405 if self.command == "HEAD" else 200
+        elif path.startswith("/slow/"):
+            time.sleep(1)
+            status = 200
+        else:
+            status = 404
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = respond
+    do_GET = respond
+
+    def log_message(self, *args):
+        pass
+
+
+def get_closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_get_candidate_urls_ranks_variants():
+    assert [
+        "https://github.com/nexb/scancode-toolkit/archive/3.1.1.tar.gz",
+        "https://github.com/nexb/scancode-toolkit/archive/v3.1.1.tar.gz",
+    ] == get_candidate_urls("pkg:github/nexb/scancode-toolkit@3.1.1")
+    assert [
+        "https://github.com/nexb/scancode-toolkit/archive/v3.1.1.tar.gz",
+        "https://github.com/nexb/scancode-toolkit/archive/3.1.1.tar.gz",
+    ] == get_candidate_urls("pkg:github/nexb/scancode-toolkit@3.1.1?version_prefix=v")
+    assert [
+        "https://gitlab.com/tg1999/firebase/-/archive/v1.0/firebase-v1.0.tar.gz",
+        "https://gitlab.com/tg1999/firebase/-/archive/1.0/firebase-1.0.tar.gz",
+    ] == get_candidate_urls(PackageURL.from_string("pkg:gitlab/tg1999/firebase@v1.0"))
+    assert [
+        "https://proxy.golang.org/github.com/gin-gonic/gin/@v/v2.0.0.zip",
+        "https://proxy.golang.org/github.com/gin-gonic/gin/@v/v2.0.0+incompatible.zip",
+    ] == get_candidate_urls("pkg:golang/github.com/gin-gonic/gin@v2.0.0")
+    assert [
+        "https://repo.anaconda.com/pkgs/main/linux-64/absl-py-0.4.1-py36h06a4308_0.conda",
+        "https://repo.anaconda.com/pkgs/main/linux-64/absl-py-0.4.1-py36h06a4308_0.tar.bz2",
+    ] == get_candidate_urls(
+        "pkg:conda/absl-py@0.4.1?build=py36h06a4308_0&channel=main&subdir=linux-64"
+    )
+    assert ["https://crates.io/api/v1/crates/rand/0.7.2/download"] == get_candidate_urls(
+        "pkg:cargo/rand@0.7.2"
+    )
+    assert [] == get_candidate_urls("pkg:deb/debian/attr")
+
+
+def test_verify_urls_with_stub_server(stub_server):
+    base = stub_server.url
+    purls = [
+        f"pkg:maven/org.example/foo@1.0?repository_url={base}/ok",
+        f"pkg:maven/org.example/foo@1.0?repository_url={base}/missing",
+        f"pkg:generic/foo?download_url={base}/redirect/foo.zip",
+        f"pkg:generic/bar?download_url={base}/get-only/bar.zip",
+        "pkg:generic/baz",
+        "not a purl",
+    ]
+    results = verify_urls(purls)
+    assert [purl for purl, _, _, _ in results] == purls
+
+    assert f"{base}/ok/org/example/foo/1.0/foo-1.0.jar" == results[0].url
+    assert results[0].exists
+    assert {results[0].url: 200} == results[0].statuses
+
+    assert None is results[1].url
+    assert False is results[1].exists
+    assert [404] == list(results[1].statuses.values())
+
+    # redirects are followed
+    assert f"{base}/redirect/foo.zip" == results[2].url
+    assert ("HEAD", "/ok/foo.zip") in stub_server.requests
+
+    # GET is used when HEAD is not allowed
+    assert results[3].exists
+    assert ("GET", "/get-only/bar.zip") in stub_server.requests
+
+    assert (None, None, {}) == results[4][1:]
+    assert (None, None, {}) == results[5][1:]
+
+
+def test_url_checker_tries_ranked_candidates_and_caches_verdicts(stub_server):
+    base = stub_server.url
+
+    def get_candidates(purl):
+        name = PackageURL.from_string(purl).name
+        return [f"{base}/missing/{name}", f"{base}/ok/{name}"]
+
+    verdicts = {}
+
+    async def verify():
+        async with URLChecker(get_candidates=get_candidates, verdicts=verdicts) as checker:
+            return await checker.verify_many(["pkg:generic/a", "pkg:generic/a", "pkg:generic/b"])
+
+    results = asyncio.run(verify())
+    assert [f"{base}/ok/a", f"{base}/ok/a", f"{base}/ok/b"] == [result.url for result in results]
+    assert {f"{base}/missing/a": 404, f"{base}/ok/a": 200} == results[0].statuses
+    # concurrent checks of the same URL share one request
+    assert 4 == len(stub_server.requests)
+    assert 4 == len(verdicts)
+
+    asyncio.run(verify())
+    assert 4 == len(stub_server.requests)
+
+
+def test_url_checker_pools_connections_per_host(stub_server):
+    base = stub_server.url
+
+    async def check():
+        async with URLChecker(limit_per_host=2) as checker:
+            return await asyncio.gather(*(checker.check_url(f"{base}/ok/{i}") for i in range(20)))
+
+    assert [200] * 20 == asyncio.run(check())
+    assert 20 == len(stub_server.requests)
+    assert stub_server.connections <= 2
+
+
+def test_url_checker_degrades_gracefully(stub_server, monkeypatch):
+    base = stub_server.url
+
+    async def check(*urls, **options):
+        async with URLChecker(**options) as checker:
+            return [await checker.check_url(url) for url in urls]
+
+    assert [None] == asyncio.run(check(f"http://127.0.0.1:{get_closed_port()}/ok/a"))
+    assert [None, None] == asyncio.run(check("ftp://example.com/a", "not a url"))
+    assert [None] == asyncio.run(check(f"{base}/slow/a", timeout=0.1))
+
+    # https URLs cannot be checked without SSL support
+    monkeypatch.setattr(url_checker, "ssl", None)
+    assert [None, 200] == asyncio.run(check("https://127.0.0.1/ok/a", f"{base}/ok/a"))
+
+    results = verify_urls(["pkg:generic/a?download_url=https://127.0.0.1/a"])
+    assert None is results[0].exists
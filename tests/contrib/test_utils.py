@@ -24,10 +24,20 @@
 # Visit https://github.com/package-url/packageurl-python for support and
 # download.
 
+import time
+
 import pytest
 
+from packageurl import PackageURL
 from packageurl.contrib.django.utils import purl_to_lookups
+from packageurl.utils import ConversionError
+from packageurl.utils import get_docker_purl
+from packageurl.utils import get_go_module_purl
 from packageurl.utils import get_golang_purl
+from packageurl.utils import get_maven_purl
+from packageurl.utils import get_npm_purl
+from packageurl.utils import get_purls
+from packageurl.utils import get_pypi_purl
 
 
 def test_purl_to_lookups_without_encode():
@@ -90,3 +100,155 @@ def test_get_golang_purl():
     assert "pkg:golang/github.com/grpc-ecosystem/go-grpc-middleware@v1.3.0" == str(golang_purl_2)
     with pytest.raises(Exception):
         get_golang_purl("github.com/envoyproxy/go-control-plane/envoy/config/listener@v3.1")
+
+
+def assert_converted(convert, identifier, expected):
+    purl = convert(identifier)
+    assert expected == purl.to_string()
+    # the converted PackageURL are normalized
+    assert PackageURL.from_string(expected) == purl
+
+
+@pytest.mark.parametrize(
+    "coordinates,expected",
+    [
+        ("junit:junit:4.13.2", "pkg:maven/junit/junit@4.13.2"),
+        ("org.apache.commons:commons-io", "pkg:maven/org.apache.commons/commons-io"),
+        (
+            "org.apache.commons:commons-io:1.3.4:sources",
+            "pkg:maven/org.apache.commons/commons-io@1.3.4?classifier=sources",
+        ),
+        (
+            "com.google.guava:guava:32.1.3-jre@pom",
+            "pkg:maven/com.google.guava/guava@32.1.3-jre?type=pom",
+        ),
+    ],
+)
+def test_get_maven_purl(coordinates, expected):
+    assert_converted(get_maven_purl, coordinates, expected)
+
+
+@pytest.mark.parametrize(
+    "spec,expected",
+    [
+        ("lodash@4.17.21", "pkg:npm/lodash@4.17.21"),
+        ("@babel/core@7.23.0", "pkg:npm/%40babel/core@7.23.0"),
+        ("@types/node", "pkg:npm/%40types/node"),
+        ("JSONStream@1.3.5", "pkg:npm/jsonstream@1.3.5"),
+        ("left-pad@v1.3.0", "pkg:npm/left-pad@1.3.0"),
+        ("react@19.0.0-rc.1", "pkg:npm/react@19.0.0-rc.1"),
+        ("foo@^1.2", "pkg:npm/foo"),
+        ("foo@~1.2.3", "pkg:npm/foo"),
+        ("foo@>=1.0.0 <2.0.0", "pkg:npm/foo"),
+        ("foo@1.x", "pkg:npm/foo"),
+        ("@scope/foo@latest", "pkg:npm/%40scope/foo"),
+    ],
+)
+def test_get_npm_purl(spec, expected):
+    assert_converted(get_npm_purl, spec, expected)
+
+
+@pytest.mark.parametrize(
+    "module,expected",
+    [
+        ("github.com/gorilla/mux v1.8.1", "pkg:golang/github.com/gorilla/mux@v1.8.1"),
+        ("github.com/gorilla/mux@v1.8.1", "pkg:golang/github.com/gorilla/mux@v1.8.1"),
+        (
+            "github.com/Azure/go-autorest v14.2.0+incompatible // indirect",
+            "pkg:golang/github.com/Azure/go-autorest@v14.2.0%2Bincompatible",
+        ),
+        ("gopkg.in/yaml.v3", "pkg:golang/gopkg.in/yaml.v3"),
+        ("rsc.io/quote/v3 v3.1.0", "pkg:golang/rsc.io/quote/v3@v3.1.0"),
+    ],
+)
+def test_get_go_module_purl(module, expected):
+    assert_converted(get_go_module_purl, module, expected)
+
+
+@pytest.mark.parametrize(
+    "reference,expected",
+    [
+        ("debian", "pkg:docker/debian"),
+        ("debian:bookworm-slim", "pkg:docker/debian@bookworm-slim"),
+        ("index.docker.io/library/debian:12", "pkg:docker/debian@12"),
+        ("bitnami/redis:7.2", "pkg:docker/bitnami/redis@7.2"),
+        (
+            "localhost:5000/team/app:1.0",
+            "pkg:docker/team/app@1.0?repository_url=localhost:5000",
+        ),
+        (
+            "ghcr.io/org/app:v1@sha256:" + "a" * 64,
+            "pkg:docker/org/app@sha256:" + "a" * 64 + "?repository_url=ghcr.io&tag=v1",
+        ),
+    ],
+)
+def test_get_docker_purl(reference, expected):
+    assert_converted(get_docker_purl, reference, expected)
+
+
+@pytest.mark.parametrize(
+    "requirement,expected",
+    [
+        ("requests==2.31.0", "pkg:pypi/requests@2.31.0"),
+        ("zope.interface === 6.1", "pkg:pypi/zope.interface@6.1"),
+        ("Flask_Cors[all]==4.0.0 ; python_version >= '3.8'", "pkg:pypi/flask-cors@4.0.0"),
+        ("six==1.16.0  # via -r requirements.in", "pkg:pypi/six@1.16.0"),
+    ],
+)
+def test_get_pypi_purl(requirement, expected):
+    assert_converted(get_pypi_purl, requirement, expected)
+
+
+@pytest.mark.parametrize(
+    "convert,identifier",
+    [
+        (get_maven_purl, "junit"),
+        (get_maven_purl, "a:b:c:d:e"),
+        (get_npm_purl, "@babel"),
+        (get_npm_purl, "a b"),
+        (get_go_module_purl, "github.com/gorilla/mux 1.8.1"),
+        (get_docker_purl, "Debian:12"),
+        (get_docker_purl, "debian:" + "1" * 200),
+        (get_pypi_purl, "requests>=2.0"),
+        (get_pypi_purl, "requests==2.*"),
+        (get_pypi_purl, None),
+        (get_pypi_purl, ""),
+    ],
+)
+def test_converters_return_errors(convert, identifier):
+    error = convert(identifier)
+    assert isinstance(error, ConversionError)
+    assert not error
+    assert identifier == error.identifier
+    assert error.message
+
+
+def get_best_time(function, *args):
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.parametrize("syntax", ["maven", "npm", "golang", "docker", "pypi"])
+def test_converters_run_in_linear_time(syntax):
+    # an identifier ten times longer takes at most about ten times longer to
+    # convert, with a wide margin for timing noise but not for a quadratic time
+    for fill in ("a", "a.", "a:", "a/", "a@", "a-", "a_", "a__", "a=", " "):
+        short = get_best_time(get_purls, [fill * 2000 + "!"], syntax)
+        long = get_best_time(get_purls, [fill * 20000 + "!"], syntax)
+        assert long < 50 * short + 0.001, fill
+
+
+def test_get_purls():
+    purls = get_purls(["debian:12", "debian:12", "Debian", "alpine"], "docker")
+    assert ["pkg:docker/debian@12", "pkg:docker/alpine"] == [str(purls[0]), str(purls[3])]
+    assert purls[0] == purls[1]
+    purls[0].qualifiers["arch"] = "amd64"
+    assert {} == purls[1].qualifiers
+    assert "docker" == purls[2].syntax
+    assert [] == get_purls([], "npm")
+    with pytest.raises(ValueError):
+        get_purls(["a"], "conda")